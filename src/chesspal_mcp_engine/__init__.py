@@ -1,5 +1,6 @@
 """Chess engine service for the MCP platform."""
 
+from .async_engine import AsyncStockfishEngine
 from .engine_wrapper import StockfishEngine, StockfishError
 
-__all__ = ["StockfishEngine", "StockfishError"]
+__all__ = ["AsyncStockfishEngine", "StockfishEngine", "StockfishError"]
@@ -0,0 +1,192 @@
+"""Persistent on-disk cache of engine analysis shared across processes."""
+
+import asyncio
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from chesspal_mcp_engine.logging_config import get_logger
+from chesspal_mcp_engine.models import SearchLimits, SearchResult
+
+logger = get_logger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS analysis (
+    zobrist INTEGER NOT NULL,
+    limits TEXT NOT NULL,
+    best_move TEXT NOT NULL,
+    ponder TEXT,
+    score_cp INTEGER,
+    mate INTEGER,
+    depth INTEGER,
+    pv TEXT NOT NULL,
+    created REAL NOT NULL,
+    PRIMARY KEY (zobrist, limits)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS analysis_created ON analysis (created);
+"""
+
+
+def _to_signed(zobrist: int) -> int:
+    """Map an unsigned 64-bit Zobrist hash onto SQLite's signed INTEGER range."""
+    return zobrist - (1 << 64) if zobrist >= 1 << 63 else zobrist
+
+
+class AnalysisCache:
+    """An SQLite-backed cache of search results keyed by position and limits.
+
+    The database runs in WAL mode, so several server processes can read it
+    while one of them writes. Once the table grows past `max_entries` the
+    oldest entries are deleted.
+
+    Database calls can block for up to the busy timeout while another
+    process writes, so async callers use get_async() and put_async(), which
+    run them on the cache's own worker thread instead of the event loop.
+    """
+
+    def __init__(self, path: str | Path, max_entries: int, evict_interval: int = 100):
+        """Open (and create if needed) the cache database.
+
+        Args:
+            path: Path of the SQLite database file
+            max_entries: Number of entries kept before the oldest are evicted
+            evict_interval: Number of writes between eviction checks
+        """
+        if max_entries < 1:
+            raise ValueError("Analysis cache must hold at least one entry")
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.evict_interval = evict_interval
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._writes = 0
+        # One worker, so the connection is only ever used by one thread at a time
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="analysis-cache")
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Autocommit mode: every statement is its own short transaction
+        self._conn: Optional[sqlite3.Connection] = sqlite3.connect(
+            str(self.path), timeout=5.0, isolation_level=None, check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        logger.info("Analysis cache opened at %s (max %d entries)", self.path, self.max_entries)
+
+    def get(self, zobrist: int, limits: SearchLimits) -> Optional[SearchResult]:
+        """Return the stored result for a position and limits, or None on a miss."""
+        try:
+            row = (
+                self._connection()
+                .execute(
+                    "SELECT best_move, ponder, score_cp, mate, depth, pv FROM analysis WHERE zobrist = ? AND limits = ?",
+                    (_to_signed(zobrist), limits.to_go_command()),
+                )
+                .fetchone()
+            )
+        except sqlite3.Error as e:
+            # A locked or corrupt cache is treated as a miss rather than failing the request
+            logger.warning("Analysis cache lookup failed: %s", e)
+            row = None
+        if row is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        best_move, ponder, score_cp, mate, depth, pv = row
+        return SearchResult(
+            best_move=best_move, ponder=ponder, score_cp=score_cp, mate=mate, depth=depth, pv=pv.split()
+        )
+
+    async def get_async(self, zobrist: int, limits: SearchLimits) -> Optional[SearchResult]:
+        """Look up a result like get(), without blocking the event loop."""
+        return await asyncio.get_running_loop().run_in_executor(self._executor, self.get, zobrist, limits)
+
+    def put(self, zobrist: int, limits: SearchLimits, result: SearchResult) -> None:
+        """Store the result for a position and limits, replacing any previous entry."""
+        try:
+            self._store(zobrist, limits, result)
+            self._writes += 1
+            if self._writes % self.evict_interval == 0:
+                self.evict()
+        except sqlite3.Error as e:
+            logger.warning("Analysis cache write failed: %s", e)
+
+    async def put_async(self, zobrist: int, limits: SearchLimits, result: SearchResult) -> None:
+        """Store a result like put(), without blocking the event loop."""
+        await asyncio.get_running_loop().run_in_executor(self._executor, self.put, zobrist, limits, result)
+
+    def _store(self, zobrist: int, limits: SearchLimits, result: SearchResult) -> None:
+        """Insert or replace a single entry."""
+        self._connection().execute(
+            "INSERT OR REPLACE INTO analysis "
+            "(zobrist, limits, best_move, ponder, score_cp, mate, depth, pv, created) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                _to_signed(zobrist),
+                limits.to_go_command(),
+                result.best_move,
+                result.ponder,
+                result.score_cp,
+                result.mate,
+                result.depth,
+                " ".join(result.pv),
+                time.time(),
+            ),
+        )
+
+    def evict(self) -> int:
+        """Delete the oldest entries beyond `max_entries`.
+
+        The table is counted on every check, since other processes sharing the
+        file insert and evict entries too; checks run only every
+        `evict_interval` writes, on the worker thread for async callers.
+
+        Returns:
+            The number of deleted entries
+        """
+        excess = len(self) - self.max_entries
+        if excess <= 0:
+            return 0
+        cursor = self._connection().execute(
+            "DELETE FROM analysis WHERE (zobrist, limits) IN "
+            "(SELECT zobrist, limits FROM analysis ORDER BY created LIMIT ?)",
+            (excess,),
+        )
+        deleted = max(cursor.rowcount, 0)
+        self.evictions += deleted
+        logger.debug("Evicted %d entries from the analysis cache", deleted)
+        return deleted
+
+    def __len__(self) -> int:
+        """Return the number of stored entries, counting the whole table."""
+        (count,) = self._connection().execute("SELECT COUNT(*) FROM analysis").fetchone()
+        return int(count)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters for this process."""
+        lookups = self.hits + self.misses
+        return {
+            "path": str(self.path),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+        }
+
+    def close(self) -> None:
+        """Close the database connection after pending calls finish."""
+        self._executor.shutdown(wait=True)
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def _connection(self) -> sqlite3.Connection:
+        """Return the open connection."""
+        if self._conn is None:
+            raise RuntimeError("Analysis cache is closed")
+        return self._conn
@@ -0,0 +1,382 @@
+"""Provide an asyncio driver for the Stockfish chess engine."""
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from chesspal_mcp_engine.config import settings
+from chesspal_mcp_engine.engine_wrapper import StockfishError, _get_engine_path
+from chesspal_mcp_engine.metrics import metrics
+from chesspal_mcp_engine.models import SearchLimits, SearchResult
+from chesspal_mcp_engine.shutdown import EngineRegistry
+from chesspal_mcp_engine.uci_info import InfoCollector, parse_info, parse_search_result
+
+# Initialize logger
+logger = logging.getLogger(__name__)
+
+# Receives the fields of every scored info line of a running search, see SearchInfo.as_dict
+InfoCallback = Callable[[Dict[str, Any]], Awaitable[None]]
+
+
+class AsyncStockfishEngine:
+    """Drive a Stockfish process through asyncio subprocess pipes.
+
+    A reader task dispatches every line from the engine's stdout as soon as it
+    arrives, so responses are not quantized by polling and one event loop can
+    drive many engine processes concurrently.
+    """
+
+    def __init__(self, threads: int | None = None, hash_mb: int | None = None):
+        """Initialize the engine without starting the process.
+
+        Args:
+            threads: UCI Threads option, defaults to CHESSPAL_ENGINE_THREADS
+            hash_mb: UCI Hash option in MB, defaults to CHESSPAL_ENGINE_HASH_MB
+        """
+        self.process: Optional[asyncio.subprocess.Process] = None
+        self.threads = threads if threads is not None else settings.CHESSPAL_ENGINE_THREADS
+        self.hash_mb = hash_mb if hash_mb is not None else settings.CHESSPAL_ENGINE_HASH_MB
+        self._lines: asyncio.Queue[Optional[str]] = asyncio.Queue()
+        self._reader_task: Optional[asyncio.Task] = None
+        # Set while a search may still emit output nobody is waiting for
+        self._needs_sync = False
+        # Current MultiPV option, changed only when a search asks for another value
+        self._multipv = 1
+        # Held for each command and the response it is waiting for, so exchanges never interleave
+        self._lock = asyncio.Lock()
+        # time.monotonic() of the last line the engine wrote, updated by the reader task
+        self.last_heartbeat: Optional[float] = None
+
+    async def start(self) -> None:
+        """Start the Stockfish process and complete the UCI handshake."""
+        try:
+            stockfish_path = _get_engine_path()
+            logger.info("Starting Stockfish process...")
+            self.process = await asyncio.create_subprocess_exec(
+                str(stockfish_path),
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.DEVNULL,
+            )
+            self._lines = asyncio.Queue()
+            self._multipv = 1
+            self._reader_task = asyncio.create_task(self._read_lines())
+            EngineRegistry.register(self)
+
+            # Initialize UCI mode
+            logger.info("Initializing UCI mode...")
+            self._send_command("uci")
+            await self._read_response(until="uciok", timeout=5.0)
+
+            # Set options
+            logger.info("Setting engine options...")
+            self._send_command(f"setoption name Hash value {self.hash_mb}")
+            self._send_command(f"setoption name Threads value {self.threads}")
+            if settings.CHESSPAL_SYZYGY_PATH:
+                self._send_command(f"setoption name SyzygyPath value {settings.CHESSPAL_SYZYGY_PATH}")
+                self._send_command(f"setoption name SyzygyProbeLimit value {settings.CHESSPAL_SYZYGY_MAX_PIECES}")
+
+            # Verify engine is ready
+            self._send_command("isready")
+            await self._read_response(until="readyok", timeout=5.0)
+
+            logger.info("Engine initialized successfully")
+
+        except Exception as e:
+            self.stop()
+            raise StockfishError(f"Failed to initialize engine: {e}")
+
+    def _send_command(self, command: str) -> None:
+        """Send a command to the Stockfish engine."""
+        if self.process is None or self.process.returncode is not None or self.process.stdin is None:
+            raise StockfishError("Engine process is not running")
+
+        try:
+            logger.debug(f"Sending command: {command}")
+            self.process.stdin.write(f"{command}\n".encode())
+        except (BrokenPipeError, ConnectionResetError) as e:
+            raise StockfishError(f"Failed to send command: {e}")
+
+    async def _read_lines(self) -> None:
+        """Dispatch engine output lines to waiting readers until EOF."""
+        try:
+            if self.process is None or self.process.stdout is None:
+                return
+            stdout = self.process.stdout
+            while True:
+                line = await stdout.readline()
+                if not line:
+                    break
+                self.last_heartbeat = time.monotonic()
+                text = line.decode().strip()
+                if text:
+                    self._lines.put_nowait(text)
+        except Exception as e:
+            logger.error(f"Error reading engine output: {e}")
+        finally:
+            # None marks the end of the engine output
+            self._lines.put_nowait(None)
+
+    async def _collect_until(
+        self,
+        until: str,
+        on_line: Optional[Callable[[str], Awaitable[None]]] = None,
+        retain: Optional[Callable[[str], bool]] = None,
+    ) -> List[str]:
+        """Collect response lines up to and including the one starting with `until`."""
+        responses: List[str] = []
+        while True:
+            line = await self._lines.get()
+            if line is None:
+                # Keep the end marker for any later reader
+                self._lines.put_nowait(None)
+                raise StockfishError("Engine process terminated unexpectedly")
+            logger.debug(f"Received: {line}")
+            if on_line is not None:
+                await on_line(line)
+            if line.startswith(until):
+                responses.append(line)
+                return responses
+            if retain is None or retain(line):
+                responses.append(line)
+
+    async def _read_response(
+        self,
+        until: str,
+        timeout: float = 2.0,
+        on_line: Optional[Callable[[str], Awaitable[None]]] = None,
+        retain: Optional[Callable[[str], bool]] = None,
+    ) -> List[str]:
+        """Read response lines from the Stockfish engine.
+
+        Args:
+            until: Prefix of the line that ends the response
+            timeout: Maximum time to wait for the full response
+            on_line: Coroutine function awaited with each line as it arrives
+            retain: Called with each line before the `until` line; only lines
+                it returns True for are kept, so a caller that extracts what it
+                needs as lines arrive keeps memory constant. Defaults to
+                keeping every line.
+
+        Returns:
+            List of response lines from the engine, ending with the `until` line
+        """
+        try:
+            return await asyncio.wait_for(self._collect_until(until, on_line, retain), timeout)
+        except asyncio.TimeoutError:
+            raise StockfishError(f"Timeout waiting for response (waited {timeout}s)")
+
+    async def _sync(self) -> None:
+        """Stop any abandoned search and discard its output."""
+        logger.debug("Resynchronizing engine after an unfinished search")
+        self._send_command("stop")
+        self._send_command("isready")
+        await self._read_response(until="readyok", timeout=5.0)
+        self._needs_sync = False
+
+    def _stop_search(self) -> None:
+        """Ask the engine to end the running search with its best move so far."""
+        if self.is_alive():
+            try:
+                self._send_command("stop")
+            except StockfishError as e:
+                logger.warning(f"Failed to stop search: {e}")
+
+    async def search(
+        self,
+        fen: str,
+        move_history: List[str] | None = None,
+        limits: SearchLimits | None = None,
+        on_info: InfoCallback | None = None,
+        deadline: float | None = None,
+        multipv: int = 1,
+    ) -> SearchResult:
+        """Search a position and return the best move with its score, depth and PV.
+
+        If the search is cancelled or times out, the engine is told to stop
+        right away so it is free for the next search. Concurrent calls on one
+        engine hold its lock in turn, so each reads only its own response.
+
+        Args:
+            fen: Board position in FEN format
+            move_history: Moves played from the FEN position in UCI format
+            limits: Search limits, defaults to the server-side defaults from settings
+            on_info: Coroutine function awaited with the parsed progress of
+                every scored info line while the search runs
+            deadline: time.monotonic() value at which the search is stopped
+                and the best move found so far is returned as a partial result
+            multipv: Number of principal variations to search; the result
+                lists each of them as a candidate
+        """
+        if not self.is_alive():
+            raise StockfishError("Engine not initialized or not running")
+
+        # Everything from the position command to the bestmove line is one exchange
+        async with self._lock:
+            try:
+                if self._needs_sync:
+                    await self._sync()
+
+                limits = limits or SearchLimits.resolve()
+                logger.info(f"Getting best move for position: {fen}")
+                if move_history:
+                    logger.debug(f"Move history: {move_history}")
+
+                if multipv != self._multipv:
+                    self._send_command(f"setoption name MultiPV value {multipv}")
+                    self._multipv = multipv
+
+                # Set position
+                position_cmd = f"position fen {fen}"
+                if move_history:
+                    position_cmd += f" moves {' '.join(move_history)}"
+                self._send_command(position_cmd)
+
+                # Get best move
+                logger.debug("Calculating best move...")
+                self._needs_sync = True
+                self._send_command(limits.to_go_command())
+                started = time.monotonic()
+
+                async def report_info(line: str) -> None:
+                    info = parse_info(line)
+                    if info is not None and on_info is not None:
+                        await on_info(info.as_dict())
+
+                stopped = False
+
+                def stop_at_deadline() -> None:
+                    nonlocal stopped
+                    stopped = True
+                    self._stop_search()
+
+                # Only the latest line per multipv slot is kept, however long the search runs
+                collector = InfoCollector()
+
+                def retain(line: str) -> bool:
+                    collector.feed(line)
+                    return False
+
+                stop_handle = None
+                if deadline is not None:
+                    stop_handle = asyncio.get_running_loop().call_later(
+                        max(deadline - time.monotonic(), 0), stop_at_deadline
+                    )
+                try:
+                    responses = await self._read_response(
+                        until="bestmove",
+                        timeout=limits.response_timeout(),
+                        on_line=report_info if on_info else None,
+                        retain=retain,
+                    )
+                except BaseException:
+                    # Nobody will use this search; _sync() discards its remaining output later
+                    self._stop_search()
+                    raise
+                finally:
+                    if stop_handle is not None:
+                        stop_handle.cancel()
+                self._needs_sync = False
+
+                # The last line is the bestmove line
+                result = parse_search_result(responses[-1], collector, multipv)
+                result.partial = stopped
+                metrics.record_search(time.monotonic() - started, result.nodes, result.nps)
+                logger.info(f"Best move found: {result.best_move}")
+                return result
+
+            except Exception as e:
+                raise StockfishError(f"Error getting best move: {e}")
+
+    async def get_best_move(
+        self, fen: str, move_history: List[str] | None = None, limits: SearchLimits | None = None
+    ) -> str:
+        """Get the best move for a given position.
+
+        Args:
+            fen: Board position in FEN format
+            move_history: Moves played from the FEN position in UCI format
+            limits: Search limits, defaults to the server-side defaults from settings
+        """
+        result = await self.search(fen, move_history, limits)
+        return result.best_move
+
+    async def is_ready(self, timeout: float = 1.0) -> bool:
+        """Check that the engine answers isready.
+
+        While a search holds the engine only the process state is checked:
+        waiting for the engine would delay the probe by the whole search, and
+        the engine's output during the search already shows it is responsive
+        (see heartbeat_age()).
+
+        Returns:
+            bool: True if the engine replied readyok in time, or is alive and
+            searching, False otherwise.
+        """
+        if not self.is_alive():
+            return False
+        if self._lock.locked():
+            return True
+        async with self._lock:
+            try:
+                self._send_command("isready")
+                await self._read_response(until="readyok", timeout=timeout)
+                return True
+            except Exception:
+                # A late readyok must not be read by the next search
+                self._needs_sync = True
+                return False
+
+    def heartbeat_age(self) -> Optional[float]:
+        """Return the seconds since the engine last wrote output, or None if it never did.
+
+        This never touches the engine, so it is safe to call as often as
+        probes require.
+        """
+        if self.last_heartbeat is None:
+            return None
+        return time.monotonic() - self.last_heartbeat
+
+    def is_alive(self) -> bool:
+        """Check that the engine process is running."""
+        return self.process is not None and self.process.returncode is None
+
+    async def close(self) -> None:
+        """Stop the Stockfish engine gracefully, killing it if it does not quit."""
+        if self.process:
+            try:
+                logger.info("Stopping engine process...")
+                if self.is_alive():
+                    self._send_command("quit")
+                    await asyncio.wait_for(self.process.wait(), timeout=5.0)
+            except Exception as e:
+                logger.warning(f"Error during graceful shutdown: {e}")
+        self.stop()
+
+    def stop(self) -> None:
+        """Stop the Stockfish engine immediately.
+
+        This is synchronous so it can be called from signal handlers and the
+        EngineRegistry; use close() from async code for a graceful quit.
+        """
+        if self.process:
+            try:
+                if self.process.returncode is None:
+                    self.process.kill()
+            except ProcessLookupError:
+                pass
+            except Exception as e:
+                logger.error(f"Failed to kill engine process: {e}")
+            finally:
+                self.process = None
+                if self._reader_task is not None:
+                    try:
+                        self._reader_task.cancel()
+                    except RuntimeError:
+                        # The event loop is already closed
+                        pass
+                    self._reader_task = None
+                logger.info("Engine stopped")
+                # Unregister from registry
+                EngineRegistry.unregister(self)
@@ -0,0 +1,261 @@
+"""Command-line analysis of large PGN files across a pool of worker processes."""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import multiprocessing.util
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Set, Tuple
+
+import chess.pgn
+
+from chesspal_mcp_engine.async_engine import AsyncStockfishEngine
+from chesspal_mcp_engine.config import settings
+from chesspal_mcp_engine.game_analysis import analyze_moves
+from chesspal_mcp_engine.logging_config import get_logger, setup_logging
+from chesspal_mcp_engine.models import SearchLimits
+
+logger = get_logger(__name__)
+
+# Per-worker state, set up once by _init_worker in each worker process
+_worker: Dict[str, Any] = {}
+
+
+def index_games(pgn_path: str | Path) -> Iterator[Tuple[int, int]]:
+    """Yield (game index, file offset) for every game in a PGN file.
+
+    Only the headers are parsed and the movetext is skipped, so the file is
+    streamed without holding games in memory. Workers re-read each game from
+    its offset.
+    """
+    with open(pgn_path, encoding="utf-8-sig", errors="replace") as handle:
+        index = 0
+        while True:
+            offset = handle.tell()
+            if chess.pgn.read_headers(handle) is None:
+                return
+            yield index, offset
+            index += 1
+
+
+def errors_path(output_path: str | Path) -> Path:
+    """Return the file receiving the failed games of an output file, e.g. out.errors.jsonl for out.jsonl."""
+    path = Path(output_path)
+    return path.with_name(f"{path.stem}.errors{path.suffix}")
+
+
+def load_checkpoint(output_path: str | Path) -> Set[int]:
+    """Return the indices of games already analyzed in the output file.
+
+    The file is streamed line by line. Records holding an error are not
+    counted, so those games are retried. A trailing line cut short by an
+    interruption is removed so that appending resumes on a clean line.
+    """
+    path = Path(output_path)
+    if not path.exists():
+        return set()
+
+    done = set()
+    # Offset just past the last complete line
+    end = 0
+    with open(path, "rb+") as handle:
+        for line in handle:
+            if not line.endswith(b"\n"):
+                break
+            end += len(line)
+            try:
+                record = json.loads(line)
+                if "error" not in record:
+                    done.add(record["game"])
+            except (ValueError, KeyError, TypeError):
+                continue
+        if handle.seek(0, os.SEEK_END) != end:
+            logger.warning("Discarding incomplete last line of %s", path)
+            handle.truncate(end)
+    return done
+
+
+def _init_worker(pgn_path: str, limits: SearchLimits, threads: int, hash_mb: int) -> None:
+    """Start the worker's own event loop and engine."""
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    engine = AsyncStockfishEngine(threads=threads, hash_mb=hash_mb)
+    _worker.update(loop=loop, engine=engine, pgn_path=pgn_path, limits=limits, error=None)
+    try:
+        loop.run_until_complete(engine.start())
+    except Exception as e:
+        # Report the failure per game rather than letting the pool respawn the worker forever
+        _worker["error"] = f"Engine failed to start: {e}"
+    # Pool workers leave through os._exit, which skips atexit but runs multiprocessing finalizers
+    multiprocessing.util.Finalize(None, _close_worker, exitpriority=10)
+
+
+def _close_worker() -> None:
+    """Quit the worker's engine."""
+    engine, loop = _worker.get("engine"), _worker.get("loop")
+    if engine is not None and loop is not None and not loop.is_closed():
+        try:
+            loop.run_until_complete(engine.close())
+        finally:
+            loop.close()
+
+
+def _live_engine() -> AsyncStockfishEngine:
+    """Return the worker's engine, starting a new one if the previous engine died.
+
+    Raises:
+        StockfishError: If the replacement engine fails to start
+    """
+    engine: AsyncStockfishEngine = _worker["engine"]
+    if engine.is_alive():
+        return engine
+    logger.warning("Worker engine died, starting a new one")
+    engine.stop()
+    engine = AsyncStockfishEngine(threads=engine.threads, hash_mb=engine.hash_mb)
+    _worker["engine"] = engine
+    _worker["loop"].run_until_complete(engine.start())
+    return engine
+
+
+def _analyze_game(task: Tuple[int, int]) -> Dict[str, Any]:
+    """Analyze one game in a worker process.
+
+    Args:
+        task: (game index, file offset) as produced by index_games
+
+    Returns:
+        A JSON-serializable record with the game index, headers and ply
+        reports, or an error message
+    """
+    index, offset = task
+    if _worker.get("error"):
+        return {"game": index, "error": _worker["error"]}
+
+    try:
+        with open(_worker["pgn_path"], encoding="utf-8-sig", errors="replace") as handle:
+            handle.seek(offset)
+            game = chess.pgn.read_game(handle)
+        if game is None:
+            return {"game": index, "error": "No game found at offset %d" % offset}
+        if game.errors:
+            return {"game": index, "headers": dict(game.headers), "error": str(game.errors[0])}
+
+        plies = _worker["loop"].run_until_complete(
+            analyze_moves(_live_engine().search, game.board(), list(game.mainline_moves()), _worker["limits"])
+        )
+        return {"game": index, "headers": dict(game.headers), "plies": plies}
+    except Exception as e:
+        logger.error("Error analyzing game %d: %s", index, e)
+        return {"game": index, "error": str(e)}
+
+
+def run_analysis(
+    pgn_path: str | Path,
+    output_path: str | Path,
+    workers: int,
+    limits: SearchLimits,
+    threads: int = 1,
+    hash_mb: int = 64,
+    resume: bool = True,
+) -> int:
+    """Analyze every game of a PGN file, appending one JSON line per game to the output.
+
+    Games are sharded over `workers` processes, each running its own engine,
+    and written as soon as they finish. The output doubles as the checkpoint:
+    with `resume`, games already present in it are skipped. Games that failed
+    are written to errors_path(output_path) instead, which every run
+    rewrites, so a resumed run retries them.
+
+    Args:
+        pgn_path: PGN file to analyze
+        output_path: JSONL file receiving one record per game
+        workers: Number of worker processes
+        limits: Search limits for every position
+        threads: UCI Threads option of each worker's engine
+        hash_mb: UCI Hash option (MB) of each worker's engine
+        resume: Skip games already in the output instead of overwriting it
+
+    Returns:
+        The number of games analyzed or failed in this run
+    """
+    if resume:
+        done = load_checkpoint(output_path)
+        if done:
+            logger.info("Resuming: %d games already analyzed", len(done))
+    else:
+        done = set()
+        Path(output_path).unlink(missing_ok=True)
+
+    tasks = ((index, offset) for index, offset in index_games(pgn_path) if index not in done)
+    start_time = time.monotonic()
+    written = 0
+    with (
+        open(output_path, "a", encoding="utf-8") as output,
+        open(errors_path(output_path), "w", encoding="utf-8") as errors,
+        multiprocessing.Pool(
+            processes=workers, initializer=_init_worker, initargs=(str(pgn_path), limits, threads, hash_mb)
+        ) as pool,
+    ):
+        for record in pool.imap_unordered(_analyze_game, tasks):
+            destination = errors if "error" in record else output
+            destination.write(json.dumps(record) + "\n")
+            destination.flush()
+            written += 1
+            if "error" in record:
+                logger.warning("Game %d failed: %s", record["game"], record["error"])
+            if written % 100 == 0:
+                elapsed = time.monotonic() - start_time
+                logger.info("Analyzed %d games (%.2f games/s)", written, written / elapsed)
+        # Let workers exit normally so their engines quit cleanly
+        pool.close()
+        pool.join()
+
+    elapsed = time.monotonic() - start_time
+    logger.info(
+        "Analyzed %d games in %.1fs (%.2f games/s)", written, elapsed, written / elapsed if elapsed > 0 else 0.0
+    )
+    return written
+
+
+def main_cli(argv: Optional[list] = None) -> None:
+    """Parse arguments and analyze a PGN file."""
+    parser = argparse.ArgumentParser(description="Analyze every game of a PGN file with a pool of Stockfish workers")
+    parser.add_argument("pgn", help="PGN file to analyze")
+    parser.add_argument(
+        "-o",
+        "--output",
+        required=True,
+        help="JSONL output file, also used as the resume checkpoint; failed games go to NAME.errors.jsonl next to it",
+    )
+    parser.add_argument(
+        "-w", "--workers", type=int, default=os.cpu_count() or 1, help="Number of worker processes (default: CPUs)"
+    )
+    parser.add_argument("--threads", type=int, default=1, help="UCI Threads per worker engine (default: 1)")
+    parser.add_argument("--hash-mb", type=int, default=64, help="UCI Hash per worker engine in MB (default: 64)")
+    parser.add_argument("--depth", type=int, help="Search depth per position")
+    parser.add_argument("--nodes", type=int, help="Nodes per position")
+    parser.add_argument("--movetime-ms", type=int, help="Search time per position in milliseconds")
+    parser.add_argument(
+        "--no-resume", action="store_true", help="Overwrite the output instead of skipping games already in it"
+    )
+    args = parser.parse_args(argv)
+
+    setup_logging(settings.LOG_LEVEL)
+    limits = SearchLimits.resolve(depth=args.depth, nodes=args.nodes, movetime_ms=args.movetime_ms)
+    logger.info("Analyzing %s with %d workers (%s)", args.pgn, args.workers, limits.to_go_command())
+    run_analysis(
+        args.pgn,
+        args.output,
+        workers=max(args.workers, 1),
+        limits=limits,
+        threads=args.threads,
+        hash_mb=args.hash_mb,
+        resume=not args.no_resume,
+    )
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,155 @@
+"""In-process caching and deduplication of engine search results."""
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple, TypeVar
+
+import chess
+import chess.polyglot
+
+from .models import SearchLimits
+
+CacheKey = Tuple[int, SearchLimits]
+T = TypeVar("T")
+
+
+def cache_key(board: chess.Board, limits: SearchLimits) -> CacheKey:
+    """Build a cache key from the position's Zobrist hash and the search limits.
+
+    The Zobrist hash covers pieces, side to move, castling rights and en passant
+    but not the move clocks or repetition history, matching how the engine's
+    own transposition table identifies positions.
+    """
+    return chess.polyglot.zobrist_hash(board), limits
+
+
+class BestMoveCache:
+    """A size-bounded LRU cache of best moves with a per-entry time to live."""
+
+    def __init__(self, max_size: int, ttl: Optional[float] = None):
+        """Initialize the cache.
+
+        Args:
+            max_size: Maximum number of entries kept before evicting the least recently used
+            ttl: Seconds an entry stays valid, None to keep entries until evicted
+        """
+        if max_size < 1:
+            raise ValueError("Cache size must be at least 1")
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, Tuple[float, str]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable) -> Optional[str]:
+        """Return the cached best move for `key`, or None on a miss."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, best_move = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return best_move
+
+    def put(self, key: Hashable, best_move: str) -> None:
+        """Store the best move for `key`, evicting the least recently used entry if full."""
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else float("inf")
+        self._entries[key] = (expires_at, best_move)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        """Return the number of cached entries."""
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return cache size and hit/miss counters."""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+class SingleFlight:
+    """Deduplicate concurrent calls for the same key.
+
+    The first caller for a key starts the work as a task; callers arriving
+    while it runs await the same task instead of starting their own. A caller
+    being cancelled does not cancel the shared task for the others, but the
+    task is cancelled once every caller waiting on it has been.
+    """
+
+    def __init__(self):
+        """Initialize with no calls in flight."""
+        self._in_flight: Dict[Hashable, "asyncio.Task[Any]"] = {}
+        # Number of callers awaiting each in-flight task
+        self._callers: Dict["asyncio.Task[Any]", int] = {}
+        self.started = 0
+        self.coalesced = 0
+
+    async def run(self, key: Hashable, func: Callable[[], Awaitable[T]]) -> T:
+        """Return the result of `func()`, sharing one in-flight call per key.
+
+        Args:
+            key: Identifies calls that produce the same result
+            func: Coroutine function started when no call for `key` is in flight
+        """
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(func())
+            self._in_flight[key] = task
+            self._callers[task] = 0
+            task.add_done_callback(lambda _: self._forget(key, task))
+            self.started += 1
+        else:
+            self.coalesced += 1
+
+        self._callers[task] += 1
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if self._callers.get(task, 0) == 1 and not task.done():
+                # Nobody is left waiting for the result; later callers start afresh
+                task.cancel()
+                self._forget(key, task)
+            raise
+        finally:
+            if task in self._callers:
+                self._callers[task] -= 1
+
+    def _forget(self, key: Hashable, task: "asyncio.Task[Any]") -> None:
+        """Drop a finished or abandoned call unless a newer call for the key replaced it."""
+        self._callers.pop(task, None)
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+
+    def __len__(self) -> int:
+        """Return the number of calls in flight."""
+        return len(self._in_flight)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return in-flight and coalescing counters."""
+        return {"in_flight": len(self._in_flight), "started": self.started, "coalesced": self.coalesced}
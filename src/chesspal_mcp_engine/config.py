@@ -61,6 +61,12 @@ class Settings(BaseSettings):
     HEALTH_HOST: str = Field(default="0.0.0.0", description="Host address for the health server.")
     HEALTH_PORT: int = Field(default=8080, description="Port for the health server.")
     HEALTH_LOG_LEVEL: str = Field(default="INFO", description="Log level for the health server.")
+    HEALTH_STATE_INTERVAL_MS: int = Field(
+        default=1000, description="Interval in milliseconds at which engine state is published to the health server."
+    )
+    HEALTH_HEARTBEAT_TIMEOUT_S: float = Field(
+        default=30.0, description="Seconds a busy engine may go without output before /health reports it as hung."
+    )
 
     # --- Chess Engine Specific Settings ---
     CHESSPAL_ENGINE_PATH: Optional[str] = Field(
@@ -74,9 +80,81 @@ class Settings(BaseSettings):
         description="Operating system for the engine binary. Defaults to current OS.",
     )
     CHESSPAL_ENGINE_BINARY: str = Field(default="stockfish", description="Name of the engine binary file.")
-    CHESSPAL_ENGINE_DEPTH: int = Field(default=10, description="Search depth for the chess engine.")
+    CHESSPAL_ENGINE_DEPTH: int = Field(
+        default=10, description="Search depth used when a request sets no search limits."
+    )
     CHESSPAL_ENGINE_TIMEOUT_MS: int = Field(
-        default=1000, description="Timeout in milliseconds for engine move calculation."
+        default=1000, description="Time in milliseconds for engine move calculation when a request sets no limits."
+    )
+    CHESSPAL_ENGINE_MAX_DEPTH: int = Field(default=30, description="Maximum search depth a request may ask for.")
+    CHESSPAL_ENGINE_MAX_NODES: int = Field(
+        default=50_000_000, description="Maximum number of nodes a request may ask to search."
+    )
+    CHESSPAL_ENGINE_MAX_MOVETIME_MS: int = Field(
+        default=10000, description="Maximum time in milliseconds any single search may take."
+    )
+    CHESSPAL_ENGINE_MAX_MULTIPV: int = Field(
+        default=10, description="Maximum number of candidate moves a MultiPV analysis may ask for."
+    )
+
+    # --- Engine Pool Settings ---
+    CHESSPAL_ENGINE_POOL_SIZE: int = Field(default=1, description="Number of engine processes in the pool.")
+    CHESSPAL_ENGINE_THREADS: int = Field(default=4, description="UCI Threads option for each engine process.")
+    CHESSPAL_ENGINE_HASH_MB: int = Field(default=128, description="UCI Hash option (MB) for each engine process.")
+    CHESSPAL_ENGINE_POOL_TIMEOUT_MS: int = Field(
+        default=30000, description="Maximum time in milliseconds a request waits for an idle engine."
+    )
+    CHESSPAL_ENGINE_SPARES: int = Field(
+        default=1, description="Started engines kept in reserve to replace a crashed engine without a handshake."
+    )
+    CHESSPAL_ENGINE_MAX_QUEUE: int = Field(
+        default=1000,
+        description="Maximum number of requests of a priority class or above waiting for an engine before new ones are rejected (0 = unlimited).",
+    )
+
+    # --- Batch Settings ---
+    CHESSPAL_MAX_BATCH_SIZE: int = Field(default=256, description="Maximum number of items in a batch request.")
+
+    # --- Cache Settings ---
+    CHESSPAL_CACHE_SIZE: int = Field(
+        default=10000, description="Maximum number of cached best moves. 0 disables the cache."
+    )
+    CHESSPAL_CACHE_TTL_S: int = Field(
+        default=3600, description="Seconds a cached best move stays valid. 0 keeps entries until evicted."
+    )
+    CHESSPAL_ANALYSIS_CACHE_PATH: Optional[str] = Field(
+        default=None, description="Optional SQLite file persisting analysis across restarts. Disabled if not set."
+    )
+    CHESSPAL_ANALYSIS_CACHE_MAX_ENTRIES: int = Field(
+        default=1_000_000, description="Number of positions kept in the persistent analysis cache."
+    )
+
+    # --- Opening Book Settings ---
+    CHESSPAL_BOOK_PATH: Optional[str] = Field(
+        default=None, description="Optional Polyglot .bin opening book consulted before searching."
+    )
+    CHESSPAL_BOOK_SELECTION: str = Field(
+        default="weighted", description="Book move selection: 'weighted' (random by weight) or 'best'."
+    )
+
+    # --- Tablebase Settings ---
+    CHESSPAL_SYZYGY_PATH: Optional[str] = Field(
+        default=None,
+        description="Optional Syzygy tablebase directory probed before searching and passed to the engine.",
+    )
+    CHESSPAL_SYZYGY_MAX_PIECES: int = Field(
+        default=6, description="Largest piece count (kings included) answered from the tablebase."
+    )
+    CHESSPAL_SYZYGY_MAX_OPEN_TABLES: int = Field(
+        default=128, description="Maximum number of tablebase files kept open at once."
+    )
+
+    # --- Session Settings ---
+    CHESSPAL_MAX_SESSIONS: int = Field(
+        default=1000, description="Maximum number of open game sessions before the least recently used is evicted."
+    )
+    CHESSPAL_SESSION_IDLE_TIMEOUT_S: int = Field(
+        default=1800, description="Seconds after which an unused game session is evicted."
     )
 
     # Configure Pydantic Settings
@@ -131,6 +209,20 @@ class Settings(BaseSettings):
             raise ValueError("Port must be between 1 and 65535")
         return v
 
+    @field_validator("HEALTH_STATE_INTERVAL_MS")
+    def validate_health_state_interval(cls, v: int) -> int:
+        """Validate the health state publishing interval."""
+        if v < 10:
+            raise ValueError("Health state interval must be at least 10 milliseconds")
+        return v
+
+    @field_validator("HEALTH_HEARTBEAT_TIMEOUT_S")
+    def validate_health_heartbeat_timeout(cls, v: float) -> float:
+        """Validate the heartbeat timeout of busy engines."""
+        if v <= 0:
+            raise ValueError("Health heartbeat timeout must be positive")
+        return v
+
     @field_validator("CHESSPAL_ENGINE_DEPTH")
     def validate_depth(cls, v: int) -> int:
         """Validate engine depth."""
@@ -145,6 +237,132 @@ class Settings(BaseSettings):
             raise ValueError("Engine timeout must be between 100 and 60000 ms")
         return v
 
+    @field_validator("CHESSPAL_ENGINE_MAX_DEPTH")
+    def validate_max_depth(cls, v: int) -> int:
+        """Validate maximum engine depth."""
+        if not 1 <= v <= 245:  # Stockfish's MAX_PLY bound
+            raise ValueError("Maximum engine depth must be between 1 and 245")
+        return v
+
+    @field_validator("CHESSPAL_ENGINE_MAX_NODES")
+    def validate_max_nodes(cls, v: int) -> int:
+        """Validate maximum engine nodes."""
+        if v < 1:
+            raise ValueError("Maximum engine nodes must be positive")
+        return v
+
+    @field_validator("CHESSPAL_ENGINE_MAX_MOVETIME_MS")
+    def validate_max_movetime(cls, v: int) -> int:
+        """Validate maximum engine move time."""
+        if not 100 <= v <= 600000:
+            raise ValueError("Maximum engine move time must be between 100 and 600000 ms")
+        return v
+
+    @field_validator("CHESSPAL_ENGINE_MAX_QUEUE")
+    def validate_engine_max_queue(cls, v: int) -> int:
+        """Validate the engine queue length limit."""
+        if v < 0:
+            raise ValueError("Engine queue length limit cannot be negative")
+        return v
+
+    @field_validator("CHESSPAL_ENGINE_SPARES")
+    def validate_engine_spares(cls, v: int) -> int:
+        """Validate number of spare engines."""
+        if not 0 <= v <= 16:
+            raise ValueError("Number of spare engines must be between 0 and 16")
+        return v
+
+    @field_validator("CHESSPAL_ENGINE_MAX_MULTIPV")
+    def validate_max_multipv(cls, v: int) -> int:
+        """Validate maximum number of MultiPV lines."""
+        if not 1 <= v <= 500:
+            raise ValueError("Maximum MultiPV must be between 1 and 500")
+        return v
+
+    @field_validator("CHESSPAL_MAX_BATCH_SIZE")
+    def validate_max_batch_size(cls, v: int) -> int:
+        """Validate batch request size limit."""
+        if not 1 <= v <= 100000:
+            raise ValueError("Maximum batch size must be between 1 and 100000")
+        return v
+
+    @field_validator("CHESSPAL_CACHE_SIZE", "CHESSPAL_CACHE_TTL_S")
+    def validate_non_negative(cls, v: int) -> int:
+        """Validate cache settings are not negative."""
+        if v < 0:
+            raise ValueError("Cache settings must not be negative")
+        return v
+
+    @field_validator("CHESSPAL_ENGINE_POOL_SIZE")
+    def validate_pool_size(cls, v: int) -> int:
+        """Validate engine pool size."""
+        if not 1 <= v <= 256:
+            raise ValueError("Engine pool size must be between 1 and 256")
+        return v
+
+    @field_validator("CHESSPAL_ENGINE_THREADS")
+    def validate_threads(cls, v: int) -> int:
+        """Validate engine thread count."""
+        if not 1 <= v <= 1024:
+            raise ValueError("Engine threads must be between 1 and 1024")
+        return v
+
+    @field_validator("CHESSPAL_ENGINE_HASH_MB")
+    def validate_hash_mb(cls, v: int) -> int:
+        """Validate engine hash size."""
+        if not 1 <= v <= 33554432:  # Stockfish's own Hash bounds
+            raise ValueError("Engine hash size must be between 1 and 33554432 MB")
+        return v
+
+    @field_validator("CHESSPAL_ENGINE_POOL_TIMEOUT_MS")
+    def validate_pool_timeout(cls, v: int) -> int:
+        """Validate engine pool acquire timeout."""
+        if not 100 <= v <= 600000:
+            raise ValueError("Engine pool timeout must be between 100 and 600000 ms")
+        return v
+
+    @field_validator("CHESSPAL_ANALYSIS_CACHE_MAX_ENTRIES")
+    def validate_analysis_cache_max_entries(cls, v: int) -> int:
+        """Validate persistent analysis cache size."""
+        if v < 1:
+            raise ValueError("Analysis cache must hold at least one entry")
+        return v
+
+    @field_validator("CHESSPAL_BOOK_SELECTION")
+    def validate_book_selection(cls, v: str) -> str:
+        """Validate opening book selection mode."""
+        if v.lower() not in ("weighted", "best"):
+            raise ValueError("Book selection must be 'weighted' or 'best'")
+        return v.lower()
+
+    @field_validator("CHESSPAL_SYZYGY_MAX_PIECES")
+    def validate_syzygy_max_pieces(cls, v: int) -> int:
+        """Validate tablebase piece limit."""
+        if not 3 <= v <= 7:  # Syzygy tables exist for 3 to 7 pieces
+            raise ValueError("Syzygy piece limit must be between 3 and 7")
+        return v
+
+    @field_validator("CHESSPAL_SYZYGY_MAX_OPEN_TABLES")
+    def validate_syzygy_max_open_tables(cls, v: int) -> int:
+        """Validate number of open tablebase files."""
+        if v < 1:
+            raise ValueError("At least one tablebase file must be allowed open")
+        return v
+
+    @field_validator("CHESSPAL_MAX_SESSIONS")
+    def validate_max_sessions(cls, v: int) -> int:
+        """Validate maximum number of game sessions."""
+        if v < 1:
+            raise ValueError("At least one game session must be allowed")
+        return v
+
+    @field_validator("CHESSPAL_SESSION_IDLE_TIMEOUT_S")
+    def validate_session_idle_timeout(cls, v: int) -> int:
+        """Validate session idle timeout."""
+        if v < 1:
+            raise ValueError("Session idle timeout must be at least 1 second")
+        return v
+
 
 # Create global instance directly - reads from environment variables
 try:
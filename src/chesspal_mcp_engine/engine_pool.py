@@ -0,0 +1,505 @@
+"""Pool of Stockfish engine processes shared by concurrent MCP requests."""
+
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, Hashable, List, Optional, Sequence, Set, Tuple
+
+from chesspal_mcp_engine.async_engine import AsyncStockfishEngine, InfoCallback
+from chesspal_mcp_engine.engine_wrapper import StockfishError
+from chesspal_mcp_engine.logging_config import get_logger
+from chesspal_mcp_engine.metrics import metrics
+from chesspal_mcp_engine.models import SearchLimits, SearchResult
+from chesspal_mcp_engine.scheduler import Priority, RequestScheduler
+
+logger = get_logger(__name__)
+
+# Longest pause in seconds between attempts to start a replacement engine
+MAX_RESTART_BACKOFF = 30.0
+
+
+class EnginePoolError(StockfishError):
+    """Error acquiring an engine from the pool."""
+
+    pass
+
+
+class EnginePool:
+    """A fixed-size pool of Stockfish engine processes.
+
+    Each request checks out one engine for its exclusive use and returns it when
+    done, so concurrent clients are spread across processes instead of queuing
+    behind a single engine. Every process gets its own Threads/Hash budget.
+
+    Engines are driven by asyncio subprocess pipes, so searches never block the
+    event loop and all processes are served from the loop running the server.
+
+    The pool also supervises its engines: an engine found dead when it is
+    checked out or returned is replaced by a warm spare that has already
+    completed its UCI handshake, and a new spare is started in the
+    background. Without a spare the replacement is started in the
+    background instead, retrying until it succeeds; meanwhile the pool is
+    degraded, reporting the missing engines as `restarting` in stats().
+
+    Requests waiting for an engine are served by priority class, taking
+    turns between clients within a class (see RequestScheduler).
+    """
+
+    def __init__(
+        self,
+        size: int,
+        threads: int,
+        hash_mb: int,
+        acquire_timeout: Optional[float] = None,
+        engine_factory: Optional[Callable[..., AsyncStockfishEngine]] = None,
+        spares: int = 0,
+        max_queue: Optional[int] = None,
+    ):
+        """Initialize the pool without starting any engine processes.
+
+        Args:
+            size: Number of engine processes to run
+            threads: UCI Threads option for each engine
+            hash_mb: UCI Hash option (MB) for each engine
+            acquire_timeout: Maximum seconds to wait for an idle engine, None to wait forever
+            engine_factory: Callable creating an engine, defaults to AsyncStockfishEngine
+            spares: Number of started engines kept in reserve to replace crashed ones
+            max_queue: Maximum number of requests waiting for an engine, None
+                for no limit; further requests fail right away
+        """
+        if size < 1:
+            raise ValueError("Engine pool size must be at least 1")
+        if spares < 0:
+            raise ValueError("Number of spare engines cannot be negative")
+        self.size = size
+        self.threads = threads
+        self.hash_mb = hash_mb
+        self.acquire_timeout = acquire_timeout
+        self._engine_factory = engine_factory or AsyncStockfishEngine
+        self._engines: List[AsyncStockfishEngine] = []
+        self._idle: Deque[AsyncStockfishEngine] = deque()
+        # time.monotonic() at which each checked-out engine was handed out
+        self._checked_out: Dict[AsyncStockfishEngine, float] = {}
+        self._scheduler = RequestScheduler(max_queue)
+        self._acquisitions = 0
+        self._wait_time_total = 0.0
+        self._wait_time_max = 0.0
+        self.spares = spares
+        self._spares: Deque[AsyncStockfishEngine] = deque()
+        # Background engine starts replacing crashed engines and used spares
+        self._spawning: Set[asyncio.Task] = set()
+        self._started = False
+        self._crashes = 0
+        self._restarts = 0
+        self._spawn_failures = 0
+        self._recovery_time_last = 0.0
+        self._recovery_time_max = 0.0
+
+    async def start(self) -> None:
+        """Start all engine processes in the pool concurrently.
+
+        Raises:
+            StockfishError: If any engine fails to start; already started engines are stopped
+        """
+        missing = self.size - len(self._engines)
+        if missing <= 0:
+            return
+
+        logger.info(
+            "Starting engine pool: size=%d spares=%d threads=%d hash=%dMB",
+            self.size,
+            self.spares,
+            self.threads,
+            self.hash_mb,
+        )
+        missing += self.spares - len(self._spares)
+        try:
+            engines = [self._engine_factory(threads=self.threads, hash_mb=self.hash_mb) for _ in range(missing)]
+            results = await asyncio.gather(*(engine.start() for engine in engines), return_exceptions=True)
+        except Exception:
+            self.stop()
+            raise
+
+        errors = [result for result in results if isinstance(result, BaseException)]
+        if errors:
+            for engine in engines:
+                engine.stop()
+            self.stop()
+            raise errors[0]
+
+        for engine in engines:
+            if len(self._engines) < self.size:
+                self._engines.append(engine)
+                self._idle.append(engine)
+            else:
+                self._spares.append(engine)
+        self._started = True
+        logger.info("Engine pool started with %d engines and %d spares", len(self._engines), len(self._spares))
+
+    @asynccontextmanager
+    async def acquire(
+        self,
+        prefer: Optional[AsyncStockfishEngine] = None,
+        priority: Priority = Priority.LIVE,
+        client: Hashable = None,
+    ) -> AsyncIterator[AsyncStockfishEngine]:
+        """Check out an idle engine for the duration of the context.
+
+        Args:
+            prefer: Engine to hand out if it is idle, so a caller can keep
+                using the engine whose hash table already holds its positions
+            priority: Priority class of the request if it has to wait
+            client: Identifies the requesting client for fair turns within
+                the priority class, None for anonymous requests
+
+        Yields:
+            An engine reserved for the caller
+
+        Raises:
+            EnginePoolError: If the pool is not started or no engine becomes idle in time
+            QueueFullError: If the queue of waiting requests is full
+        """
+        if not self._started:
+            raise EnginePoolError("Engine pool is not started")
+
+        start_time = time.monotonic()
+        engine = self._take_idle(prefer)
+        if engine is None:
+            engine = await self._wait_for_engine(priority, client)
+
+        wait_time = time.monotonic() - start_time
+        self._scheduler.record_wait(priority, wait_time)
+        metrics.record_queue_wait(priority.name.lower(), wait_time)
+        self._acquisitions += 1
+        self._wait_time_total += wait_time
+        self._wait_time_max = max(self._wait_time_max, wait_time)
+        if wait_time > 0.1:
+            logger.debug("Waited %.3fs for an idle engine", wait_time)
+
+        self._checked_out[engine] = time.monotonic()
+        try:
+            yield engine
+        finally:
+            self._checked_out.pop(engine, None)
+            self._release(engine)
+
+    def _take_idle(self, prefer: Optional[AsyncStockfishEngine]) -> Optional[AsyncStockfishEngine]:
+        """Take a live idle engine, the preferred one if possible, unless others wait in line."""
+        if prefer is not None and not self._scheduler and prefer in self._idle and prefer.is_alive():
+            self._idle.remove(prefer)
+            return prefer
+        while self._idle and not self._scheduler:
+            engine = self._idle.popleft()
+            if engine.is_alive():
+                return engine
+            self._replace(engine)
+        return None
+
+    async def _wait_for_engine(self, priority: Priority, client: Hashable) -> AsyncStockfishEngine:
+        """Wait in line until an engine is released to this caller."""
+        waiter = self._scheduler.enqueue(priority, client)
+        try:
+            return await asyncio.wait_for(waiter, timeout=self.acquire_timeout)
+        except BaseException as e:
+            if waiter.done() and not waiter.cancelled():
+                # An engine was handed over just as the wait ended; pass it on
+                self._release(waiter.result())
+            if isinstance(e, asyncio.TimeoutError):
+                message = f"Timed out waiting for an idle engine (waited {self.acquire_timeout}s)"
+                restarting = self.restarting
+                if restarting:
+                    message += f"; {restarting} of {self.size} engines are restarting after crashes"
+                raise EnginePoolError(message)
+            raise
+        finally:
+            self._scheduler.discard(waiter)
+
+    def _release(self, engine: AsyncStockfishEngine) -> None:
+        """Hand an engine to the next waiter, or return it to the idle set."""
+        # Engines from a stopped pool are not handed out again
+        if engine not in self._engines:
+            return
+        if not engine.is_alive():
+            self._replace(engine)
+            return
+        waiter = self._scheduler.pop()
+        if waiter is not None:
+            waiter.set_result(engine)
+            return
+        self._idle.append(engine)
+
+    def _replace(self, dead: AsyncStockfishEngine) -> None:
+        """Swap a dead engine for a warm spare and start a new engine in the background."""
+        detected_at = time.monotonic()
+        self._crashes += 1
+        self._engines.remove(dead)
+        dead.stop()
+        if self._spares:
+            spare = self._spares.popleft()
+            self._engines.append(spare)
+            self._record_recovery(detected_at)
+            logger.warning("Engine process died; replaced it with a warm spare")
+            self._spawn(None)
+            self._release(spare)
+        else:
+            logger.warning("Engine process died; starting a replacement")
+            self._spawn(detected_at)
+
+    def _spawn(self, detected_at: Optional[float]) -> None:
+        """Start an engine in the background to refill the pool or its spares.
+
+        Args:
+            detected_at: When the crash it replaces was detected, None when
+                the pool is already whole and the engine becomes a spare
+        """
+        task = asyncio.ensure_future(self._start_replacement(detected_at))
+        self._spawning.add(task)
+        task.add_done_callback(self._spawning.discard)
+
+    async def _start_replacement(self, detected_at: Optional[float]) -> None:
+        """Start one engine and add it to the pool or its spares.
+
+        Failed starts are retried until one succeeds or the pool closes,
+        with exponential backoff capped at MAX_RESTART_BACKOFF seconds.
+        """
+        attempt = 0
+        while True:
+            engine = self._engine_factory(threads=self.threads, hash_mb=self.hash_mb)
+            try:
+                await engine.start()
+                break
+            except asyncio.CancelledError:
+                # The pool is closing
+                engine.stop()
+                raise
+            except Exception as e:
+                self._spawn_failures += 1
+                attempt += 1
+                logger.error("Failed to start replacement engine (attempt %d): %s", attempt, e)
+                await asyncio.sleep(min(0.5 * 2 ** (attempt - 1), MAX_RESTART_BACKOFF))
+
+        if len(self._engines) < self.size:
+            self._engines.append(engine)
+            if detected_at is not None:
+                self._record_recovery(detected_at)
+            self._release(engine)
+        elif len(self._spares) < self.spares:
+            self._spares.append(engine)
+        else:
+            await engine.close()
+
+    def _record_recovery(self, detected_at: float) -> None:
+        """Record how long the pool was short of an engine after a crash."""
+        recovery_time = time.monotonic() - detected_at
+        self._restarts += 1
+        self._recovery_time_last = recovery_time
+        self._recovery_time_max = max(self._recovery_time_max, recovery_time)
+        logger.info("Engine recovered in %.3fms", recovery_time * 1000)
+
+    async def get_best_move(
+        self,
+        fen: str,
+        move_history: List[str] | None = None,
+        limits: SearchLimits | None = None,
+        priority: Priority = Priority.LIVE,
+        client: Hashable = None,
+    ) -> str:
+        """Get the best move from an idle engine.
+
+        Args:
+            fen: Board position in FEN format
+            move_history: Moves played from the FEN position in UCI format
+            limits: Search limits, defaults to the server-side defaults from settings
+            priority: Priority class of the request if it has to wait for an engine
+            client: Identifies the requesting client, see acquire()
+
+        Returns:
+            The best move in UCI format
+        """
+        async with self.acquire(priority=priority, client=client) as engine:
+            return await engine.get_best_move(fen, move_history, limits)
+
+    async def search(
+        self,
+        fen: str,
+        move_history: List[str] | None = None,
+        limits: SearchLimits | None = None,
+        on_info: InfoCallback | None = None,
+        deadline: float | None = None,
+        multipv: int = 1,
+        priority: Priority = Priority.LIVE,
+        client: Hashable = None,
+    ) -> SearchResult:
+        """Search a position on an idle engine.
+
+        Args:
+            fen: Board position in FEN format
+            move_history: Moves played from the FEN position in UCI format
+            limits: Search limits, defaults to the server-side defaults from settings
+            on_info: Coroutine function awaited with the progress of each scored info line
+            deadline: time.monotonic() value at which the search is stopped,
+                including the time spent waiting for an engine
+            multipv: Number of principal variations to search
+            priority: Priority class of the request if it has to wait for an engine
+            client: Identifies the requesting client, see acquire()
+
+        Returns:
+            The best move with its score, depth and principal variation
+
+        Raises:
+            StockfishError: If the search fails; a search whose engine died
+                is retried once on its replacement
+        """
+        async with self.acquire(priority=priority, client=client) as engine:
+            try:
+                return await engine.search(
+                    fen, move_history, limits, on_info=on_info, deadline=deadline, multipv=multipv
+                )
+            except StockfishError:
+                if engine.is_alive():
+                    raise
+                logger.warning("Engine died during a search; retrying on a replacement")
+        # The dead engine was replaced when it was returned to the pool
+        async with self.acquire(priority=priority, client=client) as engine:
+            return await engine.search(fen, move_history, limits, on_info=on_info, deadline=deadline, multipv=multipv)
+
+    async def search_many(
+        self,
+        positions: Sequence[Tuple[str, List[str] | None]],
+        limits: SearchLimits | None = None,
+        search: Optional[Callable[[str, List[str] | None, SearchLimits | None], Awaitable[Any]]] = None,
+        priority: Priority = Priority.BATCH,
+        client: Hashable = None,
+    ) -> AsyncIterator[Tuple[int, Any]]:
+        """Search many positions across the pool's engines, yielding results as they complete.
+
+        At most one search per engine is in flight, so a large batch never
+        waits on the acquire timeout and leaves no engine idle while work remains.
+
+        Args:
+            positions: (FEN, move history) pairs to search
+            limits: Search limits shared by every position
+            search: Coroutine function used per position, defaults to self.search
+                at `priority` for `client`
+            priority: Priority class of the default search
+            client: Identifies the requesting client of the default search
+
+        Yields:
+            (index, result) tuples in completion order, where result is the
+            search result or the exception raised for that position
+        """
+        if search is None:
+
+            async def search(fen: str, move_history: List[str] | None, limits: SearchLimits | None) -> SearchResult:
+                return await self.search(fen, move_history, limits, priority=priority, client=client)
+
+        slots = asyncio.Semaphore(max(self.size, 1))
+
+        async def run(index: int, fen: str, move_history: List[str] | None) -> Tuple[int, Any]:
+            async with slots:
+                try:
+                    return index, await search(fen, move_history, limits)
+                except Exception as e:
+                    return index, e
+
+        tasks = [asyncio.ensure_future(run(index, fen, history)) for index, (fen, history) in enumerate(positions)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    @property
+    def restarting(self) -> int:
+        """Return the number of crashed engines whose replacements have not started yet."""
+        return self.size - len(self._engines) if self._started else 0
+
+    @property
+    def idle_count(self) -> int:
+        """Return the number of engines currently available."""
+        return len(self._idle)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return pool size, utilization and wait time statistics."""
+        acquisitions = self._acquisitions
+        return {
+            "size": len(self._engines),
+            "idle": self.idle_count,
+            "busy": len(self._engines) - self.idle_count,
+            "waiting": len(self._scheduler),
+            "acquisitions": acquisitions,
+            "wait_time_total_ms": round(self._wait_time_total * 1000, 3),
+            "wait_time_avg_ms": round(self._wait_time_total * 1000 / acquisitions, 3) if acquisitions else 0.0,
+            "wait_time_max_ms": round(self._wait_time_max * 1000, 3),
+            "spares": len(self._spares),
+            "restarting": self.restarting,
+            "crashes": self._crashes,
+            "restarts": self._restarts,
+            "spawn_failures": self._spawn_failures,
+            "recovery_time_last_ms": round(self._recovery_time_last * 1000, 3),
+            "recovery_time_max_ms": round(self._recovery_time_max * 1000, 3),
+            "queue": self._scheduler.stats(),
+        }
+
+    def heartbeat_age(self) -> Optional[float]:
+        """Return the longest time in seconds a checked-out engine has gone without output, None if none is out.
+
+        Output written before the engine was checked out does not count, so
+        an engine that sat idle is not mistaken for a hung one. Only process
+        state and timestamps are read, never the engines' pipes.
+        """
+        now = time.monotonic()
+        ages = [
+            now - max(checked_out_at, engine.last_heartbeat or checked_out_at)
+            for engine, checked_out_at in self._checked_out.items()
+        ]
+        return max(ages, default=None)
+
+    def is_initialized(self) -> bool:
+        """Check that the pool is started and all engine processes are running.
+
+        Only process liveness is checked, so this never interferes with a
+        search in progress.
+        """
+        if not self._engines:
+            return False
+        return all(engine.is_alive() for engine in self._engines)
+
+    async def close(self) -> None:
+        """Quit all engine processes in the pool gracefully."""
+        self._started = False
+        for task in self._spawning:
+            task.cancel()
+        engines, self._engines = self._engines + list(self._spares), []
+        self._idle = deque()
+        self._spares = deque()
+        self._checked_out = {}
+        results = await asyncio.gather(*(engine.close() for engine in engines), return_exceptions=True)
+        for result in results:
+            if isinstance(result, BaseException):
+                logger.error("Error closing pooled engine: %s", result)
+        if engines:
+            logger.info("Engine pool closed (%d engines)", len(engines))
+
+    def stop(self) -> None:
+        """Stop all engine processes in the pool immediately."""
+        self._started = False
+        for task in self._spawning:
+            try:
+                task.cancel()
+            except RuntimeError:
+                # The event loop is already closed
+                pass
+        engines, self._engines = self._engines + list(self._spares), []
+        self._idle = deque()
+        self._spares = deque()
+        self._checked_out = {}
+        for engine in engines:
+            try:
+                engine.stop()
+            except Exception as e:
+                logger.error("Error stopping pooled engine: %s", e)
+        if engines:
+            logger.info("Engine pool stopped (%d engines)", len(engines))
@@ -5,11 +5,14 @@ import os
 import platform
 import select
 import subprocess
+import threading
 import time
 from pathlib import Path
-from typing import List
+from typing import Callable, List, Optional
 
 from chesspal_mcp_engine.config import settings
+from chesspal_mcp_engine.metrics import metrics
+from chesspal_mcp_engine.models import SearchLimits
 
 # Add import for EngineRegistry
 from chesspal_mcp_engine.shutdown import EngineRegistry
@@ -120,16 +123,28 @@ class StockfishError(Exception):
 class StockfishEngine:
     """A class to manage interactions with the Stockfish chess engine."""
 
-    def __init__(self):
-        """Initialize the Stockfish engine."""
-        self.process = None
+    def __init__(self, threads: int | None = None, hash_mb: int | None = None):
+        """Initialize the Stockfish engine.
+
+        Args:
+            threads: UCI Threads option, defaults to CHESSPAL_ENGINE_THREADS
+            hash_mb: UCI Hash option in MB, defaults to CHESSPAL_ENGINE_HASH_MB
+        """
+        self.process: Optional[subprocess.Popen] = None
+        self.threads = threads if threads is not None else settings.CHESSPAL_ENGINE_THREADS
+        self.hash_mb = hash_mb if hash_mb is not None else settings.CHESSPAL_ENGINE_HASH_MB
+        # Held for each command and the response it is waiting for, so exchanges
+        # from different threads never interleave on the pipe
+        self._lock = threading.Lock()
+        # time.monotonic() of the last line read from the engine
+        self.last_heartbeat: Optional[float] = None
         self._initialize_engine()
         # Register with engine registry
         EngineRegistry.register(self)
 
     def _send_command(self, command: str) -> None:
         """Send a command to the Stockfish engine."""
-        if not self.process or self.process.poll() is not None:
+        if not self.process or self.process.poll() is not None or self.process.stdin is None:
             raise StockfishError("Engine process is not running")
 
         try:
@@ -139,20 +154,26 @@ class StockfishEngine:
         except BrokenPipeError as e:
             raise StockfishError(f"Failed to send command: {e}")
 
-    def _read_response(self, until: str | None = None, timeout: float = 2.0) -> List[str]:
+    def _read_response(
+        self, until: str | None = None, timeout: float = 2.0, retain: Optional[Callable[[str], bool]] = None
+    ) -> List[str]:
         """Read response from the Stockfish engine.
 
         Args:
             until: String to look for in response
             timeout: Maximum time to wait for response
+            retain: Called with each line before the `until` line; only lines
+                it returns True for are kept. Defaults to keeping every line.
 
         Returns:
             List of response lines from the engine
         """
-        if not self.process or self.process.poll() is not None:
+        if not self.process or self.process.poll() is not None or self.process.stdout is None:
             raise StockfishError("Engine process is not running")
+        stdout = self.process.stdout
 
         responses: List[str] = []
+        received = 0
         start_time = time.time()
 
         try:
@@ -160,18 +181,22 @@ class StockfishEngine:
                 if time.time() - start_time > timeout:
                     # If we're looking for a specific response and
                     # haven't found it, return what we have so far
-                    if until and responses:
+                    if until and received:
                         return responses
                     raise StockfishError("Timeout waiting for response " f"(waited {timeout}s)")
 
-                if select.select([self.process.stdout], [], [], 0.1)[0]:
-                    line = self.process.stdout.readline()
+                if select.select([stdout], [], [], 0.1)[0]:
+                    line = stdout.readline()
                     line = line.decode().strip()
+                    self.last_heartbeat = time.monotonic()
                     if line:
                         logger.debug(f"Received: {line}")
-                        responses.append(line)
+                        received += 1
                         if until and line.startswith(until):
+                            responses.append(line)
                             break
+                        if retain is None or retain(line):
+                            responses.append(line)
                 elif self.process.poll() is not None:
                     raise StockfishError("Engine process terminated unexpectedly")
 
@@ -204,8 +229,11 @@ class StockfishEngine:
 
             # Set options
             logger.info("Setting engine options...")
-            self._send_command("setoption name Hash value 128")
-            self._send_command("setoption name Threads value 4")
+            self._send_command(f"setoption name Hash value {self.hash_mb}")
+            self._send_command(f"setoption name Threads value {self.threads}")
+            if settings.CHESSPAL_SYZYGY_PATH:
+                self._send_command(f"setoption name SyzygyPath value {settings.CHESSPAL_SYZYGY_PATH}")
+                self._send_command(f"setoption name SyzygyProbeLimit value {settings.CHESSPAL_SYZYGY_MAX_PIECES}")
 
             # Verify engine is ready
             self._send_command("isready")
@@ -219,41 +247,54 @@ class StockfishEngine:
             self.stop()
             raise StockfishError(f"Failed to initialize engine: {e}")
 
-    def get_best_move(self, fen: str, move_history: List[str] | None = None) -> str:
-        """Get the best move for a given position."""
+    def get_best_move(self, fen: str, move_history: List[str] | None = None, limits: SearchLimits | None = None) -> str:
+        """Get the best move for a given position.
+
+        Args:
+            fen: Board position in FEN format
+            move_history: Moves played from the FEN position in UCI format
+            limits: Search limits, defaults to the server-side defaults from settings
+        """
         if not self.process or self.process.poll() is not None:
             raise StockfishError("Engine not initialized or not running")
 
-        try:
-            logger.info(f"Getting best move for position: {fen}")
-            if move_history:
-                logger.debug(f"Move history: {move_history}")
-
-            # Set position
-            position_cmd = f"position fen {fen}"
-            if move_history:
-                position_cmd += f" moves {' '.join(move_history)}"
-            self._send_command(position_cmd)
-
-            # Get best move
-            logger.debug("Calculating best move...")
-            self._send_command("go movetime 3000")
-            logger.debug("Waiting for bestmove response with 30s timeout...")
-            responses = self._read_response(until="bestmove", timeout=30.0)
-            logger.debug(f"Received {len(responses)} response lines from engine")
-
-            # Parse response
-            for response in responses:
-                if response.startswith("bestmove"):
-                    best_move = response.split()[1]
-                    logger.info(f"Best move found: {best_move}")
-                    return best_move
-
-            logger.error(f"No 'bestmove' line found in engine responses: {responses}")
-            raise StockfishError("No best move found in engine response")
+        # Everything from the position command to the bestmove line is one exchange
+        with self._lock:
+            try:
+                limits = limits or SearchLimits.resolve()
+                logger.info(f"Getting best move for position: {fen}")
+                if move_history:
+                    logger.debug(f"Move history: {move_history}")
+
+                # Set position
+                position_cmd = f"position fen {fen}"
+                if move_history:
+                    position_cmd += f" moves {' '.join(move_history)}"
+                self._send_command(position_cmd)
+
+                # Get best move
+                logger.debug("Calculating best move...")
+                self._send_command(limits.to_go_command())
+                started = time.monotonic()
+                timeout = limits.response_timeout()
+                logger.debug(f"Waiting for bestmove response with {timeout}s timeout...")
+                # Only the bestmove line is used, so info output is not buffered
+                responses = self._read_response(until="bestmove", timeout=timeout, retain=lambda line: False)
+                logger.debug(f"Received {len(responses)} response lines from engine")
+
+                # Parse response
+                for response in responses:
+                    if response.startswith("bestmove"):
+                        best_move = response.split()[1]
+                        metrics.record_search(time.monotonic() - started)
+                        logger.info(f"Best move found: {best_move}")
+                        return best_move
+
+                logger.error(f"No 'bestmove' line found in engine responses: {responses}")
+                raise StockfishError("No best move found in engine response")
 
-        except Exception as e:
-            raise StockfishError(f"Error getting best move: {e}")
+            except Exception as e:
+                raise StockfishError(f"Error getting best move: {e}")
 
     def stop(self) -> None:
         """Stop the Stockfish engine."""
@@ -278,6 +319,11 @@ class StockfishEngine:
     def is_initialized(self) -> bool:
         """Check if the engine is initialized and ready.
 
+        isready is only sent while no other thread holds the engine. During a
+        search only the process state is checked rather than blocking until
+        the search ends; the search's own output is the heartbeat (see
+        heartbeat_age()).
+
         Returns:
             bool: True if the engine is initialized and ready, False otherwise.
         """
@@ -288,6 +334,9 @@ class StockfishEngine:
         if self.process.poll() is not None:
             return False
 
+        if not self._lock.acquire(blocking=False):
+            # A search holds the engine
+            return True
         try:
             # Send a simple command to check if engine is responsive
             self._send_command("isready")
@@ -295,3 +344,11 @@ class StockfishEngine:
             return any(r.startswith("readyok") for r in responses)
         except Exception:
             return False
+        finally:
+            self._lock.release()
+
+    def heartbeat_age(self) -> Optional[float]:
+        """Return the seconds since the engine last wrote output, or None if it never did."""
+        if self.last_heartbeat is None:
+            return None
+        return time.monotonic() - self.last_heartbeat
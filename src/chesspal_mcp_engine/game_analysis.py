@@ -0,0 +1,105 @@
+"""Ply-by-ply analysis of a whole game."""
+
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import chess
+
+from chesspal_mcp_engine.models import SearchLimits, SearchResult
+
+# Centipawn value standing in for a forced mate when computing losses
+MATE_SCORE_CP = 10000
+
+# Search coroutine taking the start FEN, the moves played so far and the limits
+Search = Callable[[str, Optional[List[str]], SearchLimits], Awaitable[SearchResult]]
+
+
+def score_to_cp(result: SearchResult) -> int:
+    """Return the score from the side to move's point of view in centipawns, mapping mates to +-MATE_SCORE_CP."""
+    if result.mate is not None:
+        if result.mate > 0:
+            return MATE_SCORE_CP - result.mate
+        return -MATE_SCORE_CP - result.mate
+    return result.score_cp or 0
+
+
+def _terminal_result(board: chess.Board) -> Optional[SearchResult]:
+    """Return the result for a finished game without searching, or None if the game goes on."""
+    if board.is_checkmate():
+        return SearchResult(best_move="(none)", mate=0)
+    if board.is_game_over(claim_draw=False):
+        return SearchResult(best_move="(none)", score_cp=0)
+    return None
+
+
+def ply_report(
+    ply: int, board: chess.Board, move: chess.Move, before: SearchResult, after: SearchResult
+) -> Dict[str, Any]:
+    """Describe one played move.
+
+    Args:
+        ply: 1-based ply number
+        board: Position before the move
+        move: Move played
+        before: Search result for the position before the move
+        after: Search result for the position after the move
+
+    Returns:
+        The move, the engine's preferred move and score before it, and the
+        centipawn loss of the played move from the mover's point of view
+    """
+    best_cp = score_to_cp(before)
+    played_cp = -score_to_cp(after)
+    cp_loss = 0 if move.uci() == before.best_move else max(best_cp - played_cp, 0)
+    return {
+        "ply": ply,
+        "move_uci": move.uci(),
+        "move_san": board.san(move),
+        "best_move_uci": before.best_move,
+        "score_cp": before.score_cp,
+        "mate": before.mate,
+        "depth": before.depth,
+        "cp_loss": cp_loss,
+    }
+
+
+async def analyze_moves(
+    search: Search,
+    board: chess.Board,
+    moves: List[chess.Move],
+    limits: SearchLimits,
+    on_ply: Optional[Callable[[Dict[str, Any]], Awaitable[None]]] = None,
+) -> List[Dict[str, Any]]:
+    """Analyze every ply of a game.
+
+    Positions are sent as the game's start position plus the moves played so
+    far, so an engine that searches consecutive plies keeps its hash table
+    warm from one ply to the next.
+
+    Args:
+        search: Search coroutine called once per position, e.g. AsyncStockfishEngine.search
+        board: Start position of the game; it is not modified
+        moves: Legal moves played from the start position
+        limits: Search limits for every position
+        on_ply: Coroutine function called with each ply report as soon as it is ready
+
+    Returns:
+        One ply report per move, in game order
+    """
+    board = board.copy(stack=False)
+    start_fen = board.fen()
+    played: List[str] = []
+
+    before = _terminal_result(board) or await search(start_fen, None, limits)
+    reports: List[Dict[str, Any]] = []
+    for ply, move in enumerate(moves, start=1):
+        position = board.copy(stack=False)
+        board.push(move)
+        played.append(move.uci())
+        after = _terminal_result(board) or await search(start_fen, played, limits)
+
+        report = ply_report(ply, position, move, before, after)
+        reports.append(report)
+        if on_ply is not None:
+            await on_ply(report)
+        before = after
+    return reports
@@ -1,17 +1,39 @@
 """Health server for the ChessPal Engine."""
 
+import time
+from pathlib import Path
 from typing import Any, Dict, Optional
 
 import uvicorn
 from fastapi import FastAPI
-from starlette.responses import JSONResponse
+from starlette.responses import JSONResponse, PlainTextResponse
 
+from .config import settings
 from .logging_config import get_logger, setup_logging
+from .metrics import metrics
+from .shared_state import SharedState
 
 logger = get_logger(__name__)
 
 # Global reference to engine for health checks
 _engine: Optional[Any] = None
+# Engine state published by the MCP process when the health server runs in its own process
+_shared_state: Optional[SharedState] = None
+# Snapshots older than this many publishing intervals mean the MCP process stopped publishing
+_STALE_INTERVALS = 3
+
+
+def _published_state(state: SharedState) -> Optional[Dict[str, Any]]:
+    """Return the latest engine state published to `state`, or None if there is none or it is stale."""
+    snapshot = state.read()
+    if snapshot is None:
+        logger.warning("No engine state published yet")
+        return None
+    age = time.time() - snapshot["published_at"]
+    if age > _STALE_INTERVALS * snapshot["interval_s"]:
+        logger.warning(f"Published engine state is stale ({age:.1f}s old)")
+        return None
+    return snapshot
 
 
 def create_health_api(title: str = "ChessPal MCP Engine Health API") -> FastAPI:
@@ -36,7 +58,20 @@ def create_health_api(title: str = "ChessPal MCP Engine Health API") -> FastAPI:
 
         # Check if engine is ready if available
         engine_ready = False
-        if _engine is not None:
+        if _shared_state is not None:
+            snapshot = _published_state(_shared_state)
+            if snapshot is not None:
+                engine_ready = snapshot["engine_alive"]
+                heartbeat_age = snapshot.get("heartbeat_age_s")
+                if heartbeat_age is not None and heartbeat_age > settings.HEALTH_HEARTBEAT_TIMEOUT_S:
+                    logger.warning(f"A busy engine has written no output for {heartbeat_age:.1f}s")
+                    engine_ready = False
+                status_data["heartbeat_age_s"] = heartbeat_age
+                status_data["last_search_at"] = snapshot["last_search_at"]
+                status_data["queue_depth"] = snapshot["queue_depth"]
+                if snapshot["pool"] is not None:
+                    status_data["engine_pool"] = snapshot["pool"]
+        elif _engine is not None:
             try:
                 engine_ready = _engine.is_initialized()
             except Exception as e:
@@ -45,6 +80,13 @@ def create_health_api(title: str = "ChessPal MCP Engine Health API") -> FastAPI:
         else:
             logger.warning("Engine not available for health check")
 
+        # Report pool utilization when the engine is an EnginePool
+        if _shared_state is None and _engine is not None and hasattr(_engine, "stats"):
+            try:
+                status_data["engine_pool"] = _engine.stats()
+            except Exception as e:
+                logger.error(f"Failed to read engine pool stats: {e}")
+
         # Add dependency statuses
         status_data["dependencies"] = {
             "engine": "ok" if engine_ready else "error",
@@ -56,6 +98,10 @@ def create_health_api(title: str = "ChessPal MCP Engine Health API") -> FastAPI:
             status_data["status"] = "degraded"
             return JSONResponse(status_data, status_code=503)
 
+        # Still serving, but short of engines until crashed ones are replaced
+        if (status_data.get("engine_pool") or {}).get("restarting"):
+            status_data["status"] = "degraded"
+
         return JSONResponse(status_data, status_code=200)
 
     @health_api.get("/ping")
@@ -63,6 +109,16 @@ def create_health_api(title: str = "ChessPal MCP Engine Health API") -> FastAPI:
         """Simple liveness check endpoint."""
         return JSONResponse({"ping": "pong"}, status_code=200)
 
+    @health_api.get("/metrics")
+    async def prometheus_metrics() -> PlainTextResponse:
+        """Tool, engine, cache and queue metrics in the Prometheus text format."""
+        if _shared_state is not None:
+            snapshot = _shared_state.read()
+            text = snapshot["metrics"] if snapshot is not None else ""
+        else:
+            text = metrics.render()
+        return PlainTextResponse(text, media_type="text/plain; version=0.0.4")
+
     return health_api
 
 
@@ -70,22 +126,35 @@ def set_engine(engine: Any) -> None:
     """Set the engine instance for health checks.
 
     Args:
-        engine: Engine instance
+        engine: Engine or engine pool instance
     """
     global _engine
     _engine = engine
 
 
-def run_health_server(host: str, port: int, log_level: str = "info") -> None:
+def set_shared_state(state: Optional[SharedState]) -> None:
+    """Read engine state from a snapshot published by another process instead of an engine instance.
+
+    Args:
+        state: Shared state attached read-only, or None to check the engine set with set_engine
+    """
+    global _shared_state
+    _shared_state = state
+
+
+def run_health_server(host: str, port: int, log_level: str = "info", state_path: Optional[str | Path] = None) -> None:
     """Run the health server.
 
     Args:
         host: Host to bind to
         port: Port to bind to
         log_level: Logging level
+        state_path: Memory-mapped file the MCP process publishes its engine state to
     """
     # Configure logging
     setup_logging(log_level.upper())
+    if state_path is not None:
+        set_shared_state(SharedState.attach(state_path))
 
     # Create and run the health API
     health_api = create_health_api()
@@ -94,12 +163,13 @@ def run_health_server(host: str, port: int, log_level: str = "info") -> None:
 
 
 # This function needs to be at module level for multiprocessing
-def start_health_server(host: str, port: int, log_level: str) -> None:
+def start_health_server(host: str, port: int, log_level: str, state_path: Optional[str] = None) -> None:
     """Start the health server in a separate process.
 
     Args:
         host: Host to bind to
         port: Port to bind to
         log_level: Logging level
+        state_path: Memory-mapped file the MCP process publishes its engine state to
     """
-    run_health_server(host, port, log_level)
+    run_health_server(host, port, log_level, state_path)
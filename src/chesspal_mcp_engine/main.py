@@ -1,49 +1,267 @@
 """Main module for the MCP chess engine service."""
 
 import argparse
+import asyncio
+import functools
+import io
+import json
 import multiprocessing
 import os
+import sqlite3
+import time
 from contextlib import asynccontextmanager
-from typing import AsyncIterator, List, Optional
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
 
 import chess
-from mcp.server.fastmcp import FastMCP
+import chess.pgn
+from mcp.server.fastmcp import Context, FastMCP
 from pydantic import BaseModel, Field
 
+from chesspal_mcp_engine.analysis_cache import AnalysisCache
+from chesspal_mcp_engine.async_engine import AsyncStockfishEngine, InfoCallback
+from chesspal_mcp_engine.cache import BestMoveCache, CacheKey, SingleFlight, cache_key
 from chesspal_mcp_engine.config import settings
-from chesspal_mcp_engine.engine_wrapper import StockfishEngine, StockfishError, _get_engine_path
+from chesspal_mcp_engine.engine_pool import EnginePool
+from chesspal_mcp_engine.engine_wrapper import StockfishError, _get_engine_path
+from chesspal_mcp_engine.game_analysis import analyze_moves
 from chesspal_mcp_engine.health_server import set_engine, start_health_server
 from chesspal_mcp_engine.logging_config import get_logger, setup_logging
+from chesspal_mcp_engine.metrics import metrics
+from chesspal_mcp_engine.models import PositionAnalysis, SearchLimits, SearchResult
+from chesspal_mcp_engine.opening_book import OpeningBook
+from chesspal_mcp_engine.scheduler import Priority
+from chesspal_mcp_engine.sessions import SessionError, SessionManager
+from chesspal_mcp_engine.shared_state import SharedState
 from chesspal_mcp_engine.shutdown import setup_signal_handlers
-
-# Global engine instance - Initialize as None
-_engine: Optional[StockfishEngine] = None
+from chesspal_mcp_engine.tablebase import SyzygyTablebase
+
+# Global engine pool - Initialize as None
+_engine_pool: Optional[EnginePool] = None
+# Global best-move cache - created with the engine pool, None when disabled
+_best_move_cache: Optional[BestMoveCache] = None
+# Global persistent analysis cache - None unless CHESSPAL_ANALYSIS_CACHE_PATH is set
+_analysis_cache: Optional[AnalysisCache] = None
+# Global opening book - None unless CHESSPAL_BOOK_PATH is set
+_opening_book: Optional[OpeningBook] = None
+# Global Syzygy tablebase - None unless CHESSPAL_SYZYGY_PATH is set
+_tablebase: Optional[SyzygyTablebase] = None
+# Global game sessions - created when the services start
+_sessions: Optional[SessionManager] = None
+# Searches in flight, shared by concurrent requests for the same position and limits
+_in_flight_searches = SingleFlight()
 logger = get_logger(__name__)  # Get logger instance
 _health_process = None  # Process for health server
+# Engine state published to the health server process - None when it is disabled
+_health_state: Optional[SharedState] = None
+# Task publishing _health_state while the services run
+_health_publisher: Optional[asyncio.Task] = None
+# Number of holders of the services started by _services(), and the lock guarding it
+_service_holders = 0
+_service_lock: Optional[asyncio.Lock] = None
+
+
+def _lookup_stats() -> Dict[str, Dict[str, Any]]:
+    """Return the hit/miss counters of every enabled cache, book and tablebase."""
+    sources = {
+        "best_move": _best_move_cache,
+        "analysis": _analysis_cache,
+        "opening_book": _opening_book,
+        "tablebase": _tablebase,
+    }
+    return {name: source.stats() for name, source in sources.items() if source is not None}
+
+
+def _pool_value(key: str) -> Dict[str, float]:
+    """Return one engine pool statistic as metric values, empty without a pool."""
+    return {"": _engine_pool.stats()[key]} if _engine_pool is not None else {}
+
+
+metrics.register(
+    "chesspal_cache_hits_total",
+    "Lookups answered by a cache, the opening book or the tablebase",
+    "counter",
+    lambda: {name: stats["hits"] for name, stats in _lookup_stats().items()},
+    label="cache",
+)
+metrics.register(
+    "chesspal_cache_misses_total",
+    "Lookups not answered by a cache, the opening book or the tablebase",
+    "counter",
+    lambda: {name: stats["misses"] for name, stats in _lookup_stats().items()},
+    label="cache",
+)
+metrics.register(
+    "chesspal_cache_hit_ratio",
+    "Share of lookups answered by a cache, the opening book or the tablebase",
+    "gauge",
+    lambda: {name: stats["hit_rate"] for name, stats in _lookup_stats().items()},
+    label="cache",
+)
+metrics.register(
+    "chesspal_search_coalesced_total",
+    "Searches answered by an identical search already in flight",
+    "counter",
+    lambda: {"": _in_flight_searches.coalesced},
+)
+metrics.register(
+    "chesspal_engine_queue_depth", "Requests waiting for an idle engine", "gauge", lambda: _pool_value("waiting")
+)
+metrics.register(
+    "chesspal_engine_queue_rejections_total",
+    "Requests rejected because the engine queue was full",
+    "counter",
+    lambda: (
+        {priority: queue["rejected"] for priority, queue in _engine_pool.stats()["queue"].items()}
+        if _engine_pool is not None
+        else {}
+    ),
+    label="priority",
+)
+metrics.register("chesspal_engine_busy", "Engines running a search", "gauge", lambda: _pool_value("busy"))
+metrics.register("chesspal_engine_idle", "Engines waiting for a search", "gauge", lambda: _pool_value("idle"))
+
+
+def _health_snapshot() -> Dict[str, Any]:
+    """Return the engine state published to the health server.
+
+    Liveness is read from the process state and the engines' output
+    heartbeats only, so publishing never touches an engine that is searching.
+    """
+    stats = _engine_pool.stats() if _engine_pool is not None else None
+    return {
+        "published_at": time.time(),
+        "interval_s": settings.HEALTH_STATE_INTERVAL_MS / 1000,
+        "engine_alive": _engine_pool is not None and _engine_pool.is_initialized(),
+        "heartbeat_age_s": _engine_pool.heartbeat_age() if _engine_pool is not None else None,
+        "last_search_at": metrics.last_search_at,
+        "queue_depth": stats["waiting"] if stats is not None else 0,
+        "pool": stats,
+        "metrics": metrics.render(),
+    }
+
+
+async def _publish_health_state(state: SharedState) -> None:
+    """Publish the engine state to the health server until cancelled."""
+    while True:
+        try:
+            state.publish(_health_snapshot())
+        except Exception as e:
+            logger.error("Failed to publish health state: %s", e)
+        await asyncio.sleep(settings.HEALTH_STATE_INTERVAL_MS / 1000)
+
+
+def _client_key(ctx: Optional[Context]) -> Optional[str]:
+    """Return the key identifying a request's client for fair engine scheduling, None if unknown."""
+    if ctx is None:
+        return None
+    try:
+        return ctx.client_id or "session-%x" % id(ctx.session)
+    except ValueError:
+        # Called outside of an MCP request
+        return None
+
+
+def _instrumented(tool: Callable[..., Awaitable[dict]]) -> Callable[..., Awaitable[dict]]:
+    """Record the calls, errors and latency of an MCP tool in the metrics."""
+
+    @functools.wraps(tool)
+    async def wrapper(*args, **kwargs) -> dict:
+        started = time.perf_counter()
+        response = None
+        try:
+            response = await tool(*args, **kwargs)
+            return response
+        finally:
+            error = not isinstance(response, dict) or "error" in response
+            metrics.record_tool(tool.__name__, time.perf_counter() - started, error)
+
+    return wrapper
+
+
+def _create_engine_pool() -> EnginePool:
+    """Create the engine pool from settings; engines start with the services in the server loop."""
+    return EnginePool(
+        size=settings.CHESSPAL_ENGINE_POOL_SIZE,
+        threads=settings.CHESSPAL_ENGINE_THREADS,
+        hash_mb=settings.CHESSPAL_ENGINE_HASH_MB,
+        acquire_timeout=settings.CHESSPAL_ENGINE_POOL_TIMEOUT_MS / 1000,
+        engine_factory=AsyncStockfishEngine,
+        spares=settings.CHESSPAL_ENGINE_SPARES,
+        max_queue=settings.CHESSPAL_ENGINE_MAX_QUEUE or None,
+    )
+
+
+def _create_best_move_cache() -> Optional[BestMoveCache]:
+    """Create the best-move cache from settings, or None if it is disabled."""
+    if settings.CHESSPAL_CACHE_SIZE <= 0:
+        return None
+    ttl = settings.CHESSPAL_CACHE_TTL_S if settings.CHESSPAL_CACHE_TTL_S > 0 else None
+    return BestMoveCache(max_size=settings.CHESSPAL_CACHE_SIZE, ttl=ttl)
+
+
+def _create_analysis_cache() -> Optional[AnalysisCache]:
+    """Open the persistent analysis cache if configured, or return None."""
+    if not settings.CHESSPAL_ANALYSIS_CACHE_PATH:
+        return None
+    try:
+        return AnalysisCache(
+            settings.CHESSPAL_ANALYSIS_CACHE_PATH, max_entries=settings.CHESSPAL_ANALYSIS_CACHE_MAX_ENTRIES
+        )
+    except (OSError, sqlite3.Error) as e:
+        logger.error("Failed to open analysis cache at %s: %s", settings.CHESSPAL_ANALYSIS_CACHE_PATH, e)
+        return None
+
+
+def _create_opening_book() -> Optional[OpeningBook]:
+    """Open the Polyglot opening book if configured, or return None."""
+    if not settings.CHESSPAL_BOOK_PATH:
+        return None
+    try:
+        return OpeningBook(settings.CHESSPAL_BOOK_PATH, selection=settings.CHESSPAL_BOOK_SELECTION)
+    except (OSError, ValueError) as e:
+        logger.error("Failed to open opening book at %s: %s", settings.CHESSPAL_BOOK_PATH, e)
+        return None
+
+
+def _create_tablebase() -> Optional[SyzygyTablebase]:
+    """Open the Syzygy tablebase if configured, or return None."""
+    if not settings.CHESSPAL_SYZYGY_PATH:
+        return None
+    try:
+        return SyzygyTablebase(
+            settings.CHESSPAL_SYZYGY_PATH,
+            max_pieces=settings.CHESSPAL_SYZYGY_MAX_PIECES,
+            max_open_tables=settings.CHESSPAL_SYZYGY_MAX_OPEN_TABLES,
+        )
+    except OSError as e:
+        logger.error("Failed to open Syzygy tablebase at %s: %s", settings.CHESSPAL_SYZYGY_PATH, e)
+        return None
+
+
+def _create_session_manager() -> SessionManager:
+    """Create the game session manager from settings."""
+    return SessionManager(
+        max_sessions=settings.CHESSPAL_MAX_SESSIONS, idle_timeout=settings.CHESSPAL_SESSION_IDLE_TIMEOUT_S
+    )
 
 
 def setup_environment():
     """Set up and validate the environment. Moved inside main_cli."""
-    global _engine
+    global _engine_pool
 
     # Set up signal handlers for graceful shutdown
     setup_signal_handlers()
     logger.info("Signal handlers for graceful shutdown are set up")
 
-    # Initialize engine
+    # Create the engine pool. Engine processes are bound to the server's event
+    # loop, so they are started by _services() in that loop rather than here.
     try:
-        _engine = StockfishEngine()
-        logger.info("Engine initialization successful")
-        # No need to retrieve path again as it's already logged during engine initialization
+        _engine_pool = _create_engine_pool()
 
-        # Register engine with health server
-        set_engine(_engine)
-    except StockfishError as e:
-        logger.error("Engine initialization failed: %s", e)
-        # Depending on desired behavior, might want to exit or raise here
-        # For now, allow server to start but tools might fail
+        # Register engine pool with health server
+        set_engine(_engine_pool)
     except Exception as e:
-        logger.error("Unexpected error during engine initialization: %s", e, exc_info=True)
+        logger.error("Unexpected error during engine pool setup: %s", e, exc_info=True)
         # Allow server to start but tools might fail
 
 
@@ -51,11 +269,88 @@ def setup_environment():
 setup_logging(settings.LOG_LEVEL)  # Pass log level directly
 
 
-class ChessMoveRequest(BaseModel):
+class SearchLimitsRequest(BaseModel):
+    """Optional per-request engine search limits, bounded by server-side caps."""
+
+    depth: Optional[int] = Field(None, ge=1, description="Maximum search depth in plies.")
+    nodes: Optional[int] = Field(None, ge=1, description="Maximum number of nodes to search.")
+    movetime_ms: Optional[int] = Field(None, ge=1, description="Search time in milliseconds.")
+    mate: Optional[int] = Field(None, ge=1, description="Search for a mate in this many moves.")
+
+    def search_limits(self) -> SearchLimits:
+        """Return the limits to search with after applying server defaults and caps."""
+        return SearchLimits.resolve(depth=self.depth, nodes=self.nodes, movetime_ms=self.movetime_ms, mate=self.mate)
+
+
+class ChessMoveRequest(SearchLimitsRequest):
     """Request model for chess move generation."""
 
     fen: str
     move_history: List[str] = []
+    use_book: bool = Field(True, description="Answer from the opening book when the position is in it.")
+    stream_info: bool = Field(
+        False, description="Report the engine's progress at each depth as MCP progress notifications."
+    )
+    deadline_ms: Optional[int] = Field(
+        None,
+        ge=1,
+        description="Stop searching this many milliseconds after the request arrives and return the best move so far.",
+    )
+
+
+class AnalyzePositionRequest(SearchLimitsRequest):
+    """Request model for the top candidate moves of a position."""
+
+    fen: str = Field(..., description="Board position in FEN format.")
+    move_history: List[str] = []
+    multipv: int = Field(3, ge=1, description="Number of candidate moves, capped by CHESSPAL_ENGINE_MAX_MULTIPV.")
+
+
+class BatchPosition(BaseModel):
+    """A position in a batch best-move request."""
+
+    fen: str = Field(..., description="Board position in FEN format.")
+    move_history: List[str] = []
+
+
+class BatchBestMovesRequest(SearchLimitsRequest):
+    """Request model for best moves over many positions with shared search limits."""
+
+    positions: List[BatchPosition] = Field(..., max_length=settings.CHESSPAL_MAX_BATCH_SIZE)
+    use_book: bool = Field(True, description="Answer from the opening book when a position is in it.")
+
+
+class AnalyzeGameRequest(SearchLimitsRequest):
+    """Request model for whole-game analysis from a PGN or a UCI move list."""
+
+    pgn: Optional[str] = Field(None, description="Game in PGN format; only the mainline is analyzed.")
+    moves: Optional[List[str]] = Field(None, description="Moves in UCI format, used when no PGN is given.")
+    fen: Optional[str] = Field(None, description="Start position for `moves`, defaults to the standard position.")
+
+
+class OpenGameRequest(BaseModel):
+    """Request model for opening a game session."""
+
+    fen: Optional[str] = Field(None, description="Start position in FEN format, defaults to the standard position.")
+    moves: List[str] = Field([], description="Moves already played from the start position in UCI format.")
+
+
+class SessionRequest(BaseModel):
+    """Request model for operations on a game session."""
+
+    session_id: str = Field(..., description="Session identifier returned by open_game_tool.")
+
+
+class PlayMoveRequest(SessionRequest):
+    """Request model for playing a move in a game session."""
+
+    move: str = Field(..., description="Move in UCI format (e.g., 'e2e4').")
+
+
+class SessionBestMoveRequest(SearchLimitsRequest, SessionRequest):
+    """Request model for the best move in a game session's current position."""
+
+    use_book: bool = Field(True, description="Answer from the opening book when the position is in it.")
 
 
 class ChessMoveResponse(BaseModel):
@@ -77,6 +372,22 @@ class ValidateMoveRequest(BaseModel):
     move: str = Field(..., description="Move in UCI format (e.g., 'e2e4').")
 
 
+class PositionBatchRequest(BaseModel):
+    """Request model for position-based queries over many positions."""
+
+    fens: List[str] = Field(
+        ..., max_length=settings.CHESSPAL_MAX_BATCH_SIZE, description="Board positions in FEN format."
+    )
+
+
+class ValidateMoveBatchRequest(BaseModel):
+    """Request model for validating many moves."""
+
+    items: List[ValidateMoveRequest] = Field(
+        ..., max_length=settings.CHESSPAL_MAX_BATCH_SIZE, description="FEN position and move pairs."
+    )
+
+
 class BoolResponse(BaseModel):
     """Response model for boolean results."""
 
@@ -99,28 +410,105 @@ class GameStatusResponse(BaseModel):
     winner: Optional[str] = Field(None, description="Winner ('WHITE', 'BLACK') if applicable, else null.")
 
 
+async def _start_services() -> None:
+    """Open the caches, book, tablebase and sessions, start the engines and the health publisher."""
+    global _engine_pool, _best_move_cache, _analysis_cache, _opening_book, _tablebase, _sessions, _health_publisher
+    logger.info("Starting chess engine server...")
+    if _best_move_cache is None:
+        _best_move_cache = _create_best_move_cache()
+    if _analysis_cache is None:
+        _analysis_cache = _create_analysis_cache()
+    if _opening_book is None:
+        _opening_book = _create_opening_book()
+    if _tablebase is None:
+        _tablebase = _create_tablebase()
+    if _sessions is None:
+        _sessions = _create_session_manager()
+
+    if not _engine_pool:
+        _engine_pool = _create_engine_pool()
+
+        # Register engine pool with health server
+        set_engine(_engine_pool)
+    else:
+        logger.info("Reusing existing engine pool")
+
+    try:
+        await _engine_pool.start()
+        logger.info("Engine initialized successfully")
+        # Engine path is already logged during engine initialization
+    except StockfishError as e:
+        logger.error("Engine initialization failed: %s", e)
+        # Allow server to start but tools might fail
+    if _health_state is not None:
+        _health_publisher = asyncio.create_task(_publish_health_state(_health_state))
+
+
+async def _stop_services() -> None:
+    """Stop the health publisher and the engines, log statistics and close the caches, book and tablebase."""
+    global _engine_pool, _best_move_cache, _analysis_cache, _opening_book, _tablebase, _sessions, _health_publisher
+    logger.info("Stopping engine...")
+    if _health_publisher is not None:
+        _health_publisher.cancel()
+        _health_publisher = None
+    if _engine_pool:
+        await _engine_pool.close()
+        _engine_pool = None
+    if _best_move_cache is not None:
+        logger.info("Best-move cache stats: %s", _best_move_cache.stats())
+        _best_move_cache = None
+    logger.info("Search coalescing stats: %s", _in_flight_searches.stats())
+    if _analysis_cache is not None:
+        logger.info("Analysis cache stats: %s", _analysis_cache.stats())
+        _analysis_cache.close()
+        _analysis_cache = None
+    if _opening_book is not None:
+        logger.info("Opening book stats: %s", _opening_book.stats())
+        _opening_book.close()
+        _opening_book = None
+    if _tablebase is not None:
+        logger.info("Tablebase stats: %s", _tablebase.stats())
+        _tablebase.close()
+        _tablebase = None
+    if _sessions is not None:
+        logger.info("Session stats: %s", _sessions.stats())
+        _sessions = None
+    if _health_state is not None:
+        # Report the engines as gone right away rather than once the last snapshot goes stale
+        _health_state.publish(_health_snapshot())
+    logger.info("Engine stopped.")
+
+
 @asynccontextmanager
-async def lifespan(server: FastMCP) -> AsyncIterator[None]:
-    """Manage the lifespan of the MCP application."""
-    global _engine
+async def _services() -> AsyncIterator[None]:
+    """Hold the process-wide services, starting them for the first holder and stopping them after the last.
+
+    In SSE mode FastMCP enters the lifespan once per client connection, so
+    the engines, caches and sessions must not end with any one connection:
+    main_cli holds them for the whole server run and each lifespan only adds
+    a reference.
+    """
+    global _service_holders, _service_lock
+    if _service_lock is None:
+        _service_lock = asyncio.Lock()
+    async with _service_lock:
+        if _service_holders == 0:
+            await _start_services()
+        _service_holders += 1
     try:
-        logger.info("Starting chess engine server (via MCP lifespan)...")
-        if not _engine:
-            _engine = StockfishEngine()
-            logger.info("Engine initialized successfully (via MCP lifespan)")
-            # Engine path is already logged during engine initialization
-
-            # Register engine with health server
-            set_engine(_engine)
-        else:
-            logger.info("Reusing existing engine instance")
         yield
     finally:
-        logger.info("Stopping engine (via MCP lifespan)...")
-        if _engine:
-            _engine.stop()
-            _engine = None
-        logger.info("Engine stopped (via MCP lifespan).")
+        async with _service_lock:
+            _service_holders -= 1
+            if _service_holders == 0:
+                await _stop_services()
+
+
+@asynccontextmanager
+async def lifespan(server: FastMCP) -> AsyncIterator[None]:
+    """Manage the lifespan of the MCP application."""
+    async with _services():
+        yield
 
 
 app = FastMCP(
@@ -131,56 +519,387 @@ app = FastMCP(
 )
 
 
+async def _search_and_store(
+    pool: EnginePool,
+    fen: str,
+    move_history: List[str],
+    limits: SearchLimits,
+    key: CacheKey,
+    on_info: Optional[InfoCallback] = None,
+    deadline: Optional[float] = None,
+    priority: Priority = Priority.LIVE,
+    client: Optional[str] = None,
+) -> SearchResult:
+    """Search a position on the pool and store the result in the caches.
+
+    Results of searches stopped at their deadline are not stored, since they
+    did not reach the requested limits.
+    """
+    result = await pool.search(
+        fen, move_history, limits, on_info=on_info, deadline=deadline, priority=priority, client=client
+    )
+    if result.partial:
+        return result
+    if _best_move_cache is not None:
+        _best_move_cache.put(key, result.best_move)
+    if _analysis_cache is not None:
+        await _analysis_cache.put_async(key[0], limits, result)
+    return result
+
+
+async def _known_move(board: chess.Board, use_book: bool) -> Optional[str]:
+    """Return a move from the opening book or tablebase without searching, or None."""
+    if use_book and _opening_book is not None:
+        book_move = _opening_book.find_move(board)
+        if book_move is not None:
+            return book_move
+    if _tablebase is not None:
+        return await _tablebase.find_move_async(board)
+    return None
+
+
+async def _best_move(
+    fen: str,
+    move_history: List[str],
+    limits: SearchLimits,
+    use_book: bool,
+    tool: str,
+    on_info: Optional[InfoCallback] = None,
+    deadline: Optional[float] = None,
+    priority: Priority = Priority.LIVE,
+    client: Optional[str] = None,
+) -> dict:
+    """Find the best move for one position, returning {"result": ...} or {"error": str}.
+
+    The opening book, tablebase and caches are consulted before searching,
+    and identical concurrent searches of the same priority are shared. A search streaming its
+    progress to `on_info` or bounded by a `deadline` runs on its own, since
+    a shared one has a single listener and a single deadline. When the
+    caller is cancelled, e.g. because the client disconnected, the engine is
+    told to stop as soon as nobody waits for its search anymore. A search
+    waiting for an engine is queued with `priority` on behalf of `client`.
+    """
+    try:
+        board = chess.Board(fen)
+    except ValueError as e:
+        logger.warning("Invalid FEN format in %s: %s", tool, e)
+        return {"error": "Invalid FEN format: %s" % e}
+    try:
+        for move in move_history:
+            board.push_uci(move)
+    except ValueError as e:
+        logger.warning("Invalid move history in %s: %s", tool, e)
+        return {"error": "Invalid move history: %s" % e}
+
+    known_move = await _known_move(board, use_book)
+    if known_move is not None:
+        return {"result": {"best_move_uci": known_move}}
+
+    key = cache_key(board, limits)
+    if _best_move_cache is not None:
+        cached_move = _best_move_cache.get(key)
+        if cached_move is not None:
+            return {"result": {"best_move_uci": cached_move}}
+    if _analysis_cache is not None:
+        stored = await _analysis_cache.get_async(key[0], limits)
+        if stored is not None:
+            if _best_move_cache is not None:
+                _best_move_cache.put(key, stored.best_move)
+            return {"result": {"best_move_uci": stored.best_move}}
+
+    if _engine_pool is None:
+        return {"error": "Engine not initialized"}
+
+    try:
+        pool = _engine_pool
+        if on_info is not None or deadline is not None:
+            result = await _search_and_store(
+                pool, fen, move_history, limits, key, on_info, deadline, priority=priority, client=client
+            )
+        else:
+            # Only requests of the same priority share a search, so a live move never waits in the batch queue
+            result = await _in_flight_searches.run(
+                ("best_move", key, priority),
+                lambda: _search_and_store(pool, fen, move_history, limits, key, priority=priority, client=client),
+            )
+        if result.partial:
+            return {"result": {"best_move_uci": result.best_move, "partial": True}}
+        return {"result": {"best_move_uci": result.best_move}}
+    except StockfishError as e:
+        logger.warning("Stockfish engine error: %s", e)
+        return {"error": str(e)}
+    except Exception as e:
+        logger.error(
+            "Unexpected internal error in %s: %s",
+            tool,
+            e,
+            exc_info=True,
+        )
+        return {"error": "Internal server error"}
+
+
+# FastMCP finds the context parameter by its exact annotation, so tools cannot
+# declare it Optional[Context] even though tests call them without a context
 @app.tool()
-async def get_best_move_tool(request: ChessMoveRequest) -> dict:
+@_instrumented
+async def get_best_move_tool(request: ChessMoveRequest, ctx: Context = None) -> dict:  # type: ignore[assignment]
     """Get the best move in the given position using the chess engine.
 
+    With `stream_info`, every depth the engine completes is reported as an
+    MCP progress notification (depth out of the requested depth) and a log
+    message carrying the parsed depth, score, nodes, nps, time and PV. With
+    `deadline_ms`, the search is stopped once the deadline passes and the
+    best move found so far is returned, flagged with "partial": true.
+
     Args:
-        request: The request containing the position and move history.
+        request: The request containing the position, move history,
+            optional search limits (depth, nodes, movetime_ms, mate),
+            whether the opening book may answer, whether to stream search
+            progress and an optional deadline.
+        ctx: MCP request context used for progress notifications.
 
     Returns:
         A dictionary containing either {"result": {"best_move_uci": str}}
         for success or {"error": str} for failure.
     """
-    if _engine is None:
+    limits = request.search_limits()
+    deadline = time.monotonic() + request.deadline_ms / 1000 if request.deadline_ms is not None else None
+
+    async def report(info: dict) -> None:
+        await ctx.report_progress(info.get("depth", 0), limits.depth)
+        await ctx.info(json.dumps(info))
+
+    return await _best_move(
+        request.fen,
+        request.move_history,
+        limits,
+        request.use_book,
+        "get_best_move_tool",
+        on_info=report if request.stream_info and ctx is not None else None,
+        deadline=deadline,
+        client=_client_key(ctx),
+    )
+
+
+@app.tool()
+@_instrumented
+async def batch_best_moves_tool(request: BatchBestMovesRequest, ctx: Context = None) -> dict:  # type: ignore[assignment]
+    """Get best moves for many positions, searched in parallel across the engine pool.
+
+    Each completed position is reported as an MCP progress notification and
+    a log message carrying its index and result.
+
+    Args:
+        request: The positions and the search limits shared by all of them.
+        ctx: MCP request context used for progress notifications.
+
+    Returns:
+        A dictionary {"result": {"results": [...], "positions": int,
+        "elapsed_ms": float, "positions_per_second": float}} where results
+        holds one {"result": ...} or {"error": str} entry per position, in
+        request order.
+    """
+    if _engine_pool is None:
         return {"error": "Engine not initialized"}
 
+    limits = request.search_limits()
+    total = len(request.positions)
+    results: List[Optional[dict]] = [None] * total
+    client = _client_key(ctx)
+
+    async def search(fen: str, move_history: Optional[List[str]], limits: Optional[SearchLimits]) -> dict:
+        return await _best_move(
+            fen,
+            move_history or [],
+            limits or SearchLimits.resolve(),
+            request.use_book,
+            "batch_best_moves_tool",
+            priority=Priority.BATCH,
+            client=client,
+        )
+
+    start_time = time.monotonic()
+    completed = 0
+    positions = [(position.fen, position.move_history) for position in request.positions]
+    async for index, item in _engine_pool.search_many(positions, limits, search=search):
+        if isinstance(item, Exception):
+            # Failures outside the search itself (book, tablebase, cache) only fail their own position
+            logger.error("Unexpected internal error in batch_best_moves_tool: %s", item, exc_info=item)
+            item = {"error": "Internal server error"}
+        results[index] = item
+        completed += 1
+        if ctx is not None:
+            await ctx.report_progress(completed, total)
+            await ctx.info(json.dumps({"index": index, **item}))
+    elapsed = time.monotonic() - start_time
+
+    logger.info("Batch of %d positions searched in %.3fs", total, elapsed)
+    return {
+        "result": {
+            "results": results,
+            "positions": total,
+            "elapsed_ms": round(elapsed * 1000, 3),
+            "positions_per_second": round(total / elapsed, 3) if elapsed > 0 else 0.0,
+        }
+    }
+
+
+@app.tool()
+@_instrumented
+async def analyze_position_tool(request: AnalyzePositionRequest, ctx: Context = None) -> dict:  # type: ignore[assignment]
+    """Get the top candidate moves of a position from a single MultiPV search.
+
+    Args:
+        request: The position, move history, number of candidates and
+            optional search limits.
+        ctx: MCP request context identifying the client.
+
+    Returns:
+        A dictionary containing either {"result": {"best_move_uci": str,
+        "evaluation": float, "depth": int, "candidates": [...]}} with one
+        {"rank", "move_uci", "score_cp", "mate", "depth", "pv"} entry per
+        candidate, best first, or {"error": str} for failure. Scores are
+        from the side to move's point of view; evaluation is in pawns.
+    """
     try:
-        best_move = _engine.get_best_move(request.fen, request.move_history)
-        return {"result": {"best_move_uci": best_move}}
+        board = chess.Board(request.fen)
+    except ValueError as e:
+        logger.warning("Invalid FEN format in analyze_position_tool: %s", e)
+        return {"error": "Invalid FEN format: %s" % e}
+    try:
+        for move in request.move_history:
+            board.push_uci(move)
+    except ValueError as e:
+        logger.warning("Invalid move history in analyze_position_tool: %s", e)
+        return {"error": "Invalid move history: %s" % e}
+
+    if _engine_pool is None:
+        return {"error": "Engine not initialized"}
+
+    limits = request.search_limits()
+    multipv = min(request.multipv, settings.CHESSPAL_ENGINE_MAX_MULTIPV)
+    client = _client_key(ctx)
+    try:
+        pool = _engine_pool
+        result = await _in_flight_searches.run(
+            ("analysis", cache_key(board, limits), multipv, Priority.ANALYSIS),
+            lambda: pool.search(
+                request.fen, request.move_history, limits, multipv=multipv, priority=Priority.ANALYSIS, client=client
+            ),
+        )
+        analysis = PositionAnalysis(
+            best_move_uci=result.best_move,
+            evaluation=result.score_cp / 100 if result.score_cp is not None else None,
+            depth=result.depth,
+            candidates=result.candidates,
+        )
+        return {"result": analysis.model_dump()}
     except StockfishError as e:
         logger.warning("Stockfish engine error: %s", e)
         return {"error": str(e)}
     except Exception as e:
         logger.error(
-            "Unexpected internal error in get_best_move_tool: %s",
+            "Unexpected internal error in analyze_position_tool: %s",
             e,
             exc_info=True,
         )
         return {"error": "Internal server error"}
 
 
+def _parse_game(request: AnalyzeGameRequest) -> Tuple[chess.Board, List[chess.Move]]:
+    """Return the start position and the moves to analyze.
+
+    Raises:
+        ValueError: If the game is missing, unreadable or contains an illegal move
+    """
+    if request.pgn:
+        game = chess.pgn.read_game(io.StringIO(request.pgn))
+        if game is None:
+            raise ValueError("No game found in PGN")
+        if game.errors:
+            raise ValueError(str(game.errors[0]))
+        return game.board(), list(game.mainline_moves())
+
+    if request.moves is None:
+        raise ValueError("Either pgn or moves is required")
+    board = chess.Board(request.fen) if request.fen else chess.Board()
+    start = board.copy(stack=False)
+    moves = []
+    for uci in request.moves:
+        moves.append(board.push_uci(uci))
+    return start, moves
+
+
 @app.tool()
-async def validate_move_tool(request: ValidateMoveRequest) -> dict:
-    """Validate if a move is legal in the given position.
+@_instrumented
+async def analyze_game_tool(request: AnalyzeGameRequest, ctx: Context = None) -> dict:  # type: ignore[assignment]
+    """Analyze every ply of a game, preferring the same warm engine for each ply.
+
+    Every ply waits in the batch queue on its own, so live requests are served
+    between plies instead of behind the whole game. Each analyzed ply is
+    reported as an MCP progress notification and a log message carrying the
+    ply report as soon as it is ready.
 
     Args:
-        request: The request containing the FEN position and move to validate.
+        request: The game as a PGN or UCI move list, and the search limits per ply.
+        ctx: MCP request context used for progress notifications.
 
     Returns:
-        A dictionary containing either {"result": bool} for success
-        or {"error": str} for failure.
+        A dictionary containing either {"result": {"plies": [...]}} with one
+        report (move, best move, score, depth, centipawn loss) per ply, or
+        {"error": str} for failure.
     """
     try:
-        board = chess.Board(request.fen)
+        board, moves = _parse_game(request)
     except ValueError as e:
-        logger.warning("Invalid FEN format in validate_move_tool: %s", e)
+        logger.warning("Invalid game in analyze_game_tool: %s", e)
+        return {"error": "Invalid game: %s" % e}
+
+    if _engine_pool is None:
+        return {"error": "Engine not initialized"}
+
+    async def report(ply: dict) -> None:
+        if ctx is not None:
+            await ctx.report_progress(ply["ply"], len(moves))
+            await ctx.info(json.dumps(ply))
+
+    pool = _engine_pool
+    client = _client_key(ctx)
+    last_engine: Optional[AsyncStockfishEngine] = None
+
+    async def search(fen: str, move_history: Optional[List[str]], limits: SearchLimits) -> SearchResult:
+        nonlocal last_engine
+        async with pool.acquire(prefer=last_engine, priority=Priority.BATCH, client=client) as engine:
+            last_engine = engine
+            return await engine.search(fen, move_history, limits)
+
+    try:
+        plies = await analyze_moves(search, board, moves, request.search_limits(), on_ply=report)
+        return {"result": {"plies": plies}}
+    except StockfishError as e:
+        logger.warning("Stockfish engine error: %s", e)
+        return {"error": str(e)}
+    except Exception as e:
+        logger.error(
+            "Unexpected internal error in analyze_game_tool: %s",
+            e,
+            exc_info=True,
+        )
+        return {"error": "Internal server error"}
+
+
+def _validate_move(fen: str, move_uci: str, tool: str) -> dict:
+    """Check a single move, returning {"result": bool} or {"error": str}."""
+    try:
+        board = chess.Board(fen)
+    except ValueError as e:
+        logger.warning("Invalid FEN format in %s: %s", tool, e)
         return {"error": "Invalid FEN format: %s" % e}
 
     try:
-        move = chess.Move.from_uci(request.move)
+        move = chess.Move.from_uci(move_uci)
     except ValueError as e:
-        logger.warning("Invalid move format in validate_move_tool: %s", e)
+        logger.warning("Invalid move format in %s: %s", tool, e)
         return {"error": "Invalid move format: %s" % e}
 
     try:
@@ -188,28 +907,20 @@ async def validate_move_tool(request: ValidateMoveRequest) -> dict:
         return {"result": result}
     except Exception as e:
         logger.error(
-            "Unexpected internal error in validate_move_tool: %s",
+            "Unexpected internal error in %s: %s",
+            tool,
             e,
             exc_info=True,
         )
         return {"error": "Internal server error"}
 
 
-@app.tool()
-async def get_legal_moves_tool(request: PositionRequest) -> dict:
-    """Get all legal moves in the given position.
-
-    Args:
-        request: The request containing the FEN position.
-
-    Returns:
-        A dictionary containing either {"result": List[str]} for success
-        or {"error": str} for failure.
-    """
+def _legal_moves(fen: str, tool: str) -> dict:
+    """List the legal moves of a position, returning {"result": List[str]} or {"error": str}."""
     try:
-        board = chess.Board(request.fen)
+        board = chess.Board(fen)
     except ValueError as e:
-        logger.warning("Invalid FEN format in get_legal_moves_tool: %s", e)
+        logger.warning("Invalid FEN format in %s: %s", tool, e)
         return {"error": "Invalid FEN format: %s" % e}
 
     try:
@@ -217,28 +928,20 @@ async def get_legal_moves_tool(request: PositionRequest) -> dict:
         return {"result": legal_moves}
     except Exception as e:
         logger.error(
-            "Unexpected internal error in get_legal_moves_tool: %s",
+            "Unexpected internal error in %s: %s",
+            tool,
             e,
             exc_info=True,
         )
         return {"error": "Internal server error"}
 
 
-@app.tool()
-async def get_game_status_tool(request: PositionRequest) -> dict:
-    """Get the game status for the given position.
-
-    Args:
-        request: The request containing the FEN position.
-
-    Returns:
-        A dictionary containing either {"result": GameStatusResponse}
-        for success or {"error": str} for failure.
-    """
+def _game_status(fen: str, tool: str) -> dict:
+    """Classify a position, returning {"result": GameStatusResponse} or {"error": str}."""
     try:
-        board = chess.Board(request.fen)
+        board = chess.Board(fen)
     except ValueError as e:
-        logger.warning("Invalid FEN format in get_game_status_tool: %s", e)
+        logger.warning("Invalid FEN format in %s: %s", tool, e)
         return {"error": "Invalid FEN format: %s" % e}
 
     try:
@@ -258,15 +961,251 @@ async def get_game_status_tool(request: PositionRequest) -> dict:
         return {"result": {"status": status, "winner": winner}}
     except Exception as e:
         logger.error(
-            "Unexpected internal error in get_game_status_tool: %s",
+            "Unexpected internal error in %s: %s",
+            tool,
+            e,
+            exc_info=True,
+        )
+        return {"error": "Internal server error"}
+
+
+@app.tool()
+@_instrumented
+async def validate_move_tool(request: ValidateMoveRequest) -> dict:
+    """Validate if a move is legal in the given position.
+
+    Args:
+        request: The request containing the FEN position and move to validate.
+
+    Returns:
+        A dictionary containing either {"result": bool} for success
+        or {"error": str} for failure.
+    """
+    return _validate_move(request.fen, request.move, "validate_move_tool")
+
+
+@app.tool()
+@_instrumented
+async def get_legal_moves_tool(request: PositionRequest) -> dict:
+    """Get all legal moves in the given position.
+
+    Args:
+        request: The request containing the FEN position.
+
+    Returns:
+        A dictionary containing either {"result": List[str]} for success
+        or {"error": str} for failure.
+    """
+    return _legal_moves(request.fen, "get_legal_moves_tool")
+
+
+@app.tool()
+@_instrumented
+async def get_game_status_tool(request: PositionRequest) -> dict:
+    """Get the game status for the given position.
+
+    Args:
+        request: The request containing the FEN position.
+
+    Returns:
+        A dictionary containing either {"result": GameStatusResponse}
+        for success or {"error": str} for failure.
+    """
+    return _game_status(request.fen, "get_game_status_tool")
+
+
+@app.tool()
+@_instrumented
+async def validate_moves_batch_tool(request: ValidateMoveBatchRequest) -> dict:
+    """Validate many moves in one call.
+
+    Args:
+        request: The request containing the FEN position and move pairs.
+
+    Returns:
+        A dictionary {"result": [...]} with one {"result": bool} or
+        {"error": str} entry per item, in request order.
+    """
+    return {"result": [_validate_move(item.fen, item.move, "validate_moves_batch_tool") for item in request.items]}
+
+
+@app.tool()
+@_instrumented
+async def get_legal_moves_batch_tool(request: PositionBatchRequest) -> dict:
+    """Get the legal moves of many positions in one call.
+
+    Args:
+        request: The request containing the FEN positions.
+
+    Returns:
+        A dictionary {"result": [...]} with one {"result": List[str]} or
+        {"error": str} entry per position, in request order.
+    """
+    return {"result": [_legal_moves(fen, "get_legal_moves_batch_tool") for fen in request.fens]}
+
+
+@app.tool()
+@_instrumented
+async def get_game_status_batch_tool(request: PositionBatchRequest) -> dict:
+    """Get the game status of many positions in one call.
+
+    Args:
+        request: The request containing the FEN positions.
+
+    Returns:
+        A dictionary {"result": [...]} with one {"result": GameStatusResponse}
+        or {"error": str} entry per position, in request order.
+    """
+    return {"result": [_game_status(fen, "get_game_status_batch_tool") for fen in request.fens]}
+
+
+@app.tool()
+@_instrumented
+async def open_game_tool(request: OpenGameRequest) -> dict:
+    """Open a game session that keeps the board on the server between calls.
+
+    Args:
+        request: The start position and the moves already played.
+
+    Returns:
+        A dictionary containing either {"result": {"session_id": str,
+        "fen": str}} for success or {"error": str} for failure.
+    """
+    try:
+        board = chess.Board(request.fen) if request.fen else chess.Board()
+    except ValueError as e:
+        logger.warning("Invalid FEN format in open_game_tool: %s", e)
+        return {"error": "Invalid FEN format: %s" % e}
+    try:
+        for move in request.moves:
+            board.push_uci(move)
+    except ValueError as e:
+        logger.warning("Invalid move history in open_game_tool: %s", e)
+        return {"error": "Invalid move history: %s" % e}
+
+    if _sessions is None:
+        return {"error": "Sessions not initialized"}
+    session = _sessions.open(board)
+    return {"result": {"session_id": session.session_id, "fen": board.fen()}}
+
+
+@app.tool()
+@_instrumented
+async def play_move_tool(request: PlayMoveRequest) -> dict:
+    """Play a move in a game session.
+
+    Args:
+        request: The session and the move to play in UCI format.
+
+    Returns:
+        A dictionary containing either {"result": {"fen": str}} with the
+        position after the move, or {"error": str} for failure.
+    """
+    if _sessions is None:
+        return {"error": "Sessions not initialized"}
+    try:
+        session = _sessions.get(request.session_id)
+    except SessionError as e:
+        return {"error": str(e)}
+    try:
+        move = chess.Move.from_uci(request.move)
+    except ValueError as e:
+        logger.warning("Invalid move format in play_move_tool: %s", e)
+        return {"error": "Invalid move format: %s" % e}
+    if move not in session.board.legal_moves:
+        return {"error": "Illegal move: %s" % request.move}
+
+    session.board.push(move)
+    return {"result": {"fen": session.board.fen()}}
+
+
+@app.tool()
+@_instrumented
+async def session_best_move_tool(request: SessionBestMoveRequest, ctx: Context = None) -> dict:  # type: ignore[assignment]
+    """Get the best move in a game session's current position.
+
+    The search runs on the engine that last searched this game when it is
+    idle, so its hash table still holds the game's positions, and only the
+    moves since the last capture or pawn move are sent to it.
+
+    Args:
+        request: The session, optional search limits and whether the
+            opening book may answer.
+        ctx: MCP request context identifying the client.
+
+    Returns:
+        A dictionary containing either {"result": {"best_move_uci": str}}
+        for success or {"error": str} for failure.
+    """
+    if _sessions is None:
+        return {"error": "Sessions not initialized"}
+    try:
+        session = _sessions.get(request.session_id)
+    except SessionError as e:
+        return {"error": str(e)}
+
+    known_move = await _known_move(session.board, request.use_book)
+    if known_move is not None:
+        return {"result": {"best_move_uci": known_move}}
+
+    if _engine_pool is None:
+        return {"error": "Engine not initialized"}
+
+    fen, moves = session.search_position()
+    try:
+        async with _engine_pool.acquire(prefer=session.engine, client=_client_key(ctx)) as engine:
+            session.engine = engine
+            best_move = await engine.get_best_move(fen, moves, request.search_limits())
+        return {"result": {"best_move_uci": best_move}}
+    except StockfishError as e:
+        logger.warning("Stockfish engine error: %s", e)
+        return {"error": str(e)}
+    except Exception as e:
+        logger.error(
+            "Unexpected internal error in session_best_move_tool: %s",
             e,
             exc_info=True,
         )
         return {"error": "Internal server error"}
 
 
+@app.tool()
+@_instrumented
+async def close_game_tool(request: SessionRequest) -> dict:
+    """Close a game session.
+
+    Args:
+        request: The session to close.
+
+    Returns:
+        A dictionary containing either {"result": True} for success or
+        {"error": str} for failure.
+    """
+    if _sessions is None:
+        return {"error": "Sessions not initialized"}
+    try:
+        _sessions.close(request.session_id)
+    except SessionError as e:
+        return {"error": str(e)}
+    return {"result": True}
+
+
+async def _run_server(transport: str) -> None:
+    """Run the MCP server over `transport`, holding the services for the whole run.
+
+    The engines then stay up and the health state keeps being published
+    while no client is connected.
+    """
+    async with _services():
+        if transport == "stdio":
+            await app.run_stdio_async()
+        else:
+            await app.run_sse_async()
+
+
 def main_cli():
     """Parse arguments, set up environment, and run the MCP server."""
+    global _health_process, _health_state
     parser = argparse.ArgumentParser(description="Chess Engine MCP Server")
     parser.add_argument(
         "--transport",
@@ -286,15 +1225,17 @@ def main_cli():
 
     # Start health server
     if not args.no_health_server:
-        global _health_process
         health_host = os.environ.get("HEALTH_HOST", settings.HEALTH_HOST)
         health_port = int(os.environ.get("HEALTH_PORT", str(settings.HEALTH_PORT)))
         health_log_level = os.environ.get("HEALTH_LOG_LEVEL", settings.HEALTH_LOG_LEVEL.lower())
 
         logger.info("Starting health server on %s:%d...", health_host, health_port)
+        # The health server runs in its own process and reads the engine state from this file
+        _health_state = SharedState.create()
+        _health_state.publish(_health_snapshot())
         _health_process = multiprocessing.Process(
             target=start_health_server,
-            args=(health_host, health_port, health_log_level),
+            args=(health_host, health_port, health_log_level, str(_health_state.path)),
             daemon=True,
         )
         _health_process.start()
@@ -326,7 +1267,12 @@ def main_cli():
         print("\033[33mWARNING\033[0m: " "Unable to retrieve Stockfish engine path: %s" % e)
 
     # Run the app instance using the selected transport
-    app.run(transport=args.transport)
+    try:
+        asyncio.run(_run_server(args.transport))
+    finally:
+        if _health_state is not None:
+            _health_state.close(unlink=True)
+            _health_state = None
 
 
 # Removed redundant main() function
@@ -0,0 +1,203 @@
+"""Request and engine metrics exported in the Prometheus text format.
+
+Recording a sample only increments integers in plain dictionaries, so the
+counters can sit on the request path. Values owned by other components,
+such as cache hit counts and the engine pool's queue depth, are read from
+registered collectors when the metrics are rendered.
+"""
+
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+# Upper bounds in seconds of the latency histogram buckets
+LATENCY_BUCKETS: Tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Returns the current values of a metric family, keyed by label value ("" when unlabeled)
+Collector = Callable[[], Dict[str, float]]
+
+
+class Histogram:
+    """Distribution of observed values over fixed buckets."""
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS):
+        """Initialize an empty histogram.
+
+        Args:
+            buckets: Sorted upper bounds of the buckets; values above the
+                last one are only counted in the implicit +Inf bucket
+        """
+        self.buckets = tuple(buckets)
+        # Per-bucket counts, the last slot holding values above every bound
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        """Record one value."""
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        """Return (upper bound, count of values up to it) pairs, ending with +Inf."""
+        samples = []
+        total = 0
+        for bound, count in zip(self.buckets, self.counts):
+            total += count
+            samples.append((_format_value(bound), total))
+        samples.append(("+Inf", self.count))
+        return samples
+
+
+class Metrics:
+    """Counters and histograms of the MCP tools and engine searches."""
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS):
+        """Initialize with nothing recorded.
+
+        Args:
+            buckets: Upper bounds in seconds of the latency histograms
+        """
+        self.buckets = tuple(buckets)
+        self._collectors: Dict[str, Tuple[str, str, str, Collector]] = {}
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget everything recorded, keeping the registered collectors."""
+        self.tool_requests: Dict[str, int] = {}
+        self.tool_errors: Dict[str, int] = {}
+        self.tool_latency: Dict[str, Histogram] = {}
+        self.search_time = Histogram(self.buckets)
+        self.search_nodes = 0
+        self.search_nps: Optional[int] = None
+        self.queue_wait: Dict[str, Histogram] = {}
+        # Wall-clock time of the last completed search
+        self.last_search_at: Optional[float] = None
+
+    def record_tool(self, tool: str, seconds: float, error: bool) -> None:
+        """Record one tool call.
+
+        Args:
+            tool: Tool name
+            seconds: Time taken to answer the call
+            error: Whether the call returned an error
+        """
+        self.tool_requests[tool] = self.tool_requests.get(tool, 0) + 1
+        if error:
+            self.tool_errors[tool] = self.tool_errors.get(tool, 0) + 1
+        histogram = self.tool_latency.get(tool)
+        if histogram is None:
+            histogram = self.tool_latency[tool] = Histogram(self.buckets)
+        histogram.observe(seconds)
+
+    def record_search(self, seconds: float, nodes: Optional[int] = None, nps: Optional[int] = None) -> None:
+        """Record one completed engine search.
+
+        Args:
+            seconds: Wall-clock time of the search
+            nodes: Nodes searched, if the engine reported them
+            nps: Search speed in nodes per second, if the engine reported it
+        """
+        self.search_time.observe(seconds)
+        self.last_search_at = time.time()
+        if nodes is not None:
+            self.search_nodes += nodes
+        if nps is not None:
+            self.search_nps = nps
+
+    def record_queue_wait(self, priority: str, seconds: float) -> None:
+        """Record how long a request waited for an engine.
+
+        Args:
+            priority: Priority class of the request
+            seconds: Time spent waiting, zero if an engine was idle
+        """
+        histogram = self.queue_wait.get(priority)
+        if histogram is None:
+            histogram = self.queue_wait[priority] = Histogram(self.buckets)
+        histogram.observe(seconds)
+
+    def register(self, name: str, help_text: str, kind: str, collect: Collector, label: str = "") -> None:
+        """Export values owned by another component.
+
+        Registering a name again replaces its collector.
+
+        Args:
+            name: Metric family name
+            help_text: Description exported as the family's HELP line
+            kind: Prometheus metric type, "gauge" or "counter"
+            collect: Returns the current values keyed by the value of `label`
+            label: Label distinguishing the values, empty for a single value
+        """
+        self._collectors[name] = (help_text, kind, label, collect)
+
+    def render(self) -> str:
+        """Return all metrics in the Prometheus text exposition format."""
+        lines: List[str] = []
+
+        _family(lines, "chesspal_tool_requests_total", "MCP tool calls", "counter")
+        lines.extend(_sample("chesspal_tool_requests_total", {"tool": t}, v) for t, v in self.tool_requests.items())
+        _family(lines, "chesspal_tool_errors_total", "MCP tool calls that returned an error", "counter")
+        lines.extend(_sample("chesspal_tool_errors_total", {"tool": t}, v) for t, v in self.tool_errors.items())
+        _family(lines, "chesspal_tool_latency_seconds", "MCP tool call latency", "histogram")
+        for tool, histogram in self.tool_latency.items():
+            _histogram(lines, "chesspal_tool_latency_seconds", histogram, {"tool": tool})
+
+        _family(lines, "chesspal_engine_search_seconds", "Engine search time", "histogram")
+        _histogram(lines, "chesspal_engine_search_seconds", self.search_time, {})
+        _family(lines, "chesspal_engine_search_nodes_total", "Nodes searched by the engines", "counter")
+        lines.append(_sample("chesspal_engine_search_nodes_total", {}, self.search_nodes))
+        if self.search_nps is not None:
+            _family(lines, "chesspal_engine_nodes_per_second", "Search speed of the last search", "gauge")
+            lines.append(_sample("chesspal_engine_nodes_per_second", {}, self.search_nps))
+
+        _family(lines, "chesspal_engine_queue_wait_seconds", "Time requests waited for an engine", "histogram")
+        for priority, histogram in self.queue_wait.items():
+            _histogram(lines, "chesspal_engine_queue_wait_seconds", histogram, {"priority": priority})
+
+        for name, (help_text, kind, label, collect) in self._collectors.items():
+            values = collect()
+            if not values:
+                continue
+            _family(lines, name, help_text, kind)
+            lines.extend(_sample(name, {label: key} if label else {}, value) for key, value in values.items())
+
+        return "\n".join(lines) + "\n"
+
+
+def _format_value(value: float) -> str:
+    """Format a sample value, writing integral values without a fraction."""
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def _escape(value: str) -> str:
+    """Escape a label value."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _sample(name: str, labels: Dict[str, str], value: float) -> str:
+    """Format one sample line."""
+    if not labels:
+        return f"{name} {_format_value(value)}"
+    rendered = ",".join(f'{key}="{_escape(str(label))}"' for key, label in labels.items())
+    return f"{name}{{{rendered}}} {_format_value(value)}"
+
+
+def _family(lines: List[str], name: str, help_text: str, kind: str) -> None:
+    """Append the HELP and TYPE lines of a metric family."""
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} {kind}")
+
+
+def _histogram(lines: List[str], name: str, histogram: Histogram, labels: Dict[str, str]) -> None:
+    """Append the bucket, sum and count samples of a histogram."""
+    lines.extend(_sample(f"{name}_bucket", {**labels, "le": bound}, count) for bound, count in histogram.cumulative())
+    lines.append(_sample(f"{name}_sum", labels, histogram.sum))
+    lines.append(_sample(f"{name}_count", labels, histogram.count))
+
+
+# Process-wide metrics, recorded by the tools and engines and rendered by the health server
+metrics = Metrics()
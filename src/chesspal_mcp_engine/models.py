@@ -1,8 +1,10 @@
 """Models for the chess engine."""
 
-from typing import Optional
+from typing import List, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, Field
+
+from .config import settings
 
 
 class PositionRequest(BaseModel):
@@ -26,3 +28,103 @@ class BestMoveResponse(BaseModel):
     best_move_uci: str
     evaluation: Optional[float] = None
     depth: Optional[int] = None
+
+
+class CandidateMove(BaseModel):
+    """One principal variation of a MultiPV search."""
+
+    rank: int
+    move_uci: str
+    score_cp: Optional[int] = None
+    mate: Optional[int] = None
+    depth: Optional[int] = None
+    pv: List[str] = []
+
+
+class PositionAnalysis(BestMoveResponse):
+    """Response model for a MultiPV analysis.
+
+    `evaluation` is the best candidate's score in pawns from the side to
+    move's point of view, None when it is a mate score.
+    """
+
+    candidates: List[CandidateMove] = []
+
+
+class SearchLimits(BaseModel):
+    """Limits for a single engine search, translated into a UCI go command."""
+
+    model_config = ConfigDict(frozen=True)
+
+    depth: Optional[int] = Field(None, ge=1, description="Maximum search depth in plies.")
+    nodes: Optional[int] = Field(None, ge=1, description="Maximum number of nodes to search.")
+    movetime_ms: Optional[int] = Field(None, ge=1, description="Search time in milliseconds.")
+    mate: Optional[int] = Field(None, ge=1, description="Search for a mate in this many moves.")
+
+    @classmethod
+    def resolve(
+        cls,
+        depth: Optional[int] = None,
+        nodes: Optional[int] = None,
+        movetime_ms: Optional[int] = None,
+        mate: Optional[int] = None,
+    ) -> "SearchLimits":
+        """Build limits for a request, applying the server-side defaults and caps.
+
+        Without any requested limit the search uses CHESSPAL_ENGINE_DEPTH and
+        CHESSPAL_ENGINE_TIMEOUT_MS. Requested limits are clamped to the
+        CHESSPAL_ENGINE_MAX_* caps, and every search is bounded in time.
+        """
+        if depth is None and nodes is None and movetime_ms is None and mate is None:
+            depth = settings.CHESSPAL_ENGINE_DEPTH
+            movetime_ms = settings.CHESSPAL_ENGINE_TIMEOUT_MS
+        return cls(
+            depth=min(depth, settings.CHESSPAL_ENGINE_MAX_DEPTH) if depth is not None else None,
+            nodes=min(nodes, settings.CHESSPAL_ENGINE_MAX_NODES) if nodes is not None else None,
+            movetime_ms=min(
+                movetime_ms or settings.CHESSPAL_ENGINE_MAX_MOVETIME_MS, settings.CHESSPAL_ENGINE_MAX_MOVETIME_MS
+            ),
+            mate=min(mate, settings.CHESSPAL_ENGINE_MAX_DEPTH) if mate is not None else None,
+        )
+
+    def to_go_command(self) -> str:
+        """Return the UCI go command for these limits."""
+        parts = ["go"]
+        if self.movetime_ms is not None:
+            parts.append(f"movetime {self.movetime_ms}")
+        if self.depth is not None:
+            parts.append(f"depth {self.depth}")
+        if self.nodes is not None:
+            parts.append(f"nodes {self.nodes}")
+        if self.mate is not None:
+            parts.append(f"mate {self.mate}")
+        return " ".join(parts)
+
+    def response_timeout(self) -> float:
+        """Return how many seconds to wait for the engine's bestmove reply."""
+        if self.movetime_ms is None:
+            return 30.0
+        # Leave room for engine overhead beyond the requested move time
+        return self.movetime_ms / 1000 + 5.0
+
+
+class SearchResult(BaseModel):
+    """Outcome of a single engine search.
+
+    Scores are in centipawns (or moves to mate) from the side to move's point
+    of view, as reported by the engine's last principal variation.
+    """
+
+    best_move: str
+    ponder: Optional[str] = None
+    score_cp: Optional[int] = None
+    mate: Optional[int] = None
+    depth: Optional[int] = None
+    pv: List[str] = []
+    # Search effort reported with the last principal variation
+    nodes: Optional[int] = None
+    nps: Optional[int] = None
+    # Set when the search was stopped at a deadline before reaching its limits
+    partial: bool = False
+    # Every principal variation, best first, for searches with MultiPV above 1
+    candidates: List[CandidateMove] = []
@@ -0,0 +1,78 @@
+"""Polyglot opening book lookups answered before any engine search."""
+
+import random
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import chess
+import chess.polyglot
+
+from chesspal_mcp_engine.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+SELECTION_MODES = ("weighted", "best")
+
+
+class OpeningBook:
+    """A Polyglot `.bin` opening book.
+
+    The book file is memory-mapped by python-chess and entries are found by
+    binary search on the position's Zobrist key, so lookups are cheap enough
+    to try before every search.
+    """
+
+    def __init__(self, path: str | Path, selection: str = "weighted", rng: Optional[random.Random] = None):
+        """Open the book.
+
+        Args:
+            path: Path of the Polyglot book file
+            selection: "weighted" to pick moves proportionally to their weight,
+                "best" to always play the highest weighted move
+            rng: Random number generator for weighted selection
+
+        Raises:
+            ValueError: If the selection mode is unknown
+            OSError: If the book file cannot be opened
+        """
+        if selection not in SELECTION_MODES:
+            raise ValueError(f"Unknown book selection mode: {selection}")
+        self.path = Path(path)
+        self.selection = selection
+        self._rng = rng or random.Random()
+        self._reader: Optional[chess.polyglot.MemoryMappedReader] = chess.polyglot.open_reader(self.path)
+        self.hits = 0
+        self.misses = 0
+        logger.info("Opening book loaded from %s (%d entries)", self.path, len(self._reader))
+
+    def find_move(self, board: chess.Board) -> Optional[str]:
+        """Return a book move for the position in UCI format, or None if it is not in the book."""
+        if self._reader is None:
+            raise RuntimeError("Opening book is closed")
+        try:
+            if self.selection == "best":
+                entry = self._reader.find(board)
+            else:
+                entry = self._reader.weighted_choice(board, random=self._rng)
+        except IndexError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry.move.uci()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return book hit/miss counters."""
+        lookups = self.hits + self.misses
+        return {
+            "path": str(self.path),
+            "selection": self.selection,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+    def close(self) -> None:
+        """Close the book file."""
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
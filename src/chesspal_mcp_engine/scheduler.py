@@ -0,0 +1,137 @@
+"""Order requests waiting for an engine by priority class and client."""
+
+import asyncio
+from collections import OrderedDict, deque
+from enum import IntEnum
+from typing import Any, Deque, Dict, Hashable, Optional, Tuple
+
+from chesspal_mcp_engine.engine_wrapper import StockfishError
+
+
+class Priority(IntEnum):
+    """Priority classes of engine requests, served highest first (lowest value)."""
+
+    # Moves in games being played, where a person waits for the reply
+    LIVE = 0
+    # Interactive analysis of a single position
+    ANALYSIS = 1
+    # Whole-game analysis and batches of positions
+    BATCH = 2
+
+
+class QueueFullError(StockfishError):
+    """The engine queue is full; the request is rejected without waiting."""
+
+    pass
+
+
+class RequestScheduler:
+    """Queue of requests waiting for an engine.
+
+    A released engine goes to the highest priority class with waiters, so
+    background work never delays live games. Within a class, clients take
+    turns: the next waiter comes from the client that was served least
+    recently, and each client's own requests stay in arrival order, so one
+    client flooding the queue does not starve the others.
+    """
+
+    def __init__(self, max_queue: Optional[int] = None):
+        """Initialize an empty queue.
+
+        Args:
+            max_queue: Maximum number of waiting requests, None for no limit;
+                requests beyond it are rejected right away. A request only
+                counts the waiters of its own and higher priority classes, so
+                queued background work never causes a live request to be
+                rejected
+        """
+        self.max_queue = max_queue
+        # Per priority class, each client's waiters in arrival order, clients in turn order
+        self._queues: Dict[Priority, "OrderedDict[Hashable, Deque[asyncio.Future]]"] = {
+            priority: OrderedDict() for priority in Priority
+        }
+        self._entries: Dict[asyncio.Future, Tuple[Priority, Hashable]] = {}
+        self._waiting = dict.fromkeys(Priority, 0)
+        self.enqueued = dict.fromkeys(Priority, 0)
+        self.rejected = dict.fromkeys(Priority, 0)
+        self.served = dict.fromkeys(Priority, 0)
+        self._wait_time_total = dict.fromkeys(Priority, 0.0)
+        self._wait_time_max = dict.fromkeys(Priority, 0.0)
+
+    def enqueue(self, priority: Priority, client: Hashable = None) -> asyncio.Future:
+        """Add a waiter and return the future that receives its engine.
+
+        Args:
+            priority: Priority class of the request
+            client: Identifies the requesting client, None for anonymous requests
+
+        Raises:
+            QueueFullError: If max_queue requests of this or a higher priority are already waiting
+        """
+        if self.max_queue is not None:
+            ahead = sum(count for queued, count in self._waiting.items() if queued <= priority)
+            if ahead >= self.max_queue:
+                self.rejected[priority] += 1
+                raise QueueFullError(f"Engine queue is full ({self.max_queue} requests waiting)")
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._queues[priority].setdefault(client, deque()).append(waiter)
+        self._entries[waiter] = (priority, client)
+        self._waiting[priority] += 1
+        self.enqueued[priority] += 1
+        return waiter
+
+    def pop(self) -> Optional[asyncio.Future]:
+        """Remove and return the next waiter to serve, or None if nobody waits."""
+        for priority, queue in self._queues.items():
+            while queue:
+                client, waiters = next(iter(queue.items()))
+                waiter = waiters.popleft()
+                if waiters:
+                    # The client's next request waits for its next turn
+                    queue.move_to_end(client)
+                else:
+                    del queue[client]
+                del self._entries[waiter]
+                self._waiting[priority] -= 1
+                if not waiter.done():
+                    return waiter
+        return None
+
+    def discard(self, waiter: asyncio.Future) -> None:
+        """Remove a waiter that stopped waiting, if it is still queued."""
+        entry = self._entries.pop(waiter, None)
+        if entry is None:
+            return
+        priority, client = entry
+        self._waiting[priority] -= 1
+        queue = self._queues[priority]
+        waiters = queue[client]
+        waiters.remove(waiter)
+        if not waiters:
+            del queue[client]
+
+    def record_wait(self, priority: Priority, seconds: float) -> None:
+        """Record how long a request of `priority` waited for its engine, zero if one was idle."""
+        self.served[priority] += 1
+        self._wait_time_total[priority] += seconds
+        self._wait_time_max[priority] = max(self._wait_time_max[priority], seconds)
+
+    def __len__(self) -> int:
+        """Return the number of waiting requests."""
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return queue depth, admissions, rejections and wait times per priority class."""
+        stats = {}
+        for priority, queue in self._queues.items():
+            served = self.served[priority]
+            stats[priority.name.lower()] = {
+                "waiting": self._waiting[priority],
+                "enqueued": self.enqueued[priority],
+                "rejected": self.rejected[priority],
+                "served": served,
+                "wait_time_avg_ms": round(self._wait_time_total[priority] * 1000 / served, 3) if served else 0.0,
+                "wait_time_max_ms": round(self._wait_time_max[priority] * 1000, 3),
+            }
+        return stats
@@ -0,0 +1,132 @@
+"""Server-side game sessions keeping a board and engine affinity per game."""
+
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import chess
+
+from chesspal_mcp_engine.async_engine import AsyncStockfishEngine
+from chesspal_mcp_engine.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+class SessionError(Exception):
+    """Error looking up a game session."""
+
+    pass
+
+
+class GameSession:
+    """A game in progress: its board and the engine that last searched it."""
+
+    def __init__(self, session_id: str, board: chess.Board):
+        """Initialize the session.
+
+        Args:
+            session_id: Identifier handed to the client
+            board: Current position, including the moves played so far
+        """
+        self.session_id = session_id
+        self.board = board
+        # Engine whose hash table holds this game's positions, preferred for the next search
+        self.engine: Optional[AsyncStockfishEngine] = None
+        self.last_used = time.monotonic()
+
+    def search_position(self) -> Tuple[str, List[str]]:
+        """Return the FEN and moves to send with the UCI position command.
+
+        UCI has no incremental position update, so the shortest position
+        command that keeps repetition detection exact is used: the position
+        after the last capture or pawn move, followed by the moves since. It
+        is bounded by the fifty-move rule instead of growing with the game.
+        """
+        since_zeroing = min(self.board.halfmove_clock, len(self.board.move_stack))
+        root = self.board.copy()
+        for _ in range(since_zeroing):
+            root.pop()
+        moves = [move.uci() for move in self.board.move_stack[len(self.board.move_stack) - since_zeroing :]]
+        return root.fen(), moves
+
+
+class SessionManager:
+    """Bounded set of game sessions with idle eviction."""
+
+    def __init__(self, max_sessions: int, idle_timeout: float):
+        """Initialize the manager.
+
+        Args:
+            max_sessions: Maximum number of open sessions; the least recently used is evicted beyond that
+            idle_timeout: Seconds after which an unused session is evicted
+        """
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self._sessions: "OrderedDict[str, GameSession]" = OrderedDict()
+        self.opened = 0
+        self.evicted = 0
+
+    def open(self, board: chess.Board) -> GameSession:
+        """Open a session for a game starting from `board`."""
+        self.evict_idle()
+        while len(self._sessions) >= self.max_sessions:
+            session_id, _ = self._sessions.popitem(last=False)
+            self.evicted += 1
+            logger.info("Evicted least recently used session %s", session_id)
+
+        session = GameSession(uuid.uuid4().hex, board)
+        self._sessions[session.session_id] = session
+        self.opened += 1
+        return session
+
+    def get(self, session_id: str) -> GameSession:
+        """Return a session and mark it as used.
+
+        Raises:
+            SessionError: If the session does not exist or was evicted
+        """
+        self.evict_idle()
+        session = self._sessions.get(session_id)
+        if session is None:
+            raise SessionError(f"Unknown or expired session: {session_id}")
+        session.last_used = time.monotonic()
+        self._sessions.move_to_end(session_id)
+        return session
+
+    def close(self, session_id: str) -> None:
+        """Close a session.
+
+        Raises:
+            SessionError: If the session does not exist or was evicted
+        """
+        if self._sessions.pop(session_id, None) is None:
+            raise SessionError(f"Unknown or expired session: {session_id}")
+
+    def evict_idle(self) -> int:
+        """Evict sessions unused for longer than the idle timeout.
+
+        Returns:
+            The number of evicted sessions
+        """
+        deadline = time.monotonic() - self.idle_timeout
+        evicted = 0
+        # Sessions are kept in least recently used order
+        while self._sessions:
+            session_id, session = next(iter(self._sessions.items()))
+            if session.last_used > deadline:
+                break
+            del self._sessions[session_id]
+            evicted += 1
+        if evicted:
+            self.evicted += evicted
+            logger.info("Evicted %d idle sessions", evicted)
+        return evicted
+
+    def __len__(self) -> int:
+        """Return the number of open sessions."""
+        return len(self._sessions)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return session counts."""
+        return {"open": len(self._sessions), "opened": self.opened, "evicted": self.evicted}
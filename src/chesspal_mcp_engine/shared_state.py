@@ -0,0 +1,138 @@
+"""Engine state shared with the health server process through a memory-mapped file.
+
+The MCP process owns the engines, but the health server runs in a separate
+process. The MCP process periodically publishes a JSON snapshot of the
+engine state into a fixed-size memory-mapped file, and the health server
+reads the latest snapshot without locks and without touching the engines.
+
+Readers are kept consistent by a sequence counter in the file header (a
+seqlock): the writer makes it odd before changing the snapshot and even
+again afterwards, and a reader retries if the counter was odd or changed
+while it copied the snapshot.
+"""
+
+import json
+import mmap
+import os
+import struct
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from chesspal_mcp_engine.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Sequence counter and snapshot length, followed by the JSON snapshot
+_HEADER = struct.Struct("<QI")
+# Default file size, enough for the engine state and the rendered metrics
+DEFAULT_SIZE = 256 * 1024
+# Attempts to read a consistent snapshot before giving up
+_READ_ATTEMPTS = 100
+
+
+class SharedState:
+    """A single-writer, many-reader snapshot in a memory-mapped file."""
+
+    def __init__(self, path: str | Path, buffer: mmap.mmap, writable: bool):
+        """Wrap an open mapping; use create() or attach() instead.
+
+        Args:
+            path: Path of the mapped file
+            buffer: The mapping
+            writable: Whether this side publishes snapshots
+        """
+        self.path = Path(path)
+        self._buffer = buffer
+        self._writable = writable
+        self._sequence = 0
+
+    @classmethod
+    def create(cls, path: str | Path | None = None, size: int = DEFAULT_SIZE) -> "SharedState":
+        """Create the file and map it for publishing.
+
+        Args:
+            path: File to create, a new temporary file by default
+            size: Size of the file in bytes, bounding the snapshot size
+
+        Returns:
+            The writable shared state, holding no snapshot yet
+        """
+        if path is None:
+            fd, name = tempfile.mkstemp(prefix="chesspal-state-", suffix=".bin")
+            path = Path(name)
+        else:
+            fd = os.open(path, os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0o600)
+        try:
+            os.ftruncate(fd, size)
+            buffer = mmap.mmap(fd, size)
+        finally:
+            os.close(fd)
+        return cls(path, buffer, writable=True)
+
+    @classmethod
+    def attach(cls, path: str | Path) -> "SharedState":
+        """Map an existing file read-only.
+
+        Args:
+            path: File created by the publishing process
+        """
+        with open(path, "rb") as handle:
+            buffer = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(path, buffer, writable=False)
+
+    def publish(self, snapshot: Dict[str, Any]) -> bool:
+        """Replace the published snapshot.
+
+        Args:
+            snapshot: JSON-serializable state
+
+        Returns:
+            False if the snapshot does not fit the file and was not published
+        """
+        if not self._writable:
+            raise PermissionError("Shared state is attached read-only")
+        payload = json.dumps(snapshot, separators=(",", ":")).encode()
+        if _HEADER.size + len(payload) > len(self._buffer):
+            logger.warning("Shared state snapshot of %d bytes does not fit %s", len(payload), self.path)
+            return False
+
+        # Odd while the snapshot is being written
+        self._sequence += 1
+        _HEADER.pack_into(self._buffer, 0, self._sequence, 0)
+        self._buffer[_HEADER.size : _HEADER.size + len(payload)] = payload
+        self._sequence += 1
+        _HEADER.pack_into(self._buffer, 0, self._sequence, len(payload))
+        return True
+
+    def read(self) -> Optional[Dict[str, Any]]:
+        """Return the latest snapshot, or None if none was published yet or no consistent copy was obtained."""
+        for _ in range(_READ_ATTEMPTS):
+            sequence, length = _HEADER.unpack_from(self._buffer, 0)
+            if sequence % 2:
+                # A write is in progress
+                time.sleep(0)
+                continue
+            if sequence == 0:
+                return None
+            payload = self._buffer[_HEADER.size : _HEADER.size + length]
+            if _HEADER.unpack_from(self._buffer, 0)[0] != sequence:
+                continue
+            try:
+                snapshot: Dict[str, Any] = json.loads(payload)
+            except ValueError:
+                continue
+            return snapshot
+        logger.warning("No consistent shared state snapshot in %s", self.path)
+        return None
+
+    def close(self, unlink: bool = False) -> None:
+        """Unmap the file.
+
+        Args:
+            unlink: Also delete the file; only the creating process should
+        """
+        self._buffer.close()
+        if unlink:
+            self.path.unlink(missing_ok=True)
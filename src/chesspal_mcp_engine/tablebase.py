@@ -0,0 +1,108 @@
+"""Syzygy endgame tablebase probing answered before any engine search."""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional, Tuple
+
+import chess
+import chess.syzygy
+
+from chesspal_mcp_engine.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+class SyzygyTablebase:
+    """Local Syzygy WDL/DTZ tables.
+
+    Table files are opened lazily by python-chess, which keeps at most
+    `max_open_tables` file descriptors and closes the least recently used
+    ones beyond that.
+
+    A probe reads the tables for every legal move, which is disk I/O on a
+    cold page cache, so async callers use find_move_async(), which probes on
+    the tablebase's own worker thread instead of the event loop.
+    """
+
+    def __init__(self, path: str, max_pieces: int = 6, max_open_tables: int = 128):
+        """Open the tablebase directories.
+
+        Args:
+            path: Directory of the table files, several separated by os.pathsep
+            max_pieces: Largest piece count (kings included) to probe
+            max_open_tables: Maximum number of table files kept open
+        """
+        self.path = path
+        self.max_pieces = max_pieces
+        self._tablebase: Optional[chess.syzygy.Tablebase] = chess.syzygy.open_tablebase(path, max_fds=max_open_tables)
+        self.hits = 0
+        self.misses = 0
+        # One worker, so the tables are only ever probed by one thread at a time
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tablebase")
+        logger.info("Syzygy tablebase opened at %s (up to %d pieces)", path, max_pieces)
+
+    def find_move(self, board: chess.Board) -> Optional[str]:
+        """Return the tablebase-optimal move in UCI format, or None if the position cannot be probed.
+
+        Wins are converted with the shortest distance to zeroing, losses are
+        prolonged with the longest, and draws keep the draw.
+        """
+        if self._tablebase is None:
+            raise RuntimeError("Tablebase is closed")
+        if chess.popcount(board.occupied) > self.max_pieces or board.is_game_over():
+            return None
+
+        best_move: Optional[chess.Move] = None
+        best_key: Optional[Tuple[int, int]] = None
+        try:
+            for move in board.legal_moves:
+                board.push(move)
+                try:
+                    if board.is_checkmate():
+                        best_move = move
+                        break
+                    # Both values are from the opponent's point of view after the move
+                    key = (-self._tablebase.probe_wdl(board), self._tablebase.probe_dtz(board))
+                finally:
+                    board.pop()
+                if best_key is None or key > best_key:
+                    best_move, best_key = move, key
+        except KeyError as e:
+            # Missing table, or a position tables do not cover (e.g. castling rights)
+            logger.debug("Tablebase probe failed: %s", e)
+            self.misses += 1
+            return None
+
+        if best_move is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return best_move.uci()
+
+    async def find_move_async(self, board: chess.Board) -> Optional[str]:
+        """Find a move like find_move(), without blocking the event loop.
+
+        Positions with too many pieces are turned away without a thread hop.
+        The board is copied, so the caller may keep using it meanwhile.
+        """
+        if chess.popcount(board.occupied) > self.max_pieces:
+            return None
+        return await asyncio.get_running_loop().run_in_executor(self._executor, self.find_move, board.copy())
+
+    def stats(self) -> Dict[str, Any]:
+        """Return tablebase hit/miss counters."""
+        lookups = self.hits + self.misses
+        return {
+            "path": self.path,
+            "max_pieces": self.max_pieces,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+    def close(self) -> None:
+        """Close all open table files after pending probes finish."""
+        self._executor.shutdown(wait=True)
+        if self._tablebase is not None:
+            self._tablebase.close()
+            self._tablebase = None
@@ -0,0 +1,210 @@
+"""Parse UCI engine output: info lines and the final bestmove line.
+
+A long search emits thousands of info lines, most of them currmove updates
+or superseded depths. The parser rejects unscored lines with two substring
+checks before tokenizing anything, splits only the part of a line before
+its PV, and InfoCollector keeps just the latest raw line per multipv slot,
+so a line is only fully parsed if it is still the latest when the search
+ends.
+"""
+
+import logging
+from typing import Any, Dict, List, Optional
+
+from chesspal_mcp_engine.engine_wrapper import StockfishError
+from chesspal_mcp_engine.models import CandidateMove, SearchResult
+
+# Initialize logger
+logger = logging.getLogger(__name__)
+
+# Integer fields and the attribute each one is stored in
+_INT_FIELDS = {
+    "depth": "depth",
+    "seldepth": "seldepth",
+    "multipv": "multipv",
+    "nodes": "nodes",
+    "nps": "nps",
+    "hashfull": "hashfull",
+    "tbhits": "tbhits",
+    "time": "time_ms",
+}
+_BOUNDS = ("lowerbound", "upperbound")
+_MULTIPV = " multipv "
+
+
+class SearchInfo:
+    """The fields of one scored info line.
+
+    Scores are in centipawns (or moves to mate) from the side to move's
+    point of view. `bound` is "lowerbound" or "upperbound" when the score is
+    only a bound, as reported during aspiration search re-searches.
+    """
+
+    __slots__ = (
+        "depth",
+        "seldepth",
+        "multipv",
+        "score_cp",
+        "mate",
+        "bound",
+        "nodes",
+        "nps",
+        "hashfull",
+        "tbhits",
+        "time_ms",
+        "pv",
+    )
+
+    def __init__(self):
+        """Initialize with no fields reported."""
+        self.depth: Optional[int] = None
+        self.seldepth: Optional[int] = None
+        self.multipv = 1
+        self.score_cp: Optional[int] = None
+        self.mate: Optional[int] = None
+        self.bound: Optional[str] = None
+        self.nodes: Optional[int] = None
+        self.nps: Optional[int] = None
+        self.hashfull: Optional[int] = None
+        self.tbhits: Optional[int] = None
+        self.time_ms: Optional[int] = None
+        self.pv: List[str] = []
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the reported fields, omitting those the engine did not send."""
+        return {
+            name: value
+            for name in self.__slots__
+            if (value := getattr(self, name)) is not None and (name != "pv" or value)
+        }
+
+
+def parse_info(line: str) -> Optional[SearchInfo]:
+    """Parse a scored info line.
+
+    Args:
+        line: Engine output line
+
+    Returns:
+        The parsed fields, or None for lines without a score such as
+        currmove updates and info strings, and for malformed lines
+    """
+    if not line.startswith("info ") or " score " not in line or line.startswith("info string"):
+        return None
+
+    head, _, pv = line.partition(" pv ")
+    tokens = head.split()
+    info = SearchInfo()
+    count = len(tokens)
+    i = 1
+    try:
+        while i < count:
+            token = tokens[i]
+            field = _INT_FIELDS.get(token)
+            if field is not None:
+                setattr(info, field, int(tokens[i + 1]))
+                i += 2
+            elif token == "score":
+                if tokens[i + 1] == "cp":
+                    info.score_cp = int(tokens[i + 2])
+                else:
+                    info.mate = int(tokens[i + 2])
+                i += 3
+                if i < count and tokens[i] in _BOUNDS:
+                    info.bound = tokens[i]
+                    i += 1
+            elif token == "string":
+                # Free text up to the end of the line
+                break
+            else:
+                # Unreported fields (currmove, cpuload, ...) and their values
+                i += 1
+    except (IndexError, ValueError):
+        logger.debug(f"Ignoring malformed info line: {line}")
+        return None
+    if pv:
+        info.pv = pv.split()
+    return info
+
+
+class InfoCollector:
+    """Keep the latest scored info line of every multipv slot.
+
+    Lines are stored unparsed; feed() only locates the multipv number, so
+    superseded lines cost one dictionary store each.
+    """
+
+    __slots__ = ("_latest",)
+
+    def __init__(self):
+        """Initialize with no lines collected."""
+        self._latest: Dict[str, str] = {}
+
+    def feed(self, line: str) -> None:
+        """Record `line` if it is a scored info line."""
+        if not line.startswith("info ") or " score " not in line or line.startswith("info string"):
+            return
+        start = line.find(_MULTIPV)
+        if start < 0:
+            self._latest["1"] = line
+            return
+        start += len(_MULTIPV)
+        end = line.find(" ", start)
+        self._latest[line[start:end] if end >= 0 else line[start:]] = line
+
+    def principal(self) -> Optional[SearchInfo]:
+        """Return the latest line of the first principal variation, if any."""
+        line = self._latest.get("1")
+        return parse_info(line) if line is not None else None
+
+    def lines(self) -> List[SearchInfo]:
+        """Return the latest line of every principal variation, best first."""
+        infos = [info for info in map(parse_info, self._latest.values()) if info is not None]
+        infos.sort(key=lambda info: info.multipv)
+        return infos
+
+    def __len__(self) -> int:
+        """Return the number of multipv slots collected."""
+        return len(self._latest)
+
+
+def parse_search_result(bestmove_line: str, collector: InfoCollector, multipv: int = 1) -> SearchResult:
+    """Build a search result from the bestmove line and the collected info lines.
+
+    Args:
+        bestmove_line: The engine's final bestmove line
+        collector: Info lines of the search
+        multipv: Number of principal variations searched; the latest line of
+            each is returned as a candidate, best first
+
+    Raises:
+        StockfishError: If the bestmove line is malformed
+    """
+    parts = bestmove_line.split()
+    if len(parts) < 2 or parts[0] != "bestmove":
+        logger.error(f"Malformed 'bestmove' line in engine responses: {bestmove_line}")
+        raise StockfishError("No best move found in engine response")
+    result = SearchResult(best_move=parts[1], ponder=parts[3] if len(parts) >= 4 and parts[2] == "ponder" else None)
+
+    principal = collector.principal()
+    if principal is not None:
+        result.score_cp = principal.score_cp
+        result.mate = principal.mate
+        result.depth = principal.depth
+        result.pv = principal.pv
+        result.nodes = principal.nodes
+        result.nps = principal.nps
+
+    result.candidates = [
+        CandidateMove(
+            rank=info.multipv,
+            move_uci=info.pv[0],
+            score_cp=info.score_cp,
+            mate=info.mate,
+            depth=info.depth,
+            pv=info.pv,
+        )
+        for info in collector.lines()[:multipv]
+        if info.pv
+    ]
+    return result
@@ -1,12 +1,18 @@
 """Configure pytest for the test suite."""
 
+import asyncio
 import os
+import struct
 import warnings
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
+import chess
+import chess.polyglot
 import pytest
 
+from chesspal_mcp_engine.engine_pool import EnginePool
+
 
 @pytest.fixture(autouse=True)
 def setup_test_env():
@@ -70,6 +76,161 @@ def mock_select():
         yield mock_select
 
 
+@pytest.fixture
+def make_engine_pool():
+    """Build a started EnginePool around pre-made (usually mocked) engines."""
+
+    async def _make(*engines):
+        remaining = iter(engines)
+        pool = EnginePool(
+            size=len(engines),
+            threads=1,
+            hash_mb=16,
+            engine_factory=lambda **kwargs: next(remaining),
+        )
+        await pool.start()
+        return pool
+
+    return _make
+
+
+def _encode_polyglot_move(uci: str) -> int:
+    """Encode a move in Polyglot's from/to square format."""
+    move = chess.Move.from_uci(uci)
+    return (
+        chess.square_rank(move.from_square) << 9
+        | chess.square_file(move.from_square) << 6
+        | chess.square_rank(move.to_square) << 3
+        | chess.square_file(move.to_square)
+    )
+
+
+@pytest.fixture
+def write_polyglot_book(tmp_path):
+    """Return a function writing a Polyglot book from (board, uci move, weight) entries."""
+
+    def _write(entries, name="book.bin"):
+        records = sorted(
+            (chess.polyglot.zobrist_hash(board), _encode_polyglot_move(move), weight) for board, move, weight in entries
+        )
+        path = tmp_path / name
+        with open(path, "wb") as f:
+            for key, move, weight in records:
+                f.write(struct.pack(">QHHI", key, move, weight, 0))
+        return path
+
+    return _write
+
+
+class FakeUCIStdin:
+    """Fake stdin of an engine process that answers UCI commands."""
+
+    def __init__(self, process):
+        """Initialize with the owning fake process."""
+        self.process = process
+
+    def write(self, data):
+        """Handle every command written to the engine."""
+        for command in data.decode().splitlines():
+            self.process.handle(command)
+
+    async def drain(self):
+        """Mock drain operation."""
+        pass
+
+    def close(self):
+        """Mock close operation."""
+        pass
+
+
+class FakeUCIProcess:
+    """Fake asyncio engine process speaking a minimal subset of UCI.
+
+    Each `go` command emits `search_lines`; if `search_lines` is None the
+    search only ends with a bestmove once `stop` is received.
+    """
+
+    def __init__(self, search_lines=None, bestmove="bestmove e2e4 ponder e7e5"):
+        """Initialize the fake process with scripted search output."""
+        self.stdout = asyncio.StreamReader()
+        self.stdin = FakeUCIStdin(self)
+        self.returncode = None
+        self.commands = []
+        self.search_lines = search_lines
+        self.bestmove = bestmove
+        self.searching = False
+
+    def emit(self, *lines):
+        """Write lines to the fake engine's stdout."""
+        for line in lines:
+            self.stdout.feed_data(f"{line}\n".encode())
+
+    def handle(self, command):
+        """Answer a single UCI command."""
+        self.commands.append(command)
+        if command == "uci":
+            self.emit("id name Stockfish 17.1", "uciok")
+        elif command == "isready":
+            self.emit("readyok")
+        elif command.startswith("go"):
+            if self.search_lines is None:
+                self.searching = True
+            else:
+                self.emit(*self.search_lines)
+        elif command == "stop" and self.searching:
+            self.searching = False
+            self.emit(self.bestmove)
+        elif command == "quit":
+            self.exit(0)
+
+    def exit(self, returncode):
+        """Simulate the engine process exiting."""
+        if self.returncode is None:
+            self.returncode = returncode
+            self.stdout.feed_eof()
+
+    async def wait(self):
+        """Wait for the fake process to exit."""
+        return self.returncode
+
+    def kill(self):
+        """Mock kill operation."""
+        self.exit(-9)
+
+    def terminate(self):
+        """Mock terminate operation."""
+        self.exit(-15)
+
+
+@pytest.fixture
+def fake_uci_engine():
+    """Patch asyncio subprocess creation to start FakeUCIProcess engines.
+
+    Returns a dict whose "options" are passed to each new FakeUCIProcess and
+    whose "processes" list collects every process created.
+    """
+    state = {
+        "options": {
+            "search_lines": [
+                "info depth 10 seldepth 15 multipv 1 score cp 38 nodes 20 nps 20000 tbhits 0 time 1 pv e2e4 e7e5",
+                "bestmove e2e4 ponder e7e5",
+            ]
+        },
+        "processes": [],
+    }
+
+    async def create_subprocess_exec(*args, **kwargs):
+        process = FakeUCIProcess(**state["options"])
+        state["processes"].append(process)
+        return process
+
+    with (
+        patch("chesspal_mcp_engine.async_engine._get_engine_path", return_value=Path("/mock/stockfish")),
+        patch("asyncio.create_subprocess_exec", create_subprocess_exec),
+    ):
+        yield state
+
+
 # Filter out specific deprecation warnings
 def pytest_configure(config):
     """Configure pytest."""
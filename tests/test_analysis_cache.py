@@ -0,0 +1,118 @@
+"""Tests for the persistent analysis cache."""
+
+import sqlite3
+
+import pytest
+
+from chesspal_mcp_engine.analysis_cache import AnalysisCache
+from chesspal_mcp_engine.models import SearchLimits, SearchResult
+
+LIMITS = SearchLimits(depth=10, movetime_ms=1000)
+RESULT = SearchResult(best_move="e2e4", ponder="e7e5", score_cp=35, depth=10, pv=["e2e4", "e7e5", "g1f3"])
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """Provide an analysis cache in a temporary directory."""
+    cache = AnalysisCache(tmp_path / "analysis.db", max_entries=3, evict_interval=1)
+    yield cache
+    cache.close()
+
+
+def test_put_and_get(cache):
+    """Test that a stored result is returned for the same position and limits."""
+    assert cache.get(123, LIMITS) is None
+    cache.put(123, LIMITS, RESULT)
+
+    assert cache.get(123, LIMITS) == RESULT
+    assert cache.get(123, SearchLimits(depth=12)) is None
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 2
+
+
+def test_unsigned_zobrist_keys(cache):
+    """Test that 64-bit Zobrist hashes above the signed range are stored."""
+    key = (1 << 64) - 1
+    cache.put(key, LIMITS, RESULT)
+    assert cache.get(key, LIMITS) == RESULT
+    assert cache.get(key - (1 << 64), LIMITS) == RESULT
+
+
+def test_persists_across_instances(cache, tmp_path):
+    """Test that a second cache on the same file sees stored results."""
+    cache.put(1, LIMITS, RESULT)
+    other = AnalysisCache(tmp_path / "analysis.db", max_entries=3)
+    try:
+        assert other.get(1, LIMITS) == RESULT
+    finally:
+        other.close()
+
+
+def test_wal_mode(cache, tmp_path):
+    """Test that the database is in WAL mode for concurrent readers."""
+    conn = sqlite3.connect(str(tmp_path / "analysis.db"))
+    try:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    finally:
+        conn.close()
+
+
+def test_size_based_eviction(cache):
+    """Test that the oldest entries are evicted beyond the size limit."""
+    for key in range(5):
+        cache.put(key, LIMITS, RESULT)
+
+    assert len(cache) == 3
+    assert cache.get(0, LIMITS) is None
+    assert cache.get(4, LIMITS) == RESULT
+    assert cache.stats()["evictions"] == 2
+
+
+def test_replacing_an_entry_does_not_evict(cache):
+    """Test that rewriting stored positions does not count towards the size limit."""
+    for key in range(3):
+        cache.put(key, LIMITS, RESULT)
+    for _ in range(3):
+        cache.put(2, LIMITS, RESULT)
+
+    assert len(cache) == 3
+    assert cache.get(0, LIMITS) == RESULT
+    assert cache.stats()["evictions"] == 0
+
+
+def test_eviction_counts_entries_of_other_processes(cache, tmp_path):
+    """Test that caches sharing a file keep the table within its limit between them."""
+    other = AnalysisCache(tmp_path / "analysis.db", max_entries=3, evict_interval=1)
+    try:
+        for key in range(0, 8, 2):
+            cache.put(key, LIMITS, RESULT)
+            other.put(key + 1, LIMITS, RESULT)
+        assert len(other) == 3
+        assert other.get(0, LIMITS) is None
+        assert cache.stats()["evictions"] + other.stats()["evictions"] == 5
+    finally:
+        other.close()
+
+
+@pytest.mark.asyncio
+async def test_async_access(cache):
+    """Test that the async methods store and look up results off the event loop."""
+    assert await cache.get_async(7, LIMITS) is None
+    await cache.put_async(7, LIMITS, RESULT)
+
+    assert await cache.get_async(7, LIMITS) == RESULT
+    assert cache.stats()["hits"] == 1
+
+
+def test_closed_cache_errors_are_misses(cache):
+    """Test that database errors are treated as misses."""
+    cache._conn.close()
+    assert cache.get(1, LIMITS) is None
+    cache.put(1, LIMITS, RESULT)
+
+
+def test_invalid_size(tmp_path):
+    """Test that the cache needs room for at least one entry."""
+    with pytest.raises(ValueError):
+        AnalysisCache(tmp_path / "analysis.db", max_entries=0)
@@ -0,0 +1,377 @@
+"""Test suite for the asyncio Stockfish driver."""
+
+import asyncio
+import time
+from unittest.mock import patch
+
+import pytest
+
+from chesspal_mcp_engine.async_engine import AsyncStockfishEngine
+from chesspal_mcp_engine.engine_wrapper import StockfishError
+from chesspal_mcp_engine.models import CandidateMove, SearchLimits, SearchResult
+from chesspal_mcp_engine.shutdown import EngineRegistry
+
+STARTING_FEN = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
+
+
+@pytest.fixture
+async def engine(fake_uci_engine):
+    """Provide a started engine backed by a fake UCI process."""
+    engine = AsyncStockfishEngine(threads=2, hash_mb=64)
+    await engine.start()
+    yield engine
+    engine.stop()
+
+
+@pytest.mark.asyncio
+async def test_start_handshake(engine, fake_uci_engine):
+    """Test that start() performs the UCI handshake with the configured options."""
+    process = fake_uci_engine["processes"][0]
+    assert process.commands == [
+        "uci",
+        "setoption name Hash value 64",
+        "setoption name Threads value 2",
+        "isready",
+    ]
+    assert engine.is_alive()
+    assert engine in EngineRegistry._engines
+
+
+@pytest.mark.asyncio
+async def test_start_sets_syzygy_path(fake_uci_engine):
+    """Test that a configured tablebase directory is passed to the engine."""
+    engine = AsyncStockfishEngine(threads=1, hash_mb=16)
+    with patch("chesspal_mcp_engine.async_engine.settings.CHESSPAL_SYZYGY_PATH", "/tables"):
+        await engine.start()
+    try:
+        commands = fake_uci_engine["processes"][0].commands
+        assert "setoption name SyzygyPath value /tables" in commands
+        assert "setoption name SyzygyProbeLimit value 6" in commands
+    finally:
+        engine.stop()
+
+
+@pytest.mark.asyncio
+async def test_get_best_move(engine, fake_uci_engine):
+    """Test getting the best move from the engine."""
+    best_move = await engine.get_best_move(STARTING_FEN)
+    assert best_move == "e2e4"
+    process = fake_uci_engine["processes"][0]
+    assert f"position fen {STARTING_FEN}" in process.commands
+    assert any(command.startswith("go movetime") for command in process.commands)
+
+
+@pytest.mark.asyncio
+async def test_search_result(engine, fake_uci_engine):
+    """Test that search() reports the score, depth, nodes and PV of the final info line."""
+    process = fake_uci_engine["processes"][0]
+    process.search_lines = [
+        "info depth 1 seldepth 1 multipv 1 score cp 10 nodes 20 pv d2d4",
+        "info depth 12 seldepth 16 multipv 1 score cp 31 nodes 9000 pv e2e4 e7e5 g1f3",
+        "info string NNUE evaluation using nn-1c0000000000.nnue",
+        "bestmove e2e4 ponder e7e5",
+    ]
+    result = await engine.search(STARTING_FEN)
+    pv = ["e2e4", "e7e5", "g1f3"]
+    assert result == SearchResult(
+        best_move="e2e4",
+        ponder="e7e5",
+        score_cp=31,
+        depth=12,
+        nodes=9000,
+        pv=pv,
+        candidates=[CandidateMove(rank=1, move_uci="e2e4", score_cp=31, depth=12, pv=pv)],
+    )
+
+
+@pytest.mark.asyncio
+async def test_search_streams_info(engine, fake_uci_engine):
+    """Test that scored info lines are parsed and reported while the search runs."""
+    process = fake_uci_engine["processes"][0]
+    process.search_lines = [
+        "info depth 1 seldepth 1 multipv 1 score cp 10 nodes 20 nps 2000 time 10 pv d2d4",
+        "info depth 2 currmove e2e4 currmovenumber 1",
+        "info depth 2 seldepth 3 multipv 1 score mate 3 lowerbound nodes 80 nps 4000 time 20 pv e2e4 e7e5",
+        "info string NNUE evaluation using nn-1c0000000000.nnue",
+        "bestmove e2e4",
+    ]
+    infos = []
+
+    async def on_info(info):
+        infos.append(info)
+
+    await engine.search(STARTING_FEN, on_info=on_info)
+
+    assert infos == [
+        {
+            "depth": 1,
+            "seldepth": 1,
+            "multipv": 1,
+            "score_cp": 10,
+            "nodes": 20,
+            "nps": 2000,
+            "time_ms": 10,
+            "pv": ["d2d4"],
+        },
+        {
+            "depth": 2,
+            "seldepth": 3,
+            "multipv": 1,
+            "mate": 3,
+            "bound": "lowerbound",
+            "nodes": 80,
+            "nps": 4000,
+            "time_ms": 20,
+            "pv": ["e2e4", "e7e5"],
+        },
+    ]
+
+
+@pytest.mark.asyncio
+async def test_search_multipv_candidates(engine, fake_uci_engine):
+    """Test that a MultiPV search returns the latest line of every variation, best first."""
+    process = fake_uci_engine["processes"][0]
+    process.search_lines = [
+        "info depth 1 seldepth 1 multipv 1 score cp 20 nodes 20 pv d2d4",
+        "info depth 1 seldepth 1 multipv 2 score cp 10 nodes 40 pv e2e4",
+        "info depth 2 seldepth 2 multipv 1 score cp 30 nodes 90 pv e2e4 e7e5",
+        "info depth 2 seldepth 2 multipv 2 score cp 25 nodes 120 pv d2d4 d7d5",
+        "bestmove e2e4 ponder e7e5",
+    ]
+
+    result = await engine.search(STARTING_FEN, multipv=2)
+    await engine.search(STARTING_FEN, multipv=2)
+
+    assert result.score_cp == 30
+    assert [(c.rank, c.move_uci, c.score_cp, c.depth) for c in result.candidates] == [
+        (1, "e2e4", 30, 2),
+        (2, "d2d4", 25, 2),
+    ]
+    assert result.candidates[1].pv == ["d2d4", "d7d5"]
+    assert process.commands.count("setoption name MultiPV value 2") == 1
+
+    single = await engine.search(STARTING_FEN)
+    assert [(c.rank, c.move_uci) for c in single.candidates] == [(1, "e2e4")]
+    assert "setoption name MultiPV value 1" in process.commands
+
+
+@pytest.mark.asyncio
+async def test_search_buffers_constant_lines(engine, fake_uci_engine):
+    """Test that a long search only keeps the latest info line instead of its whole output."""
+    process = fake_uci_engine["processes"][0]
+    process.search_lines = [
+        f"info depth {depth} seldepth {depth} multipv 1 score cp {depth} nodes {depth * 100} pv e2e4"
+        for depth in range(1, 2001)
+    ] + ["bestmove e2e4"]
+    retained = []
+    read_response = engine._read_response
+
+    async def spy(*args, **kwargs):
+        responses = await read_response(*args, **kwargs)
+        retained.append(len(responses))
+        return responses
+
+    with patch.object(engine, "_read_response", spy):
+        result = await engine.search(STARTING_FEN)
+
+    assert result.depth == 2000
+    assert retained == [1]
+
+
+@pytest.mark.asyncio
+async def test_search_result_mate(engine, fake_uci_engine):
+    """Test that mate scores are reported separately from centipawns."""
+    process = fake_uci_engine["processes"][0]
+    process.search_lines = ["info depth 5 score mate -2 pv g1f3", "bestmove g1f3"]
+    result = await engine.search(STARTING_FEN)
+    assert result.mate == -2
+    assert result.score_cp is None
+    assert result.ponder is None
+
+
+@pytest.mark.asyncio
+async def test_get_best_move_with_history(engine, fake_uci_engine):
+    """Test that the move history is appended to the position command."""
+    await engine.get_best_move(STARTING_FEN, ["e2e4", "e7e5"])
+    process = fake_uci_engine["processes"][0]
+    assert f"position fen {STARTING_FEN} moves e2e4 e7e5" in process.commands
+
+
+@pytest.mark.asyncio
+async def test_get_best_move_search_limits(engine, fake_uci_engine):
+    """Test that search limits are sent in the go command."""
+    await engine.get_best_move(STARTING_FEN, limits=SearchLimits(depth=8, nodes=1000))
+    process = fake_uci_engine["processes"][0]
+    assert "go depth 8 nodes 1000" in process.commands
+
+
+@pytest.mark.asyncio
+async def test_concurrent_engines(fake_uci_engine):
+    """Test that one event loop drives several engine processes at once."""
+    engines = [AsyncStockfishEngine(threads=1, hash_mb=16) for _ in range(4)]
+    await asyncio.gather(*(engine.start() for engine in engines))
+    try:
+        moves = await asyncio.gather(*(engine.get_best_move(STARTING_FEN) for engine in engines))
+        assert moves == ["e2e4"] * 4
+        assert len(fake_uci_engine["processes"]) == 4
+    finally:
+        for engine in engines:
+            engine.stop()
+
+
+@pytest.mark.asyncio
+async def test_get_best_move_timeout(engine, fake_uci_engine):
+    """Test that a search that never finishes times out and the engine recovers."""
+    process = fake_uci_engine["processes"][0]
+    process.search_lines = None  # Only answer bestmove after stop
+
+    engine._send_command("go infinite")
+    engine._needs_sync = True
+    with pytest.raises(StockfishError, match="Timeout waiting for response"):
+        await engine._read_response(until="bestmove", timeout=0.05)
+
+    # The abandoned search is stopped and its bestmove discarded
+    process.search_lines = ["bestmove d2d4"]
+    assert await engine.get_best_move(STARTING_FEN) == "d2d4"
+    assert "stop" in process.commands
+
+
+@pytest.mark.asyncio
+async def test_cancelled_search_is_resynchronized(engine, fake_uci_engine):
+    """Test that a cancelled search does not leak its bestmove into the next one."""
+    process = fake_uci_engine["processes"][0]
+    process.search_lines = None
+
+    task = asyncio.create_task(engine.get_best_move(STARTING_FEN))
+    await asyncio.sleep(0.01)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    # The engine is stopped right away rather than searching on for nobody
+    assert process.commands[-1] == "stop"
+    assert not process.searching
+
+    process.search_lines = ["bestmove g1f3"]
+    assert await engine.get_best_move(STARTING_FEN) == "g1f3"
+
+
+@pytest.mark.asyncio
+async def test_search_deadline_returns_partial_result(engine, fake_uci_engine):
+    """Test that a search reaching its deadline is stopped and returns the best move so far."""
+    process = fake_uci_engine["processes"][0]
+    process.search_lines = None
+    process.bestmove = "bestmove d2d4"
+
+    result = await engine.search(STARTING_FEN, deadline=time.monotonic() + 0.02)
+
+    assert result.best_move == "d2d4"
+    assert result.partial
+    assert "stop" in process.commands
+
+
+@pytest.mark.asyncio
+async def test_process_exit_is_reported(engine, fake_uci_engine):
+    """Test that an engine crash surfaces as a StockfishError."""
+    process = fake_uci_engine["processes"][0]
+    process.search_lines = []
+    task = asyncio.create_task(engine.get_best_move(STARTING_FEN))
+    await asyncio.sleep(0.01)
+    process.exit(1)
+
+    with pytest.raises(StockfishError, match="terminated unexpectedly"):
+        await task
+    assert not engine.is_alive()
+    with pytest.raises(StockfishError, match="not initialized or not running"):
+        await engine.get_best_move(STARTING_FEN)
+
+
+@pytest.mark.asyncio
+async def test_is_ready(engine):
+    """Test the isready round trip."""
+    assert await engine.is_ready()
+
+
+@pytest.mark.asyncio
+async def test_is_ready_during_search_does_not_touch_engine(engine, fake_uci_engine):
+    """Test that a readiness probe during a search sends nothing and leaves the search intact."""
+    process = fake_uci_engine["processes"][0]
+    process.search_lines = None
+    process.bestmove = "bestmove d2d4"
+
+    task = asyncio.create_task(engine.search(STARTING_FEN, deadline=time.monotonic() + 0.05))
+    await asyncio.sleep(0.01)
+    sent = len(process.commands)
+    assert await engine.is_ready()
+    assert len(process.commands) == sent
+
+    assert (await task).best_move == "d2d4"
+
+
+@pytest.mark.asyncio
+async def test_concurrent_searches_take_turns(engine, fake_uci_engine):
+    """Test that a second search on the same engine waits for the first one's bestmove."""
+    process = fake_uci_engine["processes"][0]
+    process.search_lines = None
+    process.bestmove = "bestmove d2d4"
+    other_fen = "rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq - 0 1"
+
+    first, second = await asyncio.gather(
+        engine.search(STARTING_FEN, deadline=time.monotonic() + 0.02),
+        engine.search(other_fen, deadline=time.monotonic() + 0.04),
+    )
+
+    assert first.best_move == second.best_move == "d2d4"
+    commands = process.commands
+    assert commands.index(f"position fen {other_fen}") > commands.index("stop")
+
+
+@pytest.mark.asyncio
+async def test_search_starting_during_is_ready(engine):
+    """Test that a search started while isready is pending does not read the readyok."""
+    ready, best_move = await asyncio.gather(engine.is_ready(), engine.get_best_move(STARTING_FEN))
+    assert ready
+    assert best_move == "e2e4"
+    assert await engine.get_best_move(STARTING_FEN) == "e2e4"
+
+
+@pytest.mark.asyncio
+async def test_heartbeat_tracks_engine_output(engine):
+    """Test that every line read by the reader task refreshes the heartbeat."""
+    before = engine.last_heartbeat
+    assert before is not None
+    await engine.is_ready()
+    assert engine.last_heartbeat >= before
+    assert 0 <= engine.heartbeat_age() < 5
+
+
+@pytest.mark.asyncio
+async def test_start_failure(fake_uci_engine):
+    """Test that a failed handshake stops the engine and raises StockfishError."""
+    engine = AsyncStockfishEngine()
+    with patch.object(AsyncStockfishEngine, "_send_command", side_effect=StockfishError("Broken pipe")):
+        with pytest.raises(StockfishError, match="Failed to initialize engine: Broken pipe"):
+            await engine.start()
+    assert engine.process is None
+    assert fake_uci_engine["processes"][0].returncode == -9
+    assert engine not in EngineRegistry._engines
+
+
+@pytest.mark.asyncio
+async def test_close(engine, fake_uci_engine):
+    """Test graceful shutdown sends quit and unregisters the engine."""
+    process = fake_uci_engine["processes"][0]
+    await engine.close()
+    assert process.commands[-1] == "quit"
+    assert process.returncode == 0
+    assert engine.process is None
+    assert engine not in EngineRegistry._engines
+
+
+@pytest.mark.asyncio
+async def test_stop(engine, fake_uci_engine):
+    """Test that stop() kills the process immediately."""
+    process = fake_uci_engine["processes"][0]
+    engine.stop()
+    assert process.returncode == -9
+    assert not engine.is_alive()
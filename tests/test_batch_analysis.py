@@ -0,0 +1,180 @@
+"""Tests for the multi-process PGN analysis CLI."""
+
+import json
+from unittest.mock import patch
+
+import pytest
+
+from chesspal_mcp_engine import batch_analysis
+from chesspal_mcp_engine.batch_analysis import errors_path, index_games, load_checkpoint, main_cli, run_analysis
+from chesspal_mcp_engine.models import SearchLimits
+
+PGN = """[Event "A"]
+[Result "*"]
+
+1. e4 e5 2. Nf3 *
+
+[Event "B"]
+[Result "0-1"]
+
+1. f3 e5
+2. g4 Qh4# 0-1
+
+[Event "C"]
+[Result "*"]
+
+1. d4 Ke7 *
+"""
+
+
+class InlinePool:
+    """Stand-in for multiprocessing.Pool running the worker in this process."""
+
+    def __init__(self, processes, initializer, initargs):
+        """Initialize the single in-process worker."""
+        initializer(*initargs)
+
+    def imap_unordered(self, func, iterable):
+        """Apply func to every task in order."""
+        return map(func, iterable)
+
+    def close(self):
+        """Mock close operation."""
+        pass
+
+    def join(self):
+        """Mock join operation."""
+        pass
+
+    def __enter__(self):
+        """Enter the pool context."""
+        return self
+
+    def __exit__(self, *exc_info):
+        """Close the worker's engine."""
+        batch_analysis._close_worker()
+        batch_analysis._worker.clear()
+
+
+@pytest.fixture
+def pgn_file(tmp_path):
+    """Write a small PGN file."""
+    path = tmp_path / "games.pgn"
+    path.write_text(PGN)
+    return path
+
+
+def read_records(path):
+    """Read JSONL records keyed by game index."""
+    return {record["game"]: record for record in map(json.loads, path.read_text().splitlines())}
+
+
+def test_index_games(pgn_file):
+    """Test that every game is found with an offset to re-read it from."""
+    offsets = list(index_games(pgn_file))
+    assert [index for index, _ in offsets] == [0, 1, 2]
+    with open(pgn_file) as handle:
+        handle.seek(offsets[1][1])
+        assert handle.readline().startswith('[Event "B"]')
+
+
+class CrashingPool(InlinePool):
+    """InlinePool whose worker engine dies after every game."""
+
+    def imap_unordered(self, func, iterable):
+        """Apply func to every task in order, killing the engine after each."""
+        for task in iterable:
+            yield func(task)
+            batch_analysis._worker["engine"].process.exit(-9)
+
+
+def test_load_checkpoint_truncates_partial_line(tmp_path):
+    """Test that completed games are read back and a cut-off line is dropped."""
+    output = tmp_path / "out.jsonl"
+    output.write_text(
+        '{"game": 0, "plies": []}\n{"game": 3, "error": "Engine failed"}\n{"game": 2, "plies": []}\n{"game": 1, "pl'
+    )
+
+    assert load_checkpoint(output) == {0, 2}
+    assert output.read_text().endswith("}\n")
+    assert load_checkpoint(tmp_path / "missing.jsonl") == set()
+
+
+def test_run_analysis(pgn_file, tmp_path, fake_uci_engine):
+    """Test that every game is analyzed and written as one JSON line."""
+    output = tmp_path / "out.jsonl"
+    with patch("chesspal_mcp_engine.batch_analysis.multiprocessing.Pool", InlinePool):
+        written = run_analysis(pgn_file, output, workers=2, limits=SearchLimits(depth=5))
+
+    assert written == 3
+    records = read_records(output)
+    assert records[0]["headers"]["Event"] == "A"
+    assert [ply["move_uci"] for ply in records[0]["plies"]] == ["e2e4", "e7e5", "g1f3"]
+    assert records[1]["plies"][-1]["move_san"] == "Qh4#"
+    assert 2 not in records
+    assert "illegal" in read_records(errors_path(output))[2]["error"]
+    assert "go depth 5" in fake_uci_engine["processes"][0].commands
+
+
+def test_run_analysis_resumes(pgn_file, tmp_path, fake_uci_engine):
+    """Test that games already in the output are skipped on resume."""
+    output = tmp_path / "out.jsonl"
+    output.write_text('{"game": 0, "plies": []}\n{"game": 1, "plies": []}\n')
+
+    with patch("chesspal_mcp_engine.batch_analysis.multiprocessing.Pool", InlinePool):
+        written = run_analysis(pgn_file, output, workers=1, limits=SearchLimits(depth=5))
+
+    assert written == 1
+    assert sorted(read_records(output)) == [0, 1]
+    assert sorted(read_records(errors_path(output))) == [2]
+
+
+def test_run_analysis_retries_failed_games(pgn_file, tmp_path, fake_uci_engine):
+    """Test that games that failed in an earlier run are analyzed again on resume."""
+    output = tmp_path / "out.jsonl"
+    output.write_text('{"game": 0, "plies": []}\n')
+    errors_path(output).write_text('{"game": 1, "error": "Engine process terminated unexpectedly"}\n')
+
+    with patch("chesspal_mcp_engine.batch_analysis.multiprocessing.Pool", InlinePool):
+        written = run_analysis(pgn_file, output, workers=1, limits=SearchLimits(depth=5))
+
+    assert written == 2
+    assert read_records(output)[1]["plies"][-1]["move_san"] == "Qh4#"
+    assert sorted(read_records(errors_path(output))) == [2]
+
+
+def test_run_analysis_restarts_dead_engine(pgn_file, tmp_path, fake_uci_engine):
+    """Test that a worker replaces an engine that died instead of failing its remaining games."""
+    output = tmp_path / "out.jsonl"
+    with patch("chesspal_mcp_engine.batch_analysis.multiprocessing.Pool", CrashingPool):
+        run_analysis(pgn_file, output, workers=1, limits=SearchLimits(depth=5))
+
+    assert sorted(read_records(output)) == [0, 1]
+    # Game 2 fails on its PGN before an engine is needed
+    assert len(fake_uci_engine["processes"]) == 2
+
+
+def test_run_analysis_engine_start_failure(pgn_file, tmp_path):
+    """Test that a worker whose engine cannot start reports an error per game."""
+    output = tmp_path / "out.jsonl"
+    with (
+        patch("chesspal_mcp_engine.batch_analysis.multiprocessing.Pool", InlinePool),
+        patch("chesspal_mcp_engine.async_engine._get_engine_path", side_effect=RuntimeError("no binary")),
+    ):
+        run_analysis(pgn_file, output, workers=1, limits=SearchLimits(depth=5), resume=False)
+
+    assert output.read_text() == ""
+    records = read_records(errors_path(output))
+    assert len(records) == 3
+    assert all("Engine failed to start" in record["error"] for record in records.values())
+
+
+def test_main_cli(pgn_file, tmp_path):
+    """Test that CLI arguments are turned into an analysis run."""
+    with patch("chesspal_mcp_engine.batch_analysis.run_analysis") as run:
+        main_cli([str(pgn_file), "-o", str(tmp_path / "out.jsonl"), "-w", "3", "--depth", "12", "--no-resume"])
+
+    kwargs = run.call_args.kwargs
+    assert kwargs["workers"] == 3
+    assert kwargs["limits"].depth == 12
+    assert kwargs["resume"] is False
@@ -0,0 +1,186 @@
+"""Tests for the best-move cache."""
+
+import asyncio
+from unittest.mock import patch
+
+import chess
+import pytest
+
+from chesspal_mcp_engine.cache import BestMoveCache, SingleFlight, cache_key
+from chesspal_mcp_engine.models import SearchLimits
+
+
+def test_cache_key_ignores_move_clocks():
+    """Test that transpositions with different move clocks share a key."""
+    limits = SearchLimits(depth=10)
+    board = chess.Board()
+    board.push_uci("g1f3")
+    board.push_uci("g8f6")
+    board.push_uci("f3g1")
+    board.push_uci("f6g8")
+
+    assert cache_key(board, limits) == cache_key(chess.Board(), limits)
+    assert cache_key(chess.Board(), limits) != cache_key(chess.Board(), SearchLimits(depth=12))
+
+
+def test_get_and_put():
+    """Test hits and misses are counted."""
+    cache = BestMoveCache(max_size=2)
+    assert cache.get("a") is None
+    cache.put("a", "e2e4")
+    assert cache.get("a") == "e2e4"
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["hit_rate"] == 0.5
+    assert stats["size"] == 1
+
+
+def test_lru_eviction():
+    """Test that the least recently used entry is evicted when full."""
+    cache = BestMoveCache(max_size=2)
+    cache.put("a", "e2e4")
+    cache.put("b", "d2d4")
+    cache.get("a")
+    cache.put("c", "c2c4")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "e2e4"
+    assert cache.get("c") == "c2c4"
+    assert cache.stats()["evictions"] == 1
+
+
+def test_ttl_expiry():
+    """Test that entries expire after the time to live."""
+    cache = BestMoveCache(max_size=2, ttl=10)
+    with patch("chesspal_mcp_engine.cache.time.monotonic", return_value=100.0):
+        cache.put("a", "e2e4")
+    with patch("chesspal_mcp_engine.cache.time.monotonic", return_value=105.0):
+        assert cache.get("a") == "e2e4"
+    with patch("chesspal_mcp_engine.cache.time.monotonic", return_value=111.0):
+        assert cache.get("a") is None
+
+    assert len(cache) == 0
+    assert cache.stats()["expirations"] == 1
+
+
+def test_clear():
+    """Test that clear() removes all entries."""
+    cache = BestMoveCache(max_size=2)
+    cache.put("a", "e2e4")
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_invalid_size():
+    """Test that the cache needs room for at least one entry."""
+    with pytest.raises(ValueError):
+        BestMoveCache(max_size=0)
+
+
+@pytest.mark.asyncio
+async def test_single_flight_coalesces_concurrent_calls():
+    """Test that concurrent calls for one key share a single execution."""
+    flight = SingleFlight()
+    calls = []
+
+    async def work():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "e2e4"
+
+    results = await asyncio.gather(*(flight.run("key", work) for _ in range(5)))
+    assert results == ["e2e4"] * 5
+    assert len(calls) == 1
+    assert flight.stats() == {"in_flight": 0, "started": 1, "coalesced": 4}
+
+    # A later call starts a new execution
+    assert await flight.run("key", work) == "e2e4"
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_single_flight_shares_errors():
+    """Test that every waiting caller receives the error."""
+    flight = SingleFlight()
+
+    async def work():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("boom")
+
+    results = await asyncio.gather(flight.run("key", work), flight.run("key", work), return_exceptions=True)
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert len(flight) == 0
+
+
+@pytest.mark.asyncio
+async def test_single_flight_cancelled_caller_does_not_cancel_others():
+    """Test that cancelling the first caller leaves the shared call running."""
+    flight = SingleFlight()
+
+    async def work():
+        await asyncio.sleep(0.02)
+        return "d2d4"
+
+    first = asyncio.create_task(flight.run("key", work))
+    second = asyncio.create_task(flight.run("key", work))
+    await asyncio.sleep(0)
+    first.cancel()
+
+    assert await second == "d2d4"
+    with pytest.raises(asyncio.CancelledError):
+        await first
+
+
+@pytest.mark.asyncio
+async def test_single_flight_cancels_call_when_all_callers_are_cancelled():
+    """Test that the shared call is cancelled once nobody waits for it."""
+    flight = SingleFlight()
+    started = asyncio.Event()
+    cancelled = []
+
+    async def work():
+        started.set()
+        try:
+            await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    first = asyncio.create_task(flight.run("key", work))
+    second = asyncio.create_task(flight.run("key", work))
+    await started.wait()
+    first.cancel()
+    await asyncio.sleep(0)
+    assert not cancelled
+
+    second.cancel()
+    await asyncio.gather(first, second, return_exceptions=True)
+    await asyncio.sleep(0)
+    assert cancelled == [True]
+    assert len(flight) == 0
+
+
+@pytest.mark.asyncio
+async def test_single_flight_caller_cancelled_after_call_finished():
+    """Test that a caller cancelled after the shared call was forgotten still sees its cancellation."""
+    flight = SingleFlight()
+    release = asyncio.Event()
+
+    async def work():
+        await release.wait()
+        return "d2d4"
+
+    caller = asyncio.create_task(flight.run("key", work))
+    await asyncio.sleep(0)
+    task = flight._in_flight["key"]
+    release.set()
+    await task
+    caller.cancel()
+    # The shared call's done callback ran before the cancelled caller resumed
+    flight._forget("key", task)
+
+    with pytest.raises(asyncio.CancelledError):
+        await caller
+    assert len(flight) == 0
@@ -0,0 +1,438 @@
+"""Tests for the engine process pool."""
+
+import asyncio
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from chesspal_mcp_engine import engine_pool
+from chesspal_mcp_engine.async_engine import AsyncStockfishEngine
+from chesspal_mcp_engine.engine_pool import EnginePool, EnginePoolError
+from chesspal_mcp_engine.engine_wrapper import StockfishError
+from chesspal_mcp_engine.metrics import metrics
+from chesspal_mcp_engine.models import SearchResult
+from chesspal_mcp_engine.scheduler import Priority, QueueFullError
+
+
+def make_mock_engine():
+    """Create a mock engine whose process looks alive."""
+    engine = MagicMock(spec=AsyncStockfishEngine)
+    engine.is_alive.return_value = True
+    return engine
+
+
+@pytest.mark.asyncio
+async def test_start_creates_engines_with_budget():
+    """Test that start() creates one engine per slot with the configured budget."""
+    factory = MagicMock(side_effect=lambda **kwargs: make_mock_engine())
+    pool = EnginePool(size=3, threads=2, hash_mb=64, engine_factory=factory)
+    await pool.start()
+
+    assert factory.call_count == 3
+    factory.assert_called_with(threads=2, hash_mb=64)
+    assert pool.stats()["size"] == 3
+    assert pool.idle_count == 3
+    assert pool.is_initialized()
+
+
+def test_invalid_size():
+    """Test that a pool needs at least one engine."""
+    with pytest.raises(ValueError):
+        EnginePool(size=0, threads=1, hash_mb=16)
+
+
+@pytest.mark.asyncio
+async def test_start_failure_stops_started_engines():
+    """Test that a failing engine start stops the engines already started."""
+    first = make_mock_engine()
+    second = make_mock_engine()
+    second.start.side_effect = StockfishError("boom")
+    factory = MagicMock(side_effect=[first, second])
+    pool = EnginePool(size=2, threads=1, hash_mb=16, engine_factory=factory)
+
+    with pytest.raises(StockfishError, match="boom"):
+        await pool.start()
+
+    first.stop.assert_called_once()
+    assert not pool.is_initialized()
+
+
+@pytest.mark.asyncio
+async def test_acquire_and_release(make_engine_pool):
+    """Test that an acquired engine is busy until the context exits."""
+    engine = make_mock_engine()
+    pool = await make_engine_pool(engine)
+
+    async with pool.acquire() as acquired:
+        assert acquired is engine
+        assert pool.stats()["busy"] == 1
+        assert pool.idle_count == 0
+
+    stats = pool.stats()
+    assert stats["idle"] == 1
+    assert stats["acquisitions"] == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_use_distinct_engines(make_engine_pool):
+    """Test that concurrent requests are spread across engines."""
+    pool = await make_engine_pool(make_mock_engine(), make_mock_engine())
+    seen = []
+
+    async def use_engine():
+        async with pool.acquire() as engine:
+            seen.append(engine)
+            await asyncio.sleep(0.01)
+
+    await asyncio.gather(use_engine(), use_engine())
+    assert len(set(map(id, seen))) == 2
+
+
+@pytest.mark.asyncio
+async def test_waiters_are_served_when_engine_returns(make_engine_pool):
+    """Test that a waiting request gets the engine once it is released."""
+    pool = await make_engine_pool(make_mock_engine())
+    order = []
+
+    async def use_engine(name):
+        async with pool.acquire():
+            order.append(name)
+            await asyncio.sleep(0.01)
+
+    await asyncio.gather(use_engine("first"), use_engine("second"))
+    assert order == ["first", "second"]
+    assert pool.stats()["wait_time_max_ms"] > 0
+
+
+@pytest.mark.asyncio
+async def test_live_requests_overtake_queued_background_work(make_engine_pool):
+    """Test that a released engine goes to a waiting live request before earlier batch requests."""
+    pool = await make_engine_pool(make_mock_engine())
+    metrics.reset()
+    order = []
+
+    async def use_engine(name, priority):
+        async with pool.acquire(priority=priority, client=name):
+            order.append(name)
+            await asyncio.sleep(0.01)
+
+    async with pool.acquire():
+        tasks = [
+            asyncio.ensure_future(use_engine("batch", Priority.BATCH)),
+            asyncio.ensure_future(use_engine("analysis", Priority.ANALYSIS)),
+            asyncio.ensure_future(use_engine("live", Priority.LIVE)),
+        ]
+        await asyncio.sleep(0.01)
+        assert pool.stats()["waiting"] == 3
+    await asyncio.gather(*tasks)
+
+    assert order == ["live", "analysis", "batch"]
+    queue = pool.stats()["queue"]
+    assert queue["batch"]["wait_time_max_ms"] > queue["live"]["wait_time_max_ms"] > 0
+    assert 'chesspal_engine_queue_wait_seconds_count{priority="batch"} 1' in metrics.render()
+
+
+@pytest.mark.asyncio
+async def test_full_queue_rejects_without_waiting(make_engine_pool):
+    """Test that a request finding the queue full fails right away instead of timing out."""
+    pool = await make_engine_pool(make_mock_engine())
+    pool._scheduler.max_queue = 1
+
+    async with pool.acquire():
+        waiter = asyncio.ensure_future(pool.get_best_move("fen"))
+        await asyncio.sleep(0)
+        with pytest.raises(QueueFullError):
+            await asyncio.wait_for(pool.get_best_move("fen", priority=Priority.BATCH), timeout=0.1)
+        waiter.cancel()
+
+    assert pool.stats()["queue"]["batch"]["rejected"] == 1
+    assert pool.stats()["waiting"] == 0
+
+
+@pytest.mark.asyncio
+async def test_acquire_prefers_requested_idle_engine(make_engine_pool):
+    """Test that a preferred engine is handed out when it is idle."""
+    first, second = make_mock_engine(), make_mock_engine()
+    pool = await make_engine_pool(first, second)
+
+    async with pool.acquire(prefer=second) as engine:
+        assert engine is second
+        async with pool.acquire(prefer=second) as other:
+            assert other is first
+
+
+@pytest.mark.asyncio
+async def test_acquire_preferred_engine_does_not_skip_queue(make_engine_pool):
+    """Test that a preferred idle engine goes to queued waiters first."""
+    engine = make_mock_engine()
+    pool = await make_engine_pool(engine)
+    waiter = pool._scheduler.enqueue(Priority.LIVE, "other")
+
+    assert pool._take_idle(engine) is None
+    assert pool.idle_count == 1
+    waiter.cancel()
+
+
+@pytest.mark.asyncio
+async def test_acquire_timeout(make_engine_pool):
+    """Test that acquire fails fast once the timeout expires."""
+    pool = await make_engine_pool(make_mock_engine())
+    pool.acquire_timeout = 0.01
+
+    async with pool.acquire():
+        with pytest.raises(EnginePoolError, match="Timed out waiting for an idle engine"):
+            async with pool.acquire():
+                pass
+    assert pool.stats()["waiting"] == 0
+
+
+@pytest.mark.asyncio
+async def test_acquire_not_started():
+    """Test that acquiring from a pool that was never started fails."""
+    pool = EnginePool(size=1, threads=1, hash_mb=16)
+    with pytest.raises(EnginePoolError, match="not started"):
+        async with pool.acquire():
+            pass
+
+
+@pytest.mark.asyncio
+async def test_get_best_move(make_engine_pool):
+    """Test that get_best_move searches on an acquired engine."""
+    engine = make_mock_engine()
+    engine.get_best_move.return_value = "e2e4"
+    pool = await make_engine_pool(engine)
+
+    assert await pool.get_best_move("fen", ["e2e4"]) == "e2e4"
+    engine.get_best_move.assert_awaited_once_with("fen", ["e2e4"], None)
+    assert pool.idle_count == 1
+
+
+@pytest.mark.asyncio
+async def test_search(make_engine_pool):
+    """Test that search returns the full result from an acquired engine."""
+    engine = make_mock_engine()
+    engine.search.return_value = SearchResult(best_move="e2e4", score_cp=20)
+    pool = await make_engine_pool(engine)
+
+    assert (await pool.search("fen")).score_cp == 20
+    engine.search.assert_awaited_once_with("fen", None, None, on_info=None, deadline=None, multipv=1)
+
+
+@pytest.mark.asyncio
+async def test_search_many_fans_out_across_engines(make_engine_pool):
+    """Test that a batch is spread over all engines and streamed as results complete."""
+    engines = [make_mock_engine(), make_mock_engine()]
+    in_flight = []
+    peak = []
+
+    async def slow_search(fen, move_history, limits, on_info=None, deadline=None, multipv=1):
+        in_flight.append(fen)
+        peak.append(len(in_flight))
+        await asyncio.sleep(0.03 if fen == "slow" else 0.01)
+        in_flight.remove(fen)
+        return SearchResult(best_move=fen)
+
+    for engine in engines:
+        engine.search.side_effect = slow_search
+    pool = await make_engine_pool(*engines)
+
+    results = [item async for item in pool.search_many([("slow", None), ("a", None), ("b", None)])]
+
+    assert results[-1] == (0, SearchResult(best_move="slow"))
+    assert sorted(index for index, _ in results) == [0, 1, 2]
+    assert max(peak) == 2
+    assert all(engine.search.await_count >= 1 for engine in engines)
+
+
+@pytest.mark.asyncio
+async def test_search_many_reports_errors_per_position(make_engine_pool):
+    """Test that a failing position yields its exception without stopping the batch."""
+    engine = make_mock_engine()
+    engine.search.side_effect = [StockfishError("boom"), SearchResult(best_move="e2e4")]
+    pool = await make_engine_pool(engine)
+
+    results = dict([item async for item in pool.search_many([("bad", None), ("good", None)])])
+
+    assert isinstance(results[0], StockfishError)
+    assert results[1].best_move == "e2e4"
+
+
+@pytest.mark.asyncio
+async def test_start_keeps_warm_spares():
+    """Test that spares are started with the pool but not handed out."""
+    factory = MagicMock(side_effect=lambda **kwargs: make_mock_engine())
+    pool = EnginePool(size=2, threads=1, hash_mb=16, engine_factory=factory, spares=1)
+    await pool.start()
+
+    assert factory.call_count == 3
+    assert pool.stats()["size"] == 2
+    assert pool.stats()["spares"] == 1
+    assert pool.idle_count == 2
+
+
+@pytest.mark.asyncio
+async def test_dead_engine_is_replaced_by_spare():
+    """Test that an engine dying during use is swapped for the warm spare and a new spare is started."""
+    engines = [make_mock_engine() for _ in range(3)]
+    pool = EnginePool(size=1, threads=1, hash_mb=16, engine_factory=MagicMock(side_effect=engines), spares=1)
+    await pool.start()
+    crashed, spare, new_spare = engines
+
+    async with pool.acquire() as engine:
+        assert engine is crashed
+        crashed.is_alive.return_value = False
+
+    crashed.stop.assert_called_once()
+    async with pool.acquire() as engine:
+        assert engine is spare
+    await asyncio.gather(*pool._spawning)
+
+    stats = pool.stats()
+    assert (stats["size"], stats["spares"], stats["crashes"], stats["restarts"]) == (1, 1, 1, 1)
+    new_spare.start.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_dead_engine_without_spare_is_restarted_for_waiters():
+    """Test that a waiter is served by the replacement of an engine that died idle."""
+    crashed, replacement = make_mock_engine(), make_mock_engine()
+    pool = EnginePool(size=1, threads=1, hash_mb=16, engine_factory=MagicMock(side_effect=[crashed, replacement]))
+    await pool.start()
+    crashed.is_alive.return_value = False
+
+    async with pool.acquire() as engine:
+        assert engine is replacement
+
+    stats = pool.stats()
+    assert (stats["crashes"], stats["restarts"]) == (1, 1)
+    assert stats["recovery_time_last_ms"] > 0
+
+
+@pytest.mark.asyncio
+async def test_heartbeat_age_of_checked_out_engines(make_engine_pool):
+    """Test that only output since an engine was checked out counts towards its heartbeat."""
+    engine = make_mock_engine()
+    engine.last_heartbeat = None
+    pool = await make_engine_pool(engine)
+    assert pool.heartbeat_age() is None
+
+    async with pool.acquire():
+        await asyncio.sleep(0.02)
+        # Output from before the checkout does not make a busy engine look hung
+        engine.last_heartbeat = time.monotonic() - 3600
+        assert 0.02 <= pool.heartbeat_age() < 1
+        engine.last_heartbeat = time.monotonic()
+        assert pool.heartbeat_age() < 0.02
+
+    assert pool.heartbeat_age() is None
+
+
+@pytest.mark.asyncio
+async def test_replacement_is_retried_until_it_starts(monkeypatch):
+    """Test that a crashed engine's replacement keeps being retried and then serves the waiting request."""
+    monkeypatch.setattr(engine_pool, "MAX_RESTART_BACKOFF", 0)
+    crashed, failing, replacement = make_mock_engine(), make_mock_engine(), make_mock_engine()
+    failing.start.side_effect = StockfishError("Failed to initialize engine")
+    factory = MagicMock(side_effect=[crashed, failing, failing, failing, failing, replacement])
+    pool = EnginePool(size=1, threads=1, hash_mb=16, engine_factory=factory)
+    await pool.start()
+    crashed.is_alive.return_value = False
+
+    async with pool.acquire() as engine:
+        assert engine is replacement
+
+    stats = pool.stats()
+    assert (stats["spawn_failures"], stats["restarts"], stats["restarting"]) == (4, 1, 0)
+
+
+@pytest.mark.asyncio
+async def test_pool_without_engines_reports_restarts(monkeypatch):
+    """Test that a pool whose engines all crashed says so instead of claiming it is not started."""
+    monkeypatch.setattr(engine_pool, "MAX_RESTART_BACKOFF", 0.01)
+    crashed, failing = make_mock_engine(), make_mock_engine()
+    failing.start.side_effect = StockfishError("Failed to initialize engine")
+    factory = MagicMock(side_effect=lambda **kwargs: failing if factory.call_count > 1 else crashed)
+    pool = EnginePool(size=1, threads=1, hash_mb=16, acquire_timeout=0.05, engine_factory=factory)
+    await pool.start()
+    crashed.is_alive.return_value = False
+
+    with pytest.raises(EnginePoolError, match="1 of 1 engines are restarting after crashes"):
+        async with pool.acquire():
+            pass
+
+    assert pool.stats()["restarting"] == 1
+    assert not pool.is_initialized()
+    await pool.close()
+    assert pool.stats()["restarting"] == 0
+
+
+@pytest.mark.asyncio
+async def test_search_is_retried_when_engine_dies():
+    """Test that a search whose engine crashed is retried on the spare."""
+    crashed, spare, new_spare = make_mock_engine(), make_mock_engine(), make_mock_engine()
+
+    async def crash(*args, **kwargs):
+        crashed.is_alive.return_value = False
+        raise StockfishError("Engine process terminated unexpectedly")
+
+    crashed.search.side_effect = crash
+    spare.search.return_value = SearchResult(best_move="e2e4")
+    factory = MagicMock(side_effect=[crashed, spare, new_spare])
+    pool = EnginePool(size=1, threads=1, hash_mb=16, engine_factory=factory, spares=1)
+    await pool.start()
+
+    assert (await pool.search("fen")).best_move == "e2e4"
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_start_with_fake_engines(fake_uci_engine):
+    """Test that a pool drives several real AsyncStockfishEngine instances concurrently."""
+    pool = EnginePool(size=3, threads=2, hash_mb=32)
+    await pool.start()
+
+    moves = await asyncio.gather(*(pool.get_best_move("fen") for _ in range(6)))
+
+    assert moves == ["e2e4"] * 6
+    assert len(fake_uci_engine["processes"]) == 3
+    assert "setoption name Threads value 2" in fake_uci_engine["processes"][0].commands
+    assert pool.is_initialized()
+
+    await pool.close()
+    assert all(process.returncode == 0 for process in fake_uci_engine["processes"])
+
+
+@pytest.mark.asyncio
+async def test_get_best_move_propagates_errors(make_engine_pool):
+    """Test that engine errors reach the caller and the engine is returned."""
+    engine = make_mock_engine()
+    engine.get_best_move.side_effect = StockfishError("Engine failed")
+    pool = await make_engine_pool(engine)
+
+    with pytest.raises(StockfishError, match="Engine failed"):
+        await pool.get_best_move("fen")
+    assert pool.idle_count == 1
+
+
+@pytest.mark.asyncio
+async def test_is_initialized_dead_process(make_engine_pool):
+    """Test that a dead engine process makes the pool unhealthy."""
+    engine = make_mock_engine()
+    pool = await make_engine_pool(engine)
+    engine.is_alive.return_value = False
+    assert not pool.is_initialized()
+
+
+@pytest.mark.asyncio
+async def test_stop(make_engine_pool):
+    """Test that stop() stops engines and busy engines are not returned."""
+    engine = make_mock_engine()
+    pool = await make_engine_pool(engine)
+
+    async with pool.acquire():
+        pool.stop()
+
+    engine.stop.assert_called_once()
+    assert pool.idle_count == 0
+    assert not pool.is_initialized()
@@ -152,6 +152,41 @@ def test_get_best_move_with_history(mock_engine):
         assert any(cmd == expected_pos_cmd for cmd in mock_engine.stdin.commands)
 
 
+def test_read_response_retain_filter(mock_engine):
+    """Test that only retained lines and the final line are buffered."""
+    with patch("chesspal_mcp_engine.engine_wrapper._get_engine_path") as mock_get_path:
+        mock_get_path.return_value = Path("/mock/stockfish")
+        engine = StockfishEngine()
+        mock_engine.stdout.responses.extend(
+            [
+                b"info depth 1 currmove e2e4 currmovenumber 1\n",
+                b"info depth 1 score cp 20 pv e2e4\n",
+                b"bestmove e2e4\n",
+            ]
+        )
+        responses = engine._read_response(until="bestmove", retain=lambda line: "score" in line)
+        assert responses == ["info depth 1 score cp 20 pv e2e4", "bestmove e2e4"]
+
+
+def test_is_initialized_does_not_interrupt_search(mock_engine):
+    """Test that a health check during a search checks the process without sending isready."""
+    with patch("chesspal_mcp_engine.engine_wrapper._get_engine_path") as mock_get_path:
+        mock_get_path.return_value = Path("/mock/stockfish")
+        engine = StockfishEngine()
+        assert engine.heartbeat_age() is not None
+
+        # Held by a search running in another thread
+        with engine._lock:
+            sent = len(mock_engine.stdin.commands)
+            assert engine.is_initialized()
+            assert len(mock_engine.stdin.commands) == sent
+
+        mock_engine.stdout.responses.append(b"readyok\n")
+        assert engine.is_initialized()
+        assert mock_engine.stdin.commands[-1] == b"isready\n"
+        assert not engine._lock.locked()
+
+
 def test_get_best_move_engine_error(mock_engine):
     """Test error handling when engine fails to respond properly."""
     with patch("chesspal_mcp_engine.engine_wrapper._get_engine_path") as mock_get_path:
@@ -0,0 +1,86 @@
+"""Tests for whole-game analysis."""
+
+from unittest.mock import MagicMock
+
+import chess
+import pytest
+
+from chesspal_mcp_engine.async_engine import AsyncStockfishEngine
+from chesspal_mcp_engine.game_analysis import MATE_SCORE_CP, analyze_moves, score_to_cp
+from chesspal_mcp_engine.models import SearchLimits, SearchResult
+
+LIMITS = SearchLimits(depth=8)
+
+
+def test_score_to_cp():
+    """Test centipawn conversion of scores and mates."""
+    assert score_to_cp(SearchResult(best_move="e2e4", score_cp=35)) == 35
+    assert score_to_cp(SearchResult(best_move="e2e4", mate=2)) == MATE_SCORE_CP - 2
+    assert score_to_cp(SearchResult(best_move="e2e4", mate=-3)) == -MATE_SCORE_CP + 3
+    assert score_to_cp(SearchResult(best_move="(none)", mate=0)) == -MATE_SCORE_CP
+
+
+@pytest.mark.asyncio
+async def test_analyze_moves_reports_cp_loss():
+    """Test that each ply gets the engine's choice and the loss of the played move."""
+    engine = MagicMock(spec=AsyncStockfishEngine)
+    # Scores are from the side to move after the moves played so far
+    results = [
+        SearchResult(best_move="e2e4", score_cp=30, depth=8),
+        SearchResult(best_move="e7e5", score_cp=-25, depth=8),
+        SearchResult(best_move="g1f3", score_cp=90, depth=8),
+    ]
+    engine.search.side_effect = results
+    board = chess.Board()
+    moves = [chess.Move.from_uci("e2e4"), chess.Move.from_uci("a7a6")]
+    seen = []
+
+    async def on_ply(report):
+        seen.append(report["ply"])
+
+    reports = await analyze_moves(engine.search, board, moves, LIMITS, on_ply=on_ply)
+
+    assert seen == [1, 2]
+    assert reports[0]["move_san"] == "e4"
+    assert reports[0]["cp_loss"] == 0
+    assert reports[1]["best_move_uci"] == "e7e5"
+    assert reports[1]["cp_loss"] == 65  # -25 expected, -90 after a6
+    start_fen = chess.STARTING_FEN
+    engine.search.assert_any_await(start_fen, None, LIMITS)
+    engine.search.assert_any_await(start_fen, ["e2e4", "a7a6"], LIMITS)
+    assert board.move_stack == []
+
+
+@pytest.mark.asyncio
+async def test_analyze_moves_checkmate_is_not_searched():
+    """Test that the final mated position is scored without a search."""
+    engine = MagicMock(spec=AsyncStockfishEngine)
+    engine.search.side_effect = [
+        SearchResult(best_move="e2e4", score_cp=20),
+        SearchResult(best_move="e7e5", score_cp=-20),
+        SearchResult(best_move="e2e4", score_cp=-150),
+        SearchResult(best_move="d8h4", mate=1),
+    ]
+    moves = [chess.Move.from_uci(uci) for uci in ["f2f3", "e7e5", "g2g4", "d8h4"]]
+
+    reports = await analyze_moves(engine.search, chess.Board(), moves, LIMITS)
+
+    assert engine.search.await_count == 4
+    assert reports[-1]["move_san"] == "Qh4#"
+    assert reports[-1]["cp_loss"] == 0
+
+
+@pytest.mark.asyncio
+async def test_analyze_moves_on_warm_engine(fake_uci_engine):
+    """Test that every ply is sent to one engine as moves from the start position."""
+    engine = AsyncStockfishEngine(threads=1, hash_mb=16)
+    await engine.start()
+    try:
+        moves = [chess.Move.from_uci(uci) for uci in ["e2e4", "e7e5"]]
+        reports = await analyze_moves(engine.search, chess.Board(), moves, LIMITS)
+    finally:
+        engine.stop()
+
+    assert len(reports) == 2
+    commands = fake_uci_engine["processes"][0].commands
+    assert f"position fen {chess.STARTING_FEN} moves e2e4 e7e5" in commands
@@ -1,11 +1,19 @@
 """Tests for the health server module."""
 
+import time
 import warnings
 
 from fastapi.testclient import TestClient
 from pytest_mock import MockerFixture
 
-from chesspal_mcp_engine.health_server import create_health_api, run_health_server, set_engine, start_health_server
+from chesspal_mcp_engine.health_server import (
+    create_health_api,
+    run_health_server,
+    set_engine,
+    set_shared_state,
+    start_health_server,
+)
+from chesspal_mcp_engine.shared_state import SharedState
 
 
 class MockEngine:
@@ -128,7 +136,7 @@ class TestHealthServer:
         start_health_server("127.0.0.1", 8080, "info")
 
         # Assert run_health_server was called with expected args
-        mock_run_health_server.assert_called_once_with("127.0.0.1", 8080, "info")
+        mock_run_health_server.assert_called_once_with("127.0.0.1", 8080, "info", None)
 
     def test_set_engine(self, mocker: MockerFixture):
         """Test set_engine function."""
@@ -154,6 +162,104 @@ class TestHealthServer:
             # Restore original engine state for other tests
             chesspal_mcp_engine.health_server._engine = original_engine
 
+    def test_metrics_endpoint(self, mocker: MockerFixture):
+        """Test that /metrics serves the metrics in the Prometheus text format."""
+        metrics = mocker.patch("chesspal_mcp_engine.health_server.metrics")
+        metrics.render.return_value = "chesspal_engine_queue_depth 0\n"
+        client = TestClient(create_health_api())
+
+        response = client.get("/metrics")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert response.text == "chesspal_engine_queue_depth 0\n"
+
+    def test_health_check_reads_shared_state(self, tmp_path):
+        """Test that /health reports the state published by the MCP process without an engine instance."""
+        state = SharedState.create(tmp_path / "state.bin")
+        set_engine(None)
+        set_shared_state(SharedState.attach(state.path))
+        try:
+            state.publish(
+                {
+                    "published_at": time.time(),
+                    "interval_s": 1.0,
+                    "engine_alive": True,
+                    "last_search_at": 1700000000.0,
+                    "queue_depth": 3,
+                    "pool": {"size": 2, "waiting": 3},
+                    "metrics": "chesspal_engine_queue_depth 3\n",
+                }
+            )
+            client = TestClient(create_health_api())
+
+            response = client.get("/health")
+            assert response.status_code == 200
+            assert response.json()["queue_depth"] == 3
+            assert response.json()["last_search_at"] == 1700000000.0
+            assert response.json()["engine_pool"] == {"size": 2, "waiting": 3}
+            assert client.get("/metrics").text == "chesspal_engine_queue_depth 3\n"
+        finally:
+            set_shared_state(None)
+            state.close(unlink=True)
+
+    def test_health_check_pool_restarting_engines(self, tmp_path):
+        """Test that a pool still serving while crashed engines restart is reported as degraded."""
+        state = SharedState.create(tmp_path / "state.bin")
+        set_shared_state(SharedState.attach(state.path))
+        try:
+            snapshot = {"published_at": time.time(), "interval_s": 1.0, "engine_alive": True}
+            pool = {"size": 1, "restarting": 1}
+            state.publish({**snapshot, "last_search_at": None, "queue_depth": 0, "pool": pool, "metrics": ""})
+            response = TestClient(create_health_api()).get("/health")
+            assert response.status_code == 200
+            assert response.json()["status"] == "degraded"
+            assert response.json()["dependencies"]["engine"] == "ok"
+        finally:
+            set_shared_state(None)
+            state.close(unlink=True)
+
+    def test_health_check_hung_engine(self, tmp_path):
+        """Test that a busy engine silent for longer than the heartbeat timeout reports the engine as down."""
+        state = SharedState.create(tmp_path / "state.bin")
+        set_shared_state(SharedState.attach(state.path))
+        try:
+            snapshot = {"published_at": time.time(), "interval_s": 1.0, "engine_alive": True, "heartbeat_age_s": 5.0}
+            state.publish({**snapshot, "last_search_at": None, "queue_depth": 0, "pool": None, "metrics": ""})
+            client = TestClient(create_health_api())
+            assert client.get("/health").status_code == 200
+
+            state.publish(
+                {
+                    **snapshot,
+                    "heartbeat_age_s": 600.0,
+                    "last_search_at": None,
+                    "queue_depth": 0,
+                    "pool": None,
+                    "metrics": "",
+                }
+            )
+            response = client.get("/health")
+            assert response.status_code == 503
+            assert response.json()["heartbeat_age_s"] == 600.0
+            assert response.json()["dependencies"]["engine"] == "error"
+        finally:
+            set_shared_state(None)
+            state.close(unlink=True)
+
+    def test_health_check_stale_shared_state(self, tmp_path):
+        """Test that a snapshot the MCP process stopped refreshing reports the engine as down."""
+        state = SharedState.create(tmp_path / "state.bin")
+        set_shared_state(SharedState.attach(state.path))
+        try:
+            snapshot = {"published_at": time.time() - 10, "interval_s": 1.0, "engine_alive": True}
+            state.publish({**snapshot, "last_search_at": None, "queue_depth": 0, "pool": None, "metrics": ""})
+            response = TestClient(create_health_api()).get("/health")
+            assert response.status_code == 503
+            assert response.json()["dependencies"]["engine"] == "error"
+        finally:
+            set_shared_state(None)
+            state.close(unlink=True)
+
     def test_create_health_api_custom_title(self):
         """Test creating the health API with a custom title."""
         custom_title = "Custom Health API"
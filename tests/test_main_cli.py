@@ -1,47 +1,49 @@
 """Tests for the main_cli function in the main module."""
 
+import asyncio
+import os
+import tempfile
+
 import pytest
 from pytest_mock import MockerFixture
 
 import chesspal_mcp_engine.main as main_module
-from chesspal_mcp_engine.engine_wrapper import StockfishEngine, StockfishError
+from chesspal_mcp_engine.async_engine import AsyncStockfishEngine
+from chesspal_mcp_engine.engine_pool import EnginePool
+from chesspal_mcp_engine.engine_wrapper import StockfishError
+from chesspal_mcp_engine.shared_state import SharedState
 
 
 class TestMainCLI:
     """Tests for the main_cli function."""
 
+    @pytest.fixture(autouse=True)
+    def no_spare_engines(self, mocker: MockerFixture):
+        """Start pools without spares, since the tests hand out a single mocked engine."""
+        mocker.patch.object(main_module.settings, "CHESSPAL_ENGINE_SPARES", 0)
+
     def test_setup_environment_success(self, mocker: MockerFixture):
-        """Test setup_environment when engine initialization succeeds."""
+        """Test setup_environment creates the engine pool without starting engines."""
         # Mock dependencies
-        mock_stockfish = mocker.patch.object(main_module, "StockfishEngine", autospec=True)
+        mock_stockfish = mocker.patch.object(main_module, "AsyncStockfishEngine", autospec=True)
         mock_setup_signal = mocker.patch.object(main_module, "setup_signal_handlers", autospec=True)
         mock_set_engine = mocker.patch.object(main_module, "set_engine", autospec=True)
+        mocker.patch.object(main_module, "_engine_pool", None)
 
         # Call the function
         main_module.setup_environment()
 
         # Assert function calls
         mock_setup_signal.assert_called_once()
-        mock_stockfish.assert_called_once()
-        mock_set_engine.assert_called_once()
-
-    def test_setup_environment_stockfish_error(self, mocker: MockerFixture):
-        """Test setup_environment when StockfishError occurs."""
-        # Mock dependencies
-        mock_engine = mocker.patch.object(main_module, "StockfishEngine", side_effect=StockfishError("Test error"))
-        mock_setup_signal = mocker.patch.object(main_module, "setup_signal_handlers", autospec=True)
-
-        # Call the function
-        main_module.setup_environment()
-
-        # Assert function calls
-        mock_setup_signal.assert_called_once()
-        mock_engine.assert_called_once()
+        mock_stockfish.assert_not_called()
+        mock_set_engine.assert_called_once_with(main_module._engine_pool)
+        assert isinstance(main_module._engine_pool, EnginePool)
+        assert main_module._engine_pool.size == main_module.settings.CHESSPAL_ENGINE_POOL_SIZE
 
     def test_setup_environment_unexpected_error(self, mocker: MockerFixture):
         """Test setup_environment when an unexpected error occurs."""
         # Mock dependencies
-        mock_engine = mocker.patch.object(main_module, "StockfishEngine", side_effect=RuntimeError("Unexpected"))
+        mock_create = mocker.patch.object(main_module, "_create_engine_pool", side_effect=RuntimeError("Unexpected"))
         mock_setup_signal = mocker.patch.object(main_module, "setup_signal_handlers", autospec=True)
 
         # Call the function
@@ -49,18 +51,18 @@ class TestMainCLI:
 
         # Assert function calls
         mock_setup_signal.assert_called_once()
-        mock_engine.assert_called_once()
+        mock_create.assert_called_once()
 
     @pytest.mark.asyncio
     async def test_lifespan_create_engine(self, mocker: MockerFixture):
         """Test lifespan when engine needs to be created."""
         # Mock dependencies
-        mock_engine = mocker.MagicMock(spec=StockfishEngine)
-        mock_stockfish = mocker.patch.object(main_module, "StockfishEngine", return_value=mock_engine)
+        mock_engine = mocker.MagicMock(spec=AsyncStockfishEngine)
+        mock_stockfish = mocker.patch.object(main_module, "AsyncStockfishEngine", return_value=mock_engine)
         mock_set_engine = mocker.patch.object(main_module, "set_engine")
 
-        # Set _engine to None
-        mocker.patch.object(main_module, "_engine", None)
+        # Set _engine_pool to None
+        mocker.patch.object(main_module, "_engine_pool", None)
 
         # Mock FastMCP server
         mock_server = mocker.MagicMock()
@@ -73,20 +75,66 @@ class TestMainCLI:
 
         # Assert function calls
         mock_stockfish.assert_called_once()
-        mock_set_engine.assert_called_once_with(mock_engine)
+        mock_engine.start.assert_awaited_once()
+        mock_set_engine.assert_called_once_with(main_module._engine_pool)
+        assert main_module._engine_pool.stats()["size"] == 1
 
         # Test exiting the context
         await lifespan_cm.__aexit__(None, None, None)
 
-        # Assert engine was stopped
+        # Assert engine was closed
+        mock_engine.close.assert_awaited_once()
+        assert main_module._engine_pool is None
+
+    @pytest.mark.asyncio
+    async def test_lifespan_publishes_health_state(self, mocker: MockerFixture, tmp_path):
+        """Test that the lifespan publishes engine state for the health process and marks it down on exit."""
+        mock_engine = mocker.MagicMock(spec=AsyncStockfishEngine)
+        mock_engine.is_alive.return_value = True
+        mocker.patch.object(main_module, "AsyncStockfishEngine", return_value=mock_engine)
+        mocker.patch.object(main_module, "set_engine")
+        mocker.patch.object(main_module, "_engine_pool", None)
+        state = SharedState.create(tmp_path / "state.bin")
+        mocker.patch.object(main_module, "_health_state", state)
+
+        lifespan_cm = main_module.lifespan(mocker.MagicMock())
+        await lifespan_cm.__aenter__()
+        await asyncio.sleep(0)
+        try:
+            snapshot = state.read()
+            assert snapshot["engine_alive"] is True
+            assert snapshot["heartbeat_age_s"] is None
+            assert snapshot["pool"]["size"] == 1
+            assert "chesspal_tool_requests_total" in snapshot["metrics"]
+        finally:
+            await lifespan_cm.__aexit__(None, None, None)
+
+        assert state.read()["engine_alive"] is False
+        state.close(unlink=True)
+
+    @pytest.mark.asyncio
+    async def test_lifespan_engine_start_error(self, mocker: MockerFixture):
+        """Test lifespan keeps the server up when engines fail to start."""
+        mock_engine = mocker.MagicMock(spec=AsyncStockfishEngine)
+        mock_engine.start.side_effect = StockfishError("Test error")
+        mocker.patch.object(main_module, "AsyncStockfishEngine", return_value=mock_engine)
+        mocker.patch.object(main_module, "set_engine")
+        mocker.patch.object(main_module, "_engine_pool", None)
+
+        lifespan_cm = main_module.lifespan(mocker.MagicMock())
+        await lifespan_cm.__aenter__()
+
+        assert not main_module._engine_pool.is_initialized()
         mock_engine.stop.assert_called_once()
 
+        await lifespan_cm.__aexit__(None, None, None)
+
     @pytest.mark.asyncio
     async def test_lifespan_reuse_engine(self, mocker: MockerFixture):
-        """Test lifespan when engine already exists."""
-        # Mock existing engine
-        existing_engine = mocker.MagicMock(spec=StockfishEngine)
-        mocker.patch.object(main_module, "_engine", existing_engine)
+        """Test lifespan when engine pool already exists."""
+        # Mock existing engine pool
+        existing_engine = mocker.MagicMock(spec=EnginePool)
+        mocker.patch.object(main_module, "_engine_pool", existing_engine)
 
         # Mock FastMCP server
         mock_server = mocker.MagicMock()
@@ -97,15 +145,69 @@ class TestMainCLI:
         # Test entering the context
         await lifespan_cm.__aenter__()
 
-        # Mock StockfishEngine should not be called
-        mock_stockfish = mocker.patch.object(main_module, "StockfishEngine")
+        # Mock AsyncStockfishEngine should not be called
+        mock_stockfish = mocker.patch.object(main_module, "AsyncStockfishEngine")
         assert mock_stockfish.call_count == 0
+        existing_engine.start.assert_awaited_once()
 
         # Test exiting the context
         await lifespan_cm.__aexit__(None, None, None)
 
-        # Assert engine was stopped
-        existing_engine.stop.assert_called_once()
+        # Assert engine pool was closed
+        existing_engine.close.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_lifespans_share_services(self, mocker: MockerFixture):
+        """Test that one SSE connection ending does not stop the engines used by another."""
+        mock_engine = mocker.MagicMock(spec=AsyncStockfishEngine)
+        mocker.patch.object(main_module, "AsyncStockfishEngine", return_value=mock_engine)
+        mocker.patch.object(main_module, "set_engine")
+        mocker.patch.object(main_module, "_engine_pool", None)
+
+        first = main_module.lifespan(mocker.MagicMock())
+        second = main_module.lifespan(mocker.MagicMock())
+        await first.__aenter__()
+        await second.__aenter__()
+        sessions = main_module._sessions
+        await first.__aexit__(None, None, None)
+
+        mock_engine.start.assert_awaited_once()
+        mock_engine.close.assert_not_awaited()
+        assert main_module._engine_pool.is_initialized()
+        assert main_module._sessions is sessions
+
+        await second.__aexit__(None, None, None)
+        mock_engine.close.assert_awaited_once()
+        assert main_module._engine_pool is None
+        assert main_module._sessions is None
+
+    @pytest.mark.asyncio
+    async def test_run_server_holds_services(self, mocker: MockerFixture, tmp_path):
+        """Test that the engines and the health publisher outlive client connections until the server exits."""
+        mock_engine = mocker.MagicMock(spec=AsyncStockfishEngine)
+        mock_engine.is_alive.return_value = True
+        mocker.patch.object(main_module, "AsyncStockfishEngine", return_value=mock_engine)
+        mocker.patch.object(main_module, "set_engine")
+        mocker.patch.object(main_module, "_engine_pool", None)
+        state = SharedState.create(tmp_path / "state.bin")
+        mocker.patch.object(main_module, "_health_state", state)
+
+        async def serve():
+            # A client connects and disconnects
+            async with main_module.lifespan(mocker.MagicMock()):
+                pass
+            await asyncio.sleep(0)
+            assert main_module._engine_pool.is_initialized()
+            assert not main_module._health_publisher.done()
+            assert state.read()["engine_alive"] is True
+
+        mocker.patch.object(main_module.app, "run_sse_async", side_effect=serve)
+        await main_module._run_server("sse")
+
+        mock_engine.close.assert_awaited_once()
+        assert main_module._health_publisher is None
+        assert state.read()["engine_alive"] is False
+        state.close(unlink=True)
 
     def test_main_cli_with_health_server(self, mocker: MockerFixture):
         """Test main_cli with health server enabled."""
@@ -118,7 +220,7 @@ class TestMainCLI:
 
         mock_setup_env = mocker.patch.object(main_module, "setup_environment")
         mock_process = mocker.patch("multiprocessing.Process")
-        mock_app_run = mocker.patch.object(main_module.app, "run")
+        mock_run_server = mocker.patch.object(main_module, "_run_server", new_callable=mocker.AsyncMock)
         mocker.patch.object(main_module, "_get_engine_path", return_value="/path/to/stockfish")
 
         # Run the function
@@ -128,7 +230,13 @@ class TestMainCLI:
         mock_setup_env.assert_called_once()
         mock_process.assert_called_once()
         mock_process.return_value.start.assert_called_once()
-        mock_app_run.assert_called_once_with(transport="sse")
+        mock_run_server.assert_awaited_once_with("sse")
+
+        # The health process is handed the engine state file, removed once the server exits
+        state_path = mock_process.call_args.kwargs["args"][3]
+        assert state_path.startswith(tempfile.gettempdir())
+        assert not os.path.exists(state_path)
+        assert main_module._health_state is None
 
     def test_main_cli_no_health_server(self, mocker: MockerFixture):
         """Test main_cli with health server disabled."""
@@ -141,7 +249,7 @@ class TestMainCLI:
 
         mock_setup_env = mocker.patch.object(main_module, "setup_environment")
         mock_process = mocker.patch("multiprocessing.Process")
-        mock_app_run = mocker.patch.object(main_module.app, "run")
+        mock_run_server = mocker.patch.object(main_module, "_run_server", new_callable=mocker.AsyncMock)
         mocker.patch.object(main_module, "_get_engine_path", return_value="/path/to/stockfish")
 
         # Run the function
@@ -150,7 +258,7 @@ class TestMainCLI:
         # Assert function calls
         mock_setup_env.assert_called_once()
         mock_process.assert_not_called()
-        mock_app_run.assert_called_once_with(transport="stdio")
+        mock_run_server.assert_awaited_once_with("stdio")
 
     def test_main_cli_engine_path_exception(self, mocker: MockerFixture):
         """Test main_cli when getting engine path raises an exception."""
@@ -162,7 +270,7 @@ class TestMainCLI:
         mock_argparse.return_value.parse_args.return_value = mock_args
 
         mock_setup_env = mocker.patch.object(main_module, "setup_environment")
-        mock_app_run = mocker.patch.object(main_module.app, "run")
+        mock_run_server = mocker.patch.object(main_module, "_run_server", new_callable=mocker.AsyncMock)
         mocker.patch.object(main_module, "_get_engine_path", side_effect=Exception("Path error"))
 
         # Run the function
@@ -170,4 +278,4 @@ class TestMainCLI:
 
         # Assert function calls
         mock_setup_env.assert_called_once()
-        mock_app_run.assert_called_once_with(transport="sse")
+        mock_run_server.assert_awaited_once_with("sse")
@@ -1,23 +1,56 @@
 """Test suite for main engine functionality."""
 
-from unittest.mock import MagicMock, patch
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
 
+import chess
 import pytest
-
-from chesspal_mcp_engine.engine_wrapper import StockfishEngine, StockfishError
+from pydantic import ValidationError
+
+from chesspal_mcp_engine.analysis_cache import AnalysisCache
+from chesspal_mcp_engine.async_engine import AsyncStockfishEngine
+from chesspal_mcp_engine.cache import BestMoveCache
+from chesspal_mcp_engine.config import settings
+from chesspal_mcp_engine.engine_pool import EnginePool
+from chesspal_mcp_engine.engine_wrapper import StockfishError
 from chesspal_mcp_engine.main import (
+    AnalyzeGameRequest,
+    AnalyzePositionRequest,
+    BatchBestMovesRequest,
+    BatchPosition,
     BoolResponse,
     ChessMoveRequest,
     ChessMoveResponse,
     GameStatusResponse,
     ListResponse,
+    OpenGameRequest,
+    PlayMoveRequest,
+    PositionBatchRequest,
     PositionRequest,
+    SessionBestMoveRequest,
+    SessionRequest,
+    ValidateMoveBatchRequest,
     ValidateMoveRequest,
+    analyze_game_tool,
+    analyze_position_tool,
+    batch_best_moves_tool,
+    close_game_tool,
     get_best_move_tool,
+    get_game_status_batch_tool,
     get_game_status_tool,
+    get_legal_moves_batch_tool,
     get_legal_moves_tool,
+    open_game_tool,
+    play_move_tool,
+    session_best_move_tool,
     validate_move_tool,
+    validate_moves_batch_tool,
 )
+from chesspal_mcp_engine.metrics import metrics
+from chesspal_mcp_engine.models import CandidateMove, SearchLimits, SearchResult
+from chesspal_mcp_engine.opening_book import OpeningBook
+from chesspal_mcp_engine.sessions import SessionManager
+from chesspal_mcp_engine.tablebase import SyzygyTablebase
 
 
 class MockEngine:
@@ -138,26 +171,526 @@ async def test_game_status_tool_invalid_fen():
 
 
 @pytest.mark.asyncio
-async def test_get_best_move_tool_success(test_positions):
+async def test_get_best_move_tool_success(test_positions, make_engine_pool):
     """Test the get_best_move_tool function success case."""
-    mock_engine = MagicMock(spec=StockfishEngine)
-    mock_engine.get_best_move.return_value = "e2e4"
+    mock_engine = MagicMock(spec=AsyncStockfishEngine)
+    mock_engine.search.return_value = SearchResult(best_move="e2e4")
 
-    with patch("chesspal_mcp_engine.main._engine", mock_engine):
+    with patch("chesspal_mcp_engine.main._engine_pool", await make_engine_pool(mock_engine)):
         request = ChessMoveRequest(fen=test_positions["STARTING_FEN"], move_history=[])
         response = await get_best_move_tool(request)
         expected = {"result": ChessMoveResponse(best_move_uci="e2e4").model_dump()}
         assert response == expected
-        mock_engine.get_best_move.assert_called_once_with(test_positions["STARTING_FEN"], [])
+        mock_engine.search.assert_awaited_once_with(
+            test_positions["STARTING_FEN"],
+            [],
+            SearchLimits(depth=10, movetime_ms=1000),
+            on_info=None,
+            deadline=None,
+            multipv=1,
+        )
+
+
+@pytest.mark.asyncio
+async def test_tools_record_metrics(test_positions, make_engine_pool):
+    """Test that tool calls, errors, cache lookups and the queue depth are exported as metrics."""
+    mock_engine = MagicMock(spec=AsyncStockfishEngine)
+    mock_engine.search.return_value = SearchResult(best_move="e2e4")
+    metrics.reset()
+
+    with (
+        patch("chesspal_mcp_engine.main._engine_pool", await make_engine_pool(mock_engine)),
+        patch("chesspal_mcp_engine.main._best_move_cache", BestMoveCache(max_size=8)),
+    ):
+        request = ChessMoveRequest(fen=test_positions["STARTING_FEN"], move_history=[])
+        await get_best_move_tool(request)
+        await get_best_move_tool(request)
+        await validate_move_tool(ValidateMoveRequest(fen="invalid fen", move="e2e4"))
+        text = metrics.render()
+
+    assert 'chesspal_tool_requests_total{tool="get_best_move_tool"} 2' in text
+    assert 'chesspal_tool_errors_total{tool="validate_move_tool"} 1' in text
+    assert 'chesspal_tool_latency_seconds_count{tool="get_best_move_tool"} 2' in text
+    assert 'chesspal_cache_hits_total{cache="best_move"} 1' in text
+    assert "chesspal_engine_queue_depth 0" in text
+
+
+@pytest.mark.asyncio
+async def test_get_best_move_tool_deadline_partial_result(test_positions, make_engine_pool):
+    """Test that a search stopped at its deadline is flagged partial and not cached."""
+    mock_engine = MagicMock(spec=AsyncStockfishEngine)
+    mock_engine.search.return_value = SearchResult(best_move="d2d4", depth=3, partial=True)
+    cache = BestMoveCache(max_size=10)
+
+    with (
+        patch("chesspal_mcp_engine.main._engine_pool", await make_engine_pool(mock_engine)),
+        patch("chesspal_mcp_engine.main._best_move_cache", cache),
+    ):
+        request = ChessMoveRequest(fen=test_positions["STARTING_FEN"], deadline_ms=50)
+        response = await get_best_move_tool(request)
+
+    assert response == {"result": {"best_move_uci": "d2d4", "partial": True}}
+    assert mock_engine.search.await_args.kwargs["deadline"] is not None
+    assert len(cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_get_best_move_tool_stream_info(test_positions, make_engine_pool):
+    """Test that streamed search progress is sent as MCP progress notifications."""
+    mock_engine = MagicMock(spec=AsyncStockfishEngine)
+
+    async def search(fen, move_history, limits, on_info=None, **kwargs):
+        await on_info({"depth": 1, "score_cp": 20, "pv": ["e2e4"]})
+        await on_info({"depth": 2, "score_cp": 25, "pv": ["e2e4", "e7e5"]})
+        return SearchResult(best_move="e2e4", score_cp=25, depth=2)
+
+    mock_engine.search.side_effect = search
+    ctx = MagicMock()
+    ctx.report_progress = AsyncMock()
+    ctx.info = AsyncMock()
+
+    with patch("chesspal_mcp_engine.main._engine_pool", await make_engine_pool(mock_engine)):
+        request = ChessMoveRequest(fen=test_positions["STARTING_FEN"], depth=2, stream_info=True)
+        response = await get_best_move_tool(request, ctx)
+
+    assert response == {"result": {"best_move_uci": "e2e4"}}
+    assert [call.args for call in ctx.report_progress.await_args_list] == [(1, 2), (2, 2)]
+    assert '"score_cp": 25' in ctx.info.await_args.args[0]
+
+
+@pytest.mark.asyncio
+async def test_get_best_move_tool_search_limits(test_positions, make_engine_pool):
+    """Test that per-request search limits reach the engine, capped by settings."""
+    mock_engine = MagicMock(spec=AsyncStockfishEngine)
+    mock_engine.search.return_value = SearchResult(best_move="e2e4")
+
+    with patch("chesspal_mcp_engine.main._engine_pool", await make_engine_pool(mock_engine)):
+        request = ChessMoveRequest(fen=test_positions["STARTING_FEN"], depth=99, nodes=5000)
+        response = await get_best_move_tool(request)
+        assert response == {"result": {"best_move_uci": "e2e4"}}
+        limits = mock_engine.search.await_args.args[2]
+        assert limits == SearchLimits(depth=30, nodes=5000, movetime_ms=10000)
+
+
+@pytest.mark.asyncio
+async def test_get_best_move_tool_cache(test_positions, make_engine_pool):
+    """Test that a repeated position with the same limits is served from the cache."""
+    mock_engine = MagicMock(spec=AsyncStockfishEngine)
+    mock_engine.search.return_value = SearchResult(best_move="e7e5")
+    cache = BestMoveCache(max_size=10)
+
+    with (
+        patch("chesspal_mcp_engine.main._engine_pool", await make_engine_pool(mock_engine)),
+        patch("chesspal_mcp_engine.main._best_move_cache", cache),
+    ):
+        # The same position reached from the start FEN and from its own FEN
+        first = ChessMoveRequest(fen=test_positions["STARTING_FEN"], move_history=["e2e4"])
+        second = ChessMoveRequest(fen="rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq - 0 1")
+        assert await get_best_move_tool(first) == {"result": {"best_move_uci": "e7e5"}}
+        assert await get_best_move_tool(second) == {"result": {"best_move_uci": "e7e5"}}
+        mock_engine.search.assert_awaited_once()
+
+        # Different limits are a different cache entry
+        await get_best_move_tool(ChessMoveRequest(fen=test_positions["STARTING_FEN"], move_history=["e2e4"], depth=5))
+        assert mock_engine.search.await_count == 2
+        assert cache.stats()["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_get_best_move_tool_analysis_cache(test_positions, make_engine_pool, tmp_path):
+    """Test that searches are persisted and later served from the analysis cache."""
+    mock_engine = MagicMock(spec=AsyncStockfishEngine)
+    mock_engine.search.return_value = SearchResult(best_move="d2d4", score_cp=25, depth=10, pv=["d2d4"])
+    analysis_cache = AnalysisCache(tmp_path / "analysis.db", max_entries=10)
+    request = ChessMoveRequest(fen=test_positions["STARTING_FEN"])
+
+    try:
+        with (
+            patch("chesspal_mcp_engine.main._engine_pool", await make_engine_pool(mock_engine)),
+            patch("chesspal_mcp_engine.main._analysis_cache", analysis_cache),
+        ):
+            assert await get_best_move_tool(request) == {"result": {"best_move_uci": "d2d4"}}
+
+        # A restarted server without a warm engine answers from disk
+        with (
+            patch("chesspal_mcp_engine.main._engine_pool", None),
+            patch("chesspal_mcp_engine.main._analysis_cache", analysis_cache),
+        ):
+            assert await get_best_move_tool(request) == {"result": {"best_move_uci": "d2d4"}}
+        mock_engine.search.assert_awaited_once()
+    finally:
+        analysis_cache.close()
+
+
+@pytest.mark.asyncio
+async def test_get_best_move_tool_coalesces_concurrent_requests(test_positions, make_engine_pool):
+    """Test that identical concurrent requests share one engine search."""
+    mock_engine = MagicMock(spec=AsyncStockfishEngine)
+
+    async def slow_search(*args, **kwargs):
+        await asyncio.sleep(0.01)
+        return SearchResult(best_move="c2c4")
+
+    mock_engine.search.side_effect = slow_search
+    pool = await make_engine_pool(mock_engine, MagicMock(spec=AsyncStockfishEngine))
+
+    with patch("chesspal_mcp_engine.main._engine_pool", pool):
+        request = ChessMoveRequest(fen=test_positions["STARTING_FEN"])
+        responses = await asyncio.gather(*(get_best_move_tool(request) for _ in range(4)))
+
+    assert responses == [{"result": {"best_move_uci": "c2c4"}}] * 4
+    mock_engine.search.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_live_request_does_not_join_batch_search(test_positions, make_engine_pool):
+    """Test that a live request searches on its own rather than waiting on an identical batch search."""
+    engines = [MagicMock(spec=AsyncStockfishEngine) for _ in range(2)]
+
+    async def slow_search(*args, **kwargs):
+        await asyncio.sleep(0.01)
+        return SearchResult(best_move="c2c4")
+
+    for engine in engines:
+        engine.search.side_effect = slow_search
+    pool = await make_engine_pool(*engines)
+
+    with patch("chesspal_mcp_engine.main._engine_pool", pool):
+        fen = test_positions["STARTING_FEN"]
+        batch = asyncio.ensure_future(batch_best_moves_tool(BatchBestMovesRequest(positions=[BatchPosition(fen=fen)])))
+        await asyncio.sleep(0)
+        assert await get_best_move_tool(ChessMoveRequest(fen=fen)) == {"result": {"best_move_uci": "c2c4"}}
+        await batch
+
+    assert sum(engine.search.await_count for engine in engines) == 2
+
+
+@pytest.mark.asyncio
+async def test_analysis_does_not_join_batch_search(test_positions, make_engine_pool):
+    """Test that a multipv=2 analysis does not share a batch search, whose priority also equals 2."""
+    engines = [MagicMock(spec=AsyncStockfishEngine) for _ in range(2)]
+    candidates = [
+        CandidateMove(rank=1, move_uci="c2c4", score_cp=20, pv=["c2c4"]),
+        CandidateMove(rank=2, move_uci="d2d4", score_cp=15, pv=["d2d4"]),
+    ]
+
+    async def slow_search(*args, multipv=1, **kwargs):
+        await asyncio.sleep(0.01)
+        return SearchResult(best_move="c2c4", candidates=candidates[:multipv])
+
+    for engine in engines:
+        engine.search.side_effect = slow_search
+    pool = await make_engine_pool(*engines)
+
+    with patch("chesspal_mcp_engine.main._engine_pool", pool):
+        fen = test_positions["STARTING_FEN"]
+        batch = asyncio.ensure_future(
+            batch_best_moves_tool(BatchBestMovesRequest(positions=[BatchPosition(fen=fen)], use_book=False))
+        )
+        await asyncio.sleep(0)
+        response = await analyze_position_tool(AnalyzePositionRequest(fen=fen, multipv=2))
+        await batch
+
+    assert [candidate["move_uci"] for candidate in response["result"]["candidates"]] == ["c2c4", "d2d4"]
+    assert sum(engine.search.await_count for engine in engines) == 2
+
+
+@pytest.mark.asyncio
+async def test_get_best_move_tool_opening_book(test_positions, make_engine_pool, write_polyglot_book):
+    """Test that book positions are answered without searching unless the book is bypassed."""
+    mock_engine = MagicMock(spec=AsyncStockfishEngine)
+    mock_engine.search.return_value = SearchResult(best_move="g1f3")
+    book = OpeningBook(write_polyglot_book([(chess.Board(), "e2e4", 1)]), selection="best")
+
+    try:
+        with (
+            patch("chesspal_mcp_engine.main._engine_pool", await make_engine_pool(mock_engine)),
+            patch("chesspal_mcp_engine.main._opening_book", book),
+        ):
+            request = ChessMoveRequest(fen=test_positions["STARTING_FEN"])
+            assert await get_best_move_tool(request) == {"result": {"best_move_uci": "e2e4"}}
+            mock_engine.search.assert_not_awaited()
+
+            request = ChessMoveRequest(fen=test_positions["STARTING_FEN"], use_book=False)
+            assert await get_best_move_tool(request) == {"result": {"best_move_uci": "g1f3"}}
+            mock_engine.search.assert_awaited_once()
+    finally:
+        book.close()
+
+
+@pytest.mark.asyncio
+async def test_get_best_move_tool_tablebase(make_engine_pool):
+    """Test that tablebase positions are answered without searching."""
+    mock_engine = MagicMock(spec=AsyncStockfishEngine)
+    tablebase = MagicMock(spec=SyzygyTablebase)
+    tablebase.find_move_async.return_value = "a1a5"
+
+    with (
+        patch("chesspal_mcp_engine.main._engine_pool", await make_engine_pool(mock_engine)),
+        patch("chesspal_mcp_engine.main._tablebase", tablebase),
+    ):
+        response = await get_best_move_tool(ChessMoveRequest(fen="8/8/8/4k3/8/8/8/R3K3 w - - 0 1"))
+
+    assert response == {"result": {"best_move_uci": "a1a5"}}
+    mock_engine.search.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_batch_best_moves_tool_unexpected_error(make_engine_pool):
+    """Test that an exception escaping one position's lookup fails only that position."""
+    mock_engine = MagicMock(spec=AsyncStockfishEngine)
+    mock_engine.search.return_value = SearchResult(best_move="e2e4")
+    tablebase = MagicMock(spec=SyzygyTablebase)
+    tablebase.find_move_async.side_effect = [OSError("tablebase file unreadable"), None]
+
+    request = BatchBestMovesRequest(
+        positions=[BatchPosition(fen="8/8/8/4k3/8/8/8/R3K3 w - - 0 1"), BatchPosition(fen=chess.STARTING_FEN)],
+        use_book=False,
+    )
+    with (
+        patch("chesspal_mcp_engine.main._engine_pool", await make_engine_pool(mock_engine)),
+        patch("chesspal_mcp_engine.main._tablebase", tablebase),
+    ):
+        response = await batch_best_moves_tool(request)
+
+    assert response["result"]["results"] == [
+        {"error": "Internal server error"},
+        {"result": {"best_move_uci": "e2e4"}},
+    ]
 
 
 @pytest.mark.asyncio
-async def test_get_best_move_tool_engine_error(test_positions):
+async def test_batch_best_moves_tool(test_positions, make_engine_pool):
+    """Test batch best moves with per-position errors, progress and throughput."""
+    engines = [MagicMock(spec=AsyncStockfishEngine), MagicMock(spec=AsyncStockfishEngine)]
+    for engine in engines:
+        engine.search.return_value = SearchResult(best_move="e2e4")
+    ctx = MagicMock()
+    ctx.report_progress = AsyncMock()
+    ctx.info = AsyncMock()
+
+    request = BatchBestMovesRequest(
+        positions=[
+            BatchPosition(fen=test_positions["STARTING_FEN"]),
+            BatchPosition(fen="invalid fen"),
+            BatchPosition(fen=test_positions["STARTING_FEN"], move_history=["d2d4"]),
+        ],
+        depth=5,
+    )
+    with patch("chesspal_mcp_engine.main._engine_pool", await make_engine_pool(*engines)):
+        response = await batch_best_moves_tool(request, ctx)
+
+    result = response["result"]
+    assert result["positions"] == 3
+    assert result["results"][0] == {"result": {"best_move_uci": "e2e4"}}
+    assert "Invalid FEN format" in result["results"][1]["error"]
+    assert result["results"][2] == {"result": {"best_move_uci": "e2e4"}}
+    assert result["positions_per_second"] > 0
+    ctx.report_progress.assert_awaited_with(3, 3)
+    assert ctx.info.await_count == 3
+    limits = engines[0].search.await_args.args[2]
+    assert limits.depth == 5
+
+
+@pytest.mark.asyncio
+async def test_batch_best_moves_tool_not_initialized(test_positions):
+    """Test the batch tool when the engine pool is not initialized."""
+    with patch("chesspal_mcp_engine.main._engine_pool", None):
+        request = BatchBestMovesRequest(positions=[BatchPosition(fen=test_positions["STARTING_FEN"])])
+        assert await batch_best_moves_tool(request) == {"error": "Engine not initialized"}
+
+
+@pytest.mark.asyncio
+async def test_analyze_position_tool(test_positions, make_engine_pool):
+    """Test that the candidates of one MultiPV search are returned with the best line's evaluation."""
+    mock_engine = MagicMock(spec=AsyncStockfishEngine)
+    mock_engine.search.return_value = SearchResult(
+        best_move="e2e4",
+        score_cp=35,
+        depth=12,
+        candidates=[
+            CandidateMove(rank=1, move_uci="e2e4", score_cp=35, depth=12, pv=["e2e4", "e7e5"]),
+            CandidateMove(rank=2, move_uci="d2d4", score_cp=30, depth=12, pv=["d2d4"]),
+        ],
+    )
+
+    with (
+        patch("chesspal_mcp_engine.main._engine_pool", await make_engine_pool(mock_engine)),
+        patch.object(settings, "CHESSPAL_ENGINE_MAX_MULTIPV", 2),
+    ):
+        request = AnalyzePositionRequest(fen=test_positions["STARTING_FEN"], multipv=5, depth=12)
+        response = await analyze_position_tool(request)
+
+    result = response["result"]
+    assert result["best_move_uci"] == "e2e4"
+    assert result["evaluation"] == 0.35
+    assert result["depth"] == 12
+    assert [candidate["move_uci"] for candidate in result["candidates"]] == ["e2e4", "d2d4"]
+    assert mock_engine.search.await_args.kwargs["multipv"] == 2
+
+
+@pytest.mark.asyncio
+async def test_analyze_position_tool_single_candidate(fake_uci_engine):
+    """Test that analyzing with multipv=1 returns the best line as its single candidate."""
+    pool = EnginePool(size=1, threads=1, hash_mb=16)
+    await pool.start()
+    try:
+        with patch("chesspal_mcp_engine.main._engine_pool", pool):
+            response = await analyze_position_tool(AnalyzePositionRequest(fen=chess.STARTING_FEN, multipv=1))
+    finally:
+        await pool.close()
+
+    candidates = response["result"]["candidates"]
+    assert [(candidate["rank"], candidate["move_uci"]) for candidate in candidates] == [(1, "e2e4")]
+
+
+@pytest.mark.asyncio
+async def test_analyze_position_tool_invalid_fen():
+    """Test that analyzing an invalid FEN fails before searching."""
+    response = await analyze_position_tool(AnalyzePositionRequest(fen="invalid fen"))
+    assert "Invalid FEN format" in response["error"]
+
+
+@pytest.mark.asyncio
+async def test_analyze_game_tool_pgn(make_engine_pool):
+    """Test analyzing a PGN on one engine with per-ply progress."""
+    mock_engine = MagicMock(spec=AsyncStockfishEngine)
+    mock_engine.search.return_value = SearchResult(best_move="e2e4", score_cp=0, depth=8)
+    ctx = MagicMock()
+    ctx.report_progress = AsyncMock()
+    ctx.info = AsyncMock()
+
+    with patch("chesspal_mcp_engine.main._engine_pool", await make_engine_pool(mock_engine)):
+        request = AnalyzeGameRequest(pgn='[Event "Test"]\n\n1. e4 e5 2. Nf3 *', depth=8)
+        response = await analyze_game_tool(request, ctx)
+
+    plies = response["result"]["plies"]
+    assert [ply["move_uci"] for ply in plies] == ["e2e4", "e7e5", "g1f3"]
+    assert mock_engine.search.await_count == 4
+    ctx.report_progress.assert_awaited_with(3, 3)
+
+
+@pytest.mark.asyncio
+async def test_analyze_game_tool_yields_to_live_requests(make_engine_pool):
+    """Test that a live move request is served between the plies of a game analysis."""
+    mock_engine = MagicMock(spec=AsyncStockfishEngine)
+    live_fen = "4k3/8/8/8/8/8/4P3/4K3 w - - 0 1"
+    searched = []
+
+    async def search(fen, moves, limits, **kwargs):
+        searched.append("live" if fen == live_fen else "ply")
+        await asyncio.sleep(0.01)
+        return SearchResult(best_move="e2e4", score_cp=0)
+
+    mock_engine.search.side_effect = search
+
+    with patch("chesspal_mcp_engine.main._engine_pool", await make_engine_pool(mock_engine)):
+        request = AnalyzeGameRequest(moves=["e2e4", "e7e5", "g1f3"])
+        game = asyncio.ensure_future(analyze_game_tool(request))
+        await asyncio.sleep(0.005)
+        live = await get_best_move_tool(ChessMoveRequest(fen=live_fen))
+        response = await game
+
+    assert live["result"]["best_move_uci"] == "e2e4"
+    assert len(response["result"]["plies"]) == 3
+    assert searched.index("live") < len(searched) - 1
+
+
+@pytest.mark.asyncio
+async def test_analyze_game_tool_uci_moves(make_engine_pool):
+    """Test analyzing a UCI move list from a custom start position."""
+    mock_engine = MagicMock(spec=AsyncStockfishEngine)
+    mock_engine.search.return_value = SearchResult(best_move="e1e2", score_cp=500)
+    fen = "4k3/8/8/8/8/8/4P3/4K3 w - - 0 1"
+
+    with patch("chesspal_mcp_engine.main._engine_pool", await make_engine_pool(mock_engine)):
+        response = await analyze_game_tool(AnalyzeGameRequest(moves=["e2e4"], fen=fen))
+
+    assert response["result"]["plies"][0]["move_san"] == "e4"
+    mock_engine.search.assert_any_await(fen, ["e2e4"], SearchLimits(depth=10, movetime_ms=1000))
+
+
+@pytest.mark.asyncio
+async def test_analyze_game_tool_invalid_game():
+    """Test that illegal moves and missing input are rejected."""
+    response = await analyze_game_tool(AnalyzeGameRequest(moves=["e2e5"]))
+    assert "Invalid game" in response["error"]
+    response = await analyze_game_tool(AnalyzeGameRequest())
+    assert "Either pgn or moves is required" in response["error"]
+    response = await analyze_game_tool(AnalyzeGameRequest(pgn="1. e4 e5 2. Ke3 *"))
+    assert "Invalid game" in response["error"]
+
+
+@pytest.mark.asyncio
+async def test_game_session_tools(make_engine_pool):
+    """Test playing a game in a session, searching on the same engine each time."""
+    first, second = MagicMock(spec=AsyncStockfishEngine), MagicMock(spec=AsyncStockfishEngine)
+    for engine in (first, second):
+        engine.get_best_move.return_value = "g1f3"
+    pool = await make_engine_pool(first, second)
+
+    with (
+        patch("chesspal_mcp_engine.main._engine_pool", pool),
+        patch("chesspal_mcp_engine.main._sessions", SessionManager(max_sessions=10, idle_timeout=60)),
+    ):
+        opened = await open_game_tool(OpenGameRequest(moves=["e2e4", "e7e5"]))
+        session_id = opened["result"]["session_id"]
+
+        response = await session_best_move_tool(SessionBestMoveRequest(session_id=session_id, depth=5))
+        assert response == {"result": {"best_move_uci": "g1f3"}}
+        engine = first if first.get_best_move.await_count else second
+
+        played = await play_move_tool(PlayMoveRequest(session_id=session_id, move="g1f3"))
+        assert played["result"]["fen"].startswith("rnbqkbnr/pppp1ppp/8/4p3/4P3/5N2")
+        await session_best_move_tool(SessionBestMoveRequest(session_id=session_id, depth=5))
+
+        assert engine.get_best_move.await_count == 2
+        fen, moves, _ = engine.get_best_move.await_args.args
+        assert moves == ["g1f3"]
+        assert fen.startswith("rnbqkbnr/pppp1ppp/8/4p3/4P3/8")
+
+        assert await close_game_tool(SessionRequest(session_id=session_id)) == {"result": True}
+        closed = await play_move_tool(PlayMoveRequest(session_id=session_id, move="b8c6"))
+        assert "Unknown or expired session" in closed["error"]
+
+
+@pytest.mark.asyncio
+async def test_play_move_tool_illegal_move():
+    """Test that an illegal move leaves the session's board unchanged."""
+    with patch("chesspal_mcp_engine.main._sessions", SessionManager(max_sessions=10, idle_timeout=60)):
+        opened = await open_game_tool(OpenGameRequest())
+        session_id = opened["result"]["session_id"]
+
+        assert await play_move_tool(PlayMoveRequest(session_id=session_id, move="e1e2")) == {
+            "error": "Illegal move: e1e2"
+        }
+        invalid = await play_move_tool(PlayMoveRequest(session_id=session_id, move="e2e9"))
+        assert "Invalid move format" in invalid["error"]
+
+
+@pytest.mark.asyncio
+async def test_open_game_tool_invalid_fen():
+    """Test that opening a session from an invalid FEN fails."""
+    with patch("chesspal_mcp_engine.main._sessions", SessionManager(max_sessions=10, idle_timeout=60)):
+        response = await open_game_tool(OpenGameRequest(fen="invalid fen"))
+    assert "Invalid FEN format" in response["error"]
+
+
+@pytest.mark.asyncio
+async def test_get_best_move_tool_invalid_move_history(test_positions):
+    """Test that an illegal move history is rejected before searching."""
+    request = ChessMoveRequest(fen=test_positions["STARTING_FEN"], move_history=["e2e5"])
+    response = await get_best_move_tool(request)
+    assert "Invalid move history" in response["error"]
+
+
+@pytest.mark.asyncio
+async def test_get_best_move_tool_engine_error(test_positions, make_engine_pool):
     """Test the get_best_move_tool function when engine fails."""
-    mock_engine = MagicMock(spec=StockfishEngine)
-    mock_engine.get_best_move.side_effect = StockfishError("Engine failed")
+    mock_engine = MagicMock(spec=AsyncStockfishEngine)
+    mock_engine.search.side_effect = StockfishError("Engine failed")
 
-    with patch("chesspal_mcp_engine.main._engine", mock_engine):
+    with patch("chesspal_mcp_engine.main._engine_pool", await make_engine_pool(mock_engine)):
         request = ChessMoveRequest(fen=test_positions["STARTING_FEN"], move_history=[])
         response = await get_best_move_tool(request)
         assert "error" in response
@@ -167,7 +700,7 @@ async def test_get_best_move_tool_engine_error(test_positions):
 @pytest.mark.asyncio
 async def test_get_best_move_tool_not_initialized():
     """Test the get_best_move_tool function when engine is not initialized."""
-    with patch("chesspal_mcp_engine.main._engine", None):
+    with patch("chesspal_mcp_engine.main._engine_pool", None):
         request = ChessMoveRequest(
             fen="rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
             move_history=[],
@@ -178,13 +711,61 @@ async def test_get_best_move_tool_not_initialized():
 
 
 @pytest.mark.asyncio
-async def test_get_best_move_tool_unexpected_error(test_positions):
+async def test_get_best_move_tool_unexpected_error(test_positions, make_engine_pool):
     """Test the get_best_move_tool function when an unexpected error occurs."""
-    mock_engine = MagicMock(spec=StockfishEngine)
-    mock_engine.get_best_move.side_effect = RuntimeError("Unexpected error")
+    mock_engine = MagicMock(spec=AsyncStockfishEngine)
+    mock_engine.search.side_effect = RuntimeError("Unexpected error")
 
-    with patch("chesspal_mcp_engine.main._engine", mock_engine):
+    with patch("chesspal_mcp_engine.main._engine_pool", await make_engine_pool(mock_engine)):
         request = ChessMoveRequest(fen=test_positions["STARTING_FEN"], move_history=[])
         response = await get_best_move_tool(request)
         assert "error" in response
         assert response["error"] == "Internal server error"
+
+
+@pytest.mark.asyncio
+async def test_validate_moves_batch_tool(test_positions):
+    """Test batch move validation with per-item errors."""
+    request = ValidateMoveBatchRequest(
+        items=[
+            ValidateMoveRequest(fen=test_positions["STARTING_FEN"], move="e2e4"),
+            ValidateMoveRequest(fen=test_positions["STARTING_FEN"], move="e1e2"),
+            ValidateMoveRequest(fen=test_positions["STARTING_FEN"], move="e2e9"),
+            ValidateMoveRequest(fen="invalid fen", move="e2e4"),
+        ]
+    )
+    response = await validate_moves_batch_tool(request)
+    results = response["result"]
+    assert results[0] == {"result": True}
+    assert results[1] == {"result": False}
+    assert "Invalid move format" in results[2]["error"]
+    assert "Invalid FEN format" in results[3]["error"]
+
+
+@pytest.mark.asyncio
+async def test_get_legal_moves_batch_tool(test_positions):
+    """Test batch legal move generation with per-item errors."""
+    request = PositionBatchRequest(fens=[test_positions["STARTING_FEN"], test_positions["CHECKMATE_FEN"], "bad"])
+    results = (await get_legal_moves_batch_tool(request))["result"]
+    assert len(results[0]["result"]) == 20
+    assert results[1] == {"result": []}
+    assert "Invalid FEN format" in results[2]["error"]
+
+
+@pytest.mark.asyncio
+async def test_get_game_status_batch_tool(test_positions):
+    """Test batch game status with per-item errors."""
+    request = PositionBatchRequest(
+        fens=[test_positions["STARTING_FEN"], test_positions["CHECKMATE_FEN"], test_positions["STALEMATE_FEN"], "bad"]
+    )
+    results = (await get_game_status_batch_tool(request))["result"]
+    assert results[0] == {"result": {"status": "IN_PROGRESS", "winner": None}}
+    assert results[1] == {"result": {"status": "CHECKMATE", "winner": "BLACK"}}
+    assert results[2]["result"]["status"] == "STALEMATE"
+    assert "Invalid FEN format" in results[3]["error"]
+
+
+def test_batch_request_size_limit():
+    """Test that batches larger than the configured maximum are rejected."""
+    with pytest.raises(ValidationError):
+        PositionBatchRequest(fens=["8/8/8/8/8/8/8/8 w - - 0 1"] * (settings.CHESSPAL_MAX_BATCH_SIZE + 1))
@@ -4,6 +4,7 @@ import pytest
 from pytest_mock import MockerFixture
 
 import chesspal_mcp_engine.main as main_module
+from chesspal_mcp_engine.async_engine import AsyncStockfishEngine
 from chesspal_mcp_engine.main import (
     ChessMoveRequest,
     PositionRequest,
@@ -13,14 +14,15 @@ from chesspal_mcp_engine.main import (
     get_legal_moves_tool,
     validate_move_tool,
 )
+from chesspal_mcp_engine.models import SearchResult
 
 
 @pytest.fixture
-def mock_engine(mocker: MockerFixture):
-    """Fixture for mocking StockfishEngine."""
-    mock_engine = mocker.MagicMock()
-    mock_engine.get_best_move.return_value = "e2e4"
-    mocker.patch.object(main_module, "_engine", mock_engine)
+async def mock_engine(mocker: MockerFixture, make_engine_pool):
+    """Fixture for mocking AsyncStockfishEngine."""
+    mock_engine = mocker.MagicMock(spec=AsyncStockfishEngine)
+    mock_engine.search.return_value = SearchResult(best_move="e2e4")
+    mocker.patch.object(main_module, "_engine_pool", await make_engine_pool(mock_engine))
     return mock_engine
 
 
@@ -30,8 +32,8 @@ class TestMainEngineAdditional:
     @pytest.mark.asyncio
     async def test_get_best_move_tool_engine_not_initialized(self, mocker: MockerFixture):
         """Test get_best_move_tool when engine is not initialized."""
-        # Ensure _engine is None
-        mocker.patch.object(main_module, "_engine", None)
+        # Ensure _engine_pool is None
+        mocker.patch.object(main_module, "_engine_pool", None)
 
         # Call the function
         request = ChessMoveRequest(fen="rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1", move_history=[])
@@ -78,7 +80,7 @@ class TestMainEngineAdditional:
     async def test_get_best_move_tool_exception_handling(self, mock_engine, mocker: MockerFixture):
         """Test get_best_move_tool error handling."""
         # Configure mock engine to raise exceptions
-        mock_engine.get_best_move.side_effect = Exception("Unexpected error")
+        mock_engine.search.side_effect = Exception("Unexpected error")
 
         # Call the function
         request = ChessMoveRequest(fen="rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1", move_history=[])
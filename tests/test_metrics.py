@@ -0,0 +1,63 @@
+"""Tests for the Prometheus metrics registry."""
+
+from chesspal_mcp_engine.metrics import Histogram, Metrics
+
+
+def test_histogram_buckets_are_cumulative():
+    """Test that bucket counts include every smaller bucket."""
+    histogram = Histogram(buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value)
+
+    assert histogram.cumulative() == [("0.1", 2), ("1", 3), ("+Inf", 4)]
+    assert histogram.count == 4
+    assert histogram.sum == 3.65
+
+
+def test_render_tool_and_search_metrics():
+    """Test that tool calls and searches are rendered in the text format."""
+    metrics = Metrics(buckets=(0.1, 1.0))
+    metrics.record_tool("get_best_move_tool", 0.05, error=False)
+    metrics.record_tool("get_best_move_tool", 0.5, error=True)
+    metrics.record_search(0.4, nodes=1000, nps=2500)
+    metrics.record_search(0.2)
+
+    text = metrics.render()
+
+    assert "# TYPE chesspal_tool_requests_total counter" in text
+    assert 'chesspal_tool_requests_total{tool="get_best_move_tool"} 2' in text
+    assert 'chesspal_tool_errors_total{tool="get_best_move_tool"} 1' in text
+    assert 'chesspal_tool_latency_seconds_bucket{tool="get_best_move_tool",le="0.1"} 1' in text
+    assert 'chesspal_tool_latency_seconds_bucket{tool="get_best_move_tool",le="+Inf"} 2' in text
+    assert 'chesspal_tool_latency_seconds_count{tool="get_best_move_tool"} 2' in text
+    assert "chesspal_engine_search_seconds_count 2" in text
+    assert "chesspal_engine_search_nodes_total 1000" in text
+    assert "chesspal_engine_nodes_per_second 2500" in text
+    assert text.endswith("\n")
+
+
+def test_registered_collectors_are_read_on_render():
+    """Test that collector values are read at render time and empty families are skipped."""
+    metrics = Metrics()
+    state = {"hits": {}}
+    metrics.register("chesspal_cache_hits_total", "Cache hits", "counter", lambda: state["hits"], label="cache")
+
+    assert "chesspal_cache_hits_total" not in metrics.render()
+
+    state["hits"] = {"best_move": 3}
+    text = metrics.render()
+    assert "# HELP chesspal_cache_hits_total Cache hits" in text
+    assert 'chesspal_cache_hits_total{cache="best_move"} 3' in text
+
+
+def test_reset_keeps_collectors():
+    """Test that reset() clears recorded samples but keeps registered collectors."""
+    metrics = Metrics()
+    metrics.register("chesspal_engine_queue_depth", "Waiting requests", "gauge", lambda: {"": 2})
+    metrics.record_tool("get_best_move_tool", 0.01, error=False)
+
+    metrics.reset()
+
+    text = metrics.render()
+    assert "get_best_move_tool" not in text
+    assert "chesspal_engine_queue_depth 2" in text
@@ -3,7 +3,7 @@
 import pytest
 from pydantic import ValidationError
 
-from chesspal_mcp_engine.models import BestMoveResponse, GameStatusResponse, PositionRequest
+from chesspal_mcp_engine.models import BestMoveResponse, GameStatusResponse, PositionRequest, SearchLimits
 
 
 class TestPositionRequest:
@@ -80,3 +80,41 @@ class TestBestMoveResponse:
         """Test that best_move_uci is required."""
         with pytest.raises(ValidationError):
             BestMoveResponse(best_move_uci=None)  # type: ignore
+
+
+class TestSearchLimits:
+    """Tests for the SearchLimits model."""
+
+    def test_resolve_defaults(self):
+        """Test that a request without limits uses the configured depth and time."""
+        limits = SearchLimits.resolve()
+        assert limits == SearchLimits(depth=10, movetime_ms=1000)
+        assert limits.to_go_command() == "go movetime 1000 depth 10"
+
+    def test_resolve_caps(self):
+        """Test that requested limits are clamped and always bounded in time."""
+        limits = SearchLimits.resolve(depth=500, nodes=10**12, mate=300)
+        assert limits.depth == 30
+        assert limits.nodes == 50_000_000
+        assert limits.mate == 30
+        assert limits.movetime_ms == 10000
+
+    def test_resolve_movetime_only(self):
+        """Test that a requested move time replaces the default depth."""
+        limits = SearchLimits.resolve(movetime_ms=50)
+        assert limits.to_go_command() == "go movetime 50"
+        assert limits.response_timeout() == pytest.approx(5.05)
+
+    def test_go_command_all_limits(self):
+        """Test the go command with every limit set."""
+        limits = SearchLimits(depth=12, nodes=1000, movetime_ms=200, mate=3)
+        assert limits.to_go_command() == "go movetime 200 depth 12 nodes 1000 mate 3"
+
+    def test_invalid_limits(self):
+        """Test that non-positive limits are rejected."""
+        with pytest.raises(ValidationError):
+            SearchLimits(depth=0)
+
+    def test_hashable(self):
+        """Test that limits can be used as cache keys."""
+        assert hash(SearchLimits(depth=5)) == hash(SearchLimits(depth=5))
@@ -0,0 +1,62 @@
+"""Tests for the Polyglot opening book."""
+
+import random
+
+import chess
+import pytest
+
+from chesspal_mcp_engine.opening_book import OpeningBook
+
+
+@pytest.fixture
+def book_path(write_polyglot_book):
+    """Provide a book with two moves from the starting position."""
+    return write_polyglot_book([(chess.Board(), "e2e4", 100), (chess.Board(), "d2d4", 1)])
+
+
+def test_best_selection(book_path):
+    """Test that best selection always returns the highest weighted move."""
+    book = OpeningBook(book_path, selection="best")
+    try:
+        assert book.find_move(chess.Board()) == "e2e4"
+    finally:
+        book.close()
+
+
+def test_weighted_selection(book_path):
+    """Test that weighted selection returns book moves."""
+    book = OpeningBook(book_path, rng=random.Random(1))
+    try:
+        moves = {book.find_move(chess.Board()) for _ in range(50)}
+        assert moves <= {"e2e4", "d2d4"}
+        assert "e2e4" in moves
+    finally:
+        book.close()
+
+
+def test_miss_and_stats(book_path):
+    """Test that positions outside the book are misses."""
+    board = chess.Board()
+    board.push_uci("g1f3")
+    book = OpeningBook(book_path, selection="best")
+    try:
+        assert book.find_move(board) is None
+        assert book.find_move(chess.Board()) == "e2e4"
+        stats = book.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == 0.5
+    finally:
+        book.close()
+
+
+def test_invalid_selection(book_path):
+    """Test that an unknown selection mode is rejected."""
+    with pytest.raises(ValueError):
+        OpeningBook(book_path, selection="random")
+
+
+def test_missing_file(tmp_path):
+    """Test that a missing book file raises OSError."""
+    with pytest.raises(OSError):
+        OpeningBook(tmp_path / "missing.bin")
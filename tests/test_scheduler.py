@@ -0,0 +1,102 @@
+"""Tests for the priority-aware engine request scheduler."""
+
+import pytest
+
+from chesspal_mcp_engine.scheduler import Priority, QueueFullError, RequestScheduler
+
+
+def served_order(scheduler, waiters):
+    """Pop every waiter and return their names in the order they are served."""
+    names = {waiter: name for name, waiter in waiters.items()}
+    order = []
+    while (waiter := scheduler.pop()) is not None:
+        order.append(names[waiter])
+    return order
+
+
+@pytest.mark.asyncio
+async def test_higher_priority_is_served_first():
+    """Test that live requests overtake background work queued before them."""
+    scheduler = RequestScheduler()
+    waiters = {
+        "batch": scheduler.enqueue(Priority.BATCH),
+        "analysis": scheduler.enqueue(Priority.ANALYSIS),
+        "live": scheduler.enqueue(Priority.LIVE),
+    }
+
+    assert served_order(scheduler, waiters) == ["live", "analysis", "batch"]
+    assert len(scheduler) == 0
+
+
+@pytest.mark.asyncio
+async def test_clients_take_turns_within_a_priority():
+    """Test that a client with many queued requests does not starve another client."""
+    scheduler = RequestScheduler()
+    waiters = {f"a{i}": scheduler.enqueue(Priority.BATCH, "a") for i in range(3)}
+    waiters["b0"] = scheduler.enqueue(Priority.BATCH, "b")
+    waiters["b1"] = scheduler.enqueue(Priority.BATCH, "b")
+
+    assert served_order(scheduler, waiters) == ["a0", "b0", "a1", "b1", "a2"]
+
+
+@pytest.mark.asyncio
+async def test_full_queue_rejects_right_away():
+    """Test that requests beyond the queue limit are rejected and counted."""
+    scheduler = RequestScheduler(max_queue=2)
+    scheduler.enqueue(Priority.LIVE)
+    scheduler.enqueue(Priority.BATCH)
+
+    with pytest.raises(QueueFullError, match="Engine queue is full"):
+        scheduler.enqueue(Priority.BATCH)
+
+    stats = scheduler.stats()
+    assert stats["batch"]["rejected"] == 1
+    assert stats["batch"]["waiting"] == 1
+    assert stats["live"]["enqueued"] == 1
+
+
+@pytest.mark.asyncio
+async def test_full_queue_of_background_work_admits_live_requests():
+    """Test that only waiters of the same or a higher priority count towards the limit."""
+    scheduler = RequestScheduler(max_queue=2)
+    batch = [scheduler.enqueue(Priority.BATCH) for _ in range(2)]
+
+    live = [scheduler.enqueue(Priority.LIVE) for _ in range(2)]
+    with pytest.raises(QueueFullError):
+        scheduler.enqueue(Priority.LIVE)
+    with pytest.raises(QueueFullError):
+        scheduler.enqueue(Priority.ANALYSIS)
+
+    scheduler.discard(live[0])
+    assert scheduler.pop() is live[1]
+    scheduler.enqueue(Priority.ANALYSIS)
+    assert scheduler.stats()["live"]["rejected"] == 1
+    assert len(scheduler) == len(batch) + 1
+
+
+@pytest.mark.asyncio
+async def test_discarded_and_cancelled_waiters_are_skipped():
+    """Test that waiters that stopped waiting are never handed an engine."""
+    scheduler = RequestScheduler()
+    gone = scheduler.enqueue(Priority.LIVE, "a")
+    cancelled = scheduler.enqueue(Priority.LIVE, "b")
+    waiting = scheduler.enqueue(Priority.LIVE, "c")
+
+    scheduler.discard(gone)
+    scheduler.discard(gone)
+    cancelled.cancel()
+
+    assert scheduler.pop() is waiting
+    assert scheduler.pop() is None
+
+
+def test_wait_time_stats():
+    """Test that wait times are averaged over served requests per priority."""
+    scheduler = RequestScheduler()
+    scheduler.record_wait(Priority.LIVE, 0.0)
+    scheduler.record_wait(Priority.LIVE, 0.2)
+
+    stats = scheduler.stats()["live"]
+    assert stats["served"] == 2
+    assert stats["wait_time_avg_ms"] == 100.0
+    assert stats["wait_time_max_ms"] == 200.0
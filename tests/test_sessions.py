@@ -0,0 +1,86 @@
+"""Tests for server-side game sessions."""
+
+import chess
+import pytest
+
+from chesspal_mcp_engine.sessions import GameSession, SessionError, SessionManager
+
+
+def test_open_and_get():
+    """Test that an opened session is found by its identifier."""
+    manager = SessionManager(max_sessions=10, idle_timeout=60)
+    session = manager.open(chess.Board())
+
+    assert manager.get(session.session_id) is session
+    assert manager.stats() == {"open": 1, "opened": 1, "evicted": 0}
+
+
+def test_get_unknown_session():
+    """Test that looking up an unknown session fails."""
+    manager = SessionManager(max_sessions=10, idle_timeout=60)
+    with pytest.raises(SessionError, match="Unknown or expired session"):
+        manager.get("missing")
+
+
+def test_close():
+    """Test that a closed session can no longer be used."""
+    manager = SessionManager(max_sessions=10, idle_timeout=60)
+    session = manager.open(chess.Board())
+    manager.close(session.session_id)
+
+    assert len(manager) == 0
+    with pytest.raises(SessionError):
+        manager.close(session.session_id)
+
+
+def test_least_recently_used_session_is_evicted_when_full():
+    """Test that opening beyond the limit evicts the least recently used session."""
+    manager = SessionManager(max_sessions=2, idle_timeout=60)
+    first = manager.open(chess.Board())
+    second = manager.open(chess.Board())
+    manager.get(first.session_id)
+    manager.open(chess.Board())
+
+    assert manager.get(first.session_id) is first
+    with pytest.raises(SessionError):
+        manager.get(second.session_id)
+    assert manager.stats()["evicted"] == 1
+
+
+def test_idle_sessions_are_evicted():
+    """Test that sessions unused past the idle timeout are evicted."""
+    manager = SessionManager(max_sessions=10, idle_timeout=60)
+    stale = manager.open(chess.Board())
+    fresh = manager.open(chess.Board())
+    stale.last_used -= 120
+
+    assert manager.evict_idle() == 1
+    assert manager.get(fresh.session_id) is fresh
+    with pytest.raises(SessionError):
+        manager.get(stale.session_id)
+
+
+def test_search_position_starts_after_last_irreversible_move():
+    """Test that only the moves since the last capture or pawn move are sent."""
+    board = chess.Board()
+    for move in ["e2e4", "e7e5", "g1f3", "b8c6", "f3g1", "c6b8"]:
+        board.push_uci(move)
+    session = GameSession("id", board)
+
+    fen, moves = session.search_position()
+
+    after_e5 = chess.Board()
+    after_e5.push_uci("e2e4")
+    after_e5.push_uci("e7e5")
+    assert fen == after_e5.fen()
+    assert moves == ["g1f3", "b8c6", "f3g1", "c6b8"]
+
+
+def test_search_position_from_fen_with_halfmove_clock():
+    """Test that a halfmove clock older than the move stack is bounded by the stack."""
+    fen = "4k3/8/8/8/8/8/8/4K2R w K - 10 30"
+    board = chess.Board(fen)
+    board.push_uci("h1h2")
+    session = GameSession("id", board)
+
+    assert session.search_position() == (fen, ["h1h2"])
@@ -0,0 +1,78 @@
+"""Tests for the engine state shared with the health server process."""
+
+import multiprocessing
+
+import pytest
+
+from chesspal_mcp_engine.shared_state import SharedState
+
+
+@pytest.fixture
+def state(tmp_path):
+    """Create a writable shared state file."""
+    state = SharedState.create(tmp_path / "state.bin", size=4096)
+    yield state
+    state.close(unlink=True)
+
+
+def test_read_before_publish(state):
+    """Test that nothing is read before the first snapshot is published."""
+    assert state.read() is None
+
+
+def test_attached_reader_sees_latest_snapshot(state):
+    """Test that a read-only mapping of the file sees every published snapshot."""
+    reader = SharedState.attach(state.path)
+    try:
+        assert state.publish({"engine_alive": True, "queue_depth": 2})
+        assert reader.read() == {"engine_alive": True, "queue_depth": 2}
+        state.publish({"engine_alive": False})
+        assert reader.read() == {"engine_alive": False}
+    finally:
+        reader.close()
+
+
+def test_oversized_snapshot_is_not_published(state):
+    """Test that a snapshot larger than the file keeps the previous one."""
+    state.publish({"engine_alive": True})
+    assert not state.publish({"metrics": "x" * 8192})
+    assert state.read() == {"engine_alive": True}
+
+
+def test_attached_state_is_read_only(state):
+    """Test that only the creating side publishes."""
+    reader = SharedState.attach(state.path)
+    try:
+        with pytest.raises(PermissionError):
+            reader.publish({"engine_alive": True})
+    finally:
+        reader.close()
+
+
+def test_create_temporary_file():
+    """Test that a temporary file is created when no path is given."""
+    state = SharedState.create()
+    try:
+        assert state.path.exists()
+    finally:
+        state.close(unlink=True)
+    assert not state.path.exists()
+
+
+def _read_in_child(path, results):
+    """Read the shared state from another process."""
+    reader = SharedState.attach(path)
+    results.put(reader.read())
+    reader.close()
+
+
+def test_other_process_reads_snapshot(state):
+    """Test that a separate process, like the health server, reads the published state."""
+    state.publish({"engine_alive": True, "pool": {"size": 2}})
+    results = multiprocessing.Queue()
+    process = multiprocessing.Process(target=_read_in_child, args=(str(state.path), results))
+    process.start()
+    try:
+        assert results.get(timeout=10) == {"engine_alive": True, "pool": {"size": 2}}
+    finally:
+        process.join(timeout=10)
@@ -0,0 +1,108 @@
+"""Tests for Syzygy tablebase probing."""
+
+import threading
+from unittest.mock import MagicMock, patch
+
+import chess
+import chess.syzygy
+import pytest
+
+from chesspal_mcp_engine.tablebase import SyzygyTablebase
+
+# White king and rook against a lone king
+KRK_FEN = "8/8/8/4k3/8/8/8/R3K3 w - - 0 1"
+
+
+@pytest.fixture
+def fake_tables():
+    """Patch open_tablebase with tables scoring moves by the move just played."""
+    tables = MagicMock(spec=chess.syzygy.Tablebase)
+    with patch("chesspal_mcp_engine.tablebase.chess.syzygy.open_tablebase", return_value=tables) as open_tablebase:
+        yield tables, open_tablebase
+
+
+def test_winning_move_with_shortest_dtz(fake_tables):
+    """Test that the winning move closest to zeroing is chosen."""
+    tables, open_tablebase = fake_tables
+    dtz = {"a1a5": -3, "a1a4": -9}
+    tables.probe_wdl.side_effect = lambda board: -2
+    tables.probe_dtz.side_effect = lambda board: dtz.get(board.peek().uci(), -20)
+
+    tablebase = SyzygyTablebase("/tables", max_pieces=5, max_open_tables=8)
+    assert tablebase.find_move(chess.Board(KRK_FEN)) == "a1a5"
+    open_tablebase.assert_called_once_with("/tables", max_fds=8)
+    assert tablebase.stats()["hits"] == 1
+
+
+def test_prefers_win_over_draw(fake_tables):
+    """Test that WDL ranks before DTZ."""
+    tables, _ = fake_tables
+    tables.probe_wdl.side_effect = lambda board: -2 if board.peek().uci() == "e1d2" else 0
+    tables.probe_dtz.side_effect = lambda board: -50 if board.peek().uci() == "e1d2" else 0
+
+    tablebase = SyzygyTablebase("/tables")
+    assert tablebase.find_move(chess.Board(KRK_FEN)) == "e1d2"
+
+
+def test_mate_in_one(fake_tables):
+    """Test that a mating move is played without probing further."""
+    tables, _ = fake_tables
+    tables.probe_wdl.return_value = 0
+    tables.probe_dtz.return_value = 0
+
+    tablebase = SyzygyTablebase("/tables")
+    assert tablebase.find_move(chess.Board("4k3/8/4K3/8/8/8/8/R7 w - - 0 1")) == "a1a8"
+
+
+def test_too_many_pieces(fake_tables, test_positions):
+    """Test that positions above the piece limit are not probed."""
+    tables, _ = fake_tables
+    tablebase = SyzygyTablebase("/tables")
+    assert tablebase.find_move(chess.Board(test_positions["STARTING_FEN"])) is None
+    tables.probe_wdl.assert_not_called()
+
+
+def test_missing_table_is_a_miss(fake_tables):
+    """Test that a missing table falls back to the engine."""
+    tables, _ = fake_tables
+    tables.probe_wdl.side_effect = chess.syzygy.MissingTableError("KRvK")
+
+    tablebase = SyzygyTablebase("/tables")
+    assert tablebase.find_move(chess.Board(KRK_FEN)) is None
+    assert tablebase.stats()["misses"] == 1
+
+
+@pytest.mark.asyncio
+async def test_find_move_async_probes_off_the_event_loop(fake_tables, test_positions):
+    """Test that async probes run on the worker thread and leave the caller's board alone."""
+    tables, _ = fake_tables
+    threads = set()
+
+    def probe_wdl(board):
+        threads.add(threading.current_thread())
+        return -2
+
+    tables.probe_wdl.side_effect = probe_wdl
+    tables.probe_dtz.side_effect = lambda board: -3 if board.peek().uci() == "a1a5" else -20
+    tablebase = SyzygyTablebase("/tables")
+    board = chess.Board(KRK_FEN)
+
+    try:
+        assert await tablebase.find_move_async(board) == "a1a5"
+        assert await tablebase.find_move_async(chess.Board(test_positions["STARTING_FEN"])) is None
+    finally:
+        tablebase.close()
+
+    assert threading.current_thread() not in threads
+    assert board.fen() == KRK_FEN
+    assert tables.probe_wdl.call_count == len(list(board.legal_moves))
+
+
+def test_close(fake_tables):
+    """Test that close() releases the tables."""
+    tables, _ = fake_tables
+    tablebase = SyzygyTablebase("/tables")
+    tablebase.close()
+    tables.close.assert_called_once()
+    with pytest.raises(RuntimeError):
+        tablebase.find_move(chess.Board(KRK_FEN))
@@ -0,0 +1,144 @@
+"""Tests for the UCI info line parser."""
+
+import os
+import time
+
+import pytest
+
+from chesspal_mcp_engine.engine_wrapper import StockfishError
+from chesspal_mcp_engine.uci_info import InfoCollector, parse_info, parse_search_result
+
+
+def make_stream(lines):
+    """Build a Stockfish-like MultiPV search output with mostly currmove updates."""
+    stream = []
+    for n in range(lines):
+        depth = n // 1000 + 1
+        if n % 4 == 3:
+            stream.append(
+                f"info depth {depth} seldepth {depth + 6} multipv {n % 3 + 1} score cp {n % 97} nodes {n * 1000} "
+                f"nps 1500000 hashfull {n % 1000} tbhits 0 time {n} pv e2e4 e7e5 g1f3 b8c6 f1b5 a7a6 b5a4 g8f6"
+            )
+        else:
+            stream.append(f"info depth {depth} currmove e2e4 currmovenumber {n % 20 + 1}")
+    return stream
+
+
+def test_parse_info_all_fields():
+    """Test that every reported field of a scored info line is parsed."""
+    info = parse_info(
+        "info depth 24 seldepth 33 multipv 2 score cp -15 upperbound nodes 1200000 nps 900000 "
+        "hashfull 412 tbhits 7 time 1333 pv d7d5 c2c4 e7e6"
+    )
+    assert info.as_dict() == {
+        "depth": 24,
+        "seldepth": 33,
+        "multipv": 2,
+        "score_cp": -15,
+        "bound": "upperbound",
+        "nodes": 1200000,
+        "nps": 900000,
+        "hashfull": 412,
+        "tbhits": 7,
+        "time_ms": 1333,
+        "pv": ["d7d5", "c2c4", "e7e6"],
+    }
+
+
+def test_parse_info_mate_without_pv():
+    """Test mate scores and lines without a PV."""
+    info = parse_info("info depth 0 score mate 0")
+    assert info.mate == 0
+    assert info.score_cp is None
+    assert info.pv == []
+    assert info.multipv == 1
+
+
+@pytest.mark.parametrize(
+    "line",
+    [
+        "info depth 12 currmove e2e4 currmovenumber 1",
+        "info string NNUE evaluation using nn-1c0000000000.nnue score",
+        "bestmove e2e4",
+        "info depth x score cp 10",
+        "info depth 3 score cp",
+    ],
+)
+def test_parse_info_rejects_unscored_and_malformed_lines(line):
+    """Test that lines without a usable score are skipped."""
+    assert parse_info(line) is None
+
+
+def test_collector_keeps_latest_line_per_multipv_slot():
+    """Test that only the latest scored line of each slot is kept."""
+    collector = InfoCollector()
+    for line in [
+        "info depth 1 multipv 1 score cp 20 pv d2d4",
+        "info depth 1 multipv 2 score cp 10 pv e2e4",
+        "info depth 2 currmove e2e4 currmovenumber 1",
+        "info depth 2 multipv 1 score cp 30 pv e2e4 e7e5",
+    ]:
+        collector.feed(line)
+
+    assert len(collector) == 2
+    assert collector.principal().score_cp == 30
+    assert [(info.multipv, info.pv[0]) for info in collector.lines()] == [(1, "e2e4"), (2, "e2e4")]
+
+
+def test_parse_search_result():
+    """Test that the result combines the bestmove line with the principal variation."""
+    collector = InfoCollector()
+    collector.feed("info depth 12 seldepth 16 multipv 1 score cp 31 nodes 9000 pv e2e4 e7e5 g1f3")
+    collector.feed("info depth 12 seldepth 16 multipv 2 score cp 20 nodes 9000 pv d2d4")
+
+    result = parse_search_result("bestmove e2e4 ponder e7e5", collector, multipv=2)
+
+    assert (result.best_move, result.ponder, result.score_cp, result.depth) == ("e2e4", "e7e5", 31, 12)
+    assert [candidate.move_uci for candidate in result.candidates] == ["e2e4", "d2d4"]
+
+
+def test_parse_search_result_malformed_bestmove():
+    """Test that a truncated bestmove line is an engine error."""
+    with pytest.raises(StockfishError, match="No best move found"):
+        parse_search_result("bestmove", InfoCollector())
+
+
+def test_collector_matches_parse_info():
+    """Test that collecting a long search keeps the latest scored line of each PV."""
+    stream = make_stream(4_000)
+
+    collector = InfoCollector()
+    for line in stream:
+        collector.feed(line)
+    result = parse_search_result("bestmove e2e4 ponder e7e5", collector, multipv=3)
+
+    parsed = [info for info in map(parse_info, stream) if info is not None]
+    latest = {info.multipv: info for info in parsed}
+    assert len(parsed) == 1_000
+    assert len(result.candidates) == 3
+    assert result.depth == latest[1].depth
+    assert result.score_cp == latest[1].score_cp
+
+
+@pytest.mark.benchmark
+@pytest.mark.skipif(not os.environ.get("CHESSPAL_BENCHMARKS"), reason="set CHESSPAL_BENCHMARKS=1 to run benchmarks")
+def test_collector_benchmark():
+    """Benchmark collecting a long search against parsing every line."""
+    stream = make_stream(200_000)
+
+    start = time.perf_counter()
+    collector = InfoCollector()
+    for line in stream:
+        collector.feed(line)
+    parse_search_result("bestmove e2e4 ponder e7e5", collector, multipv=3)
+    collect_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    [info for info in map(parse_info, stream) if info is not None]
+    parse_time = time.perf_counter() - start
+
+    print(
+        f"\nInfoCollector: {len(stream) / collect_time:,.0f} lines/s, "
+        f"parse_info: {len(stream) / parse_time:,.0f} lines/s"
+    )
+    assert collect_time < parse_time